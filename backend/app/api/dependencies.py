@@ -1,8 +1,10 @@
 # backend/app/api/dependencies.py
-from fastapi import Depends, Request
+from fastapi import Depends, HTTPException, Request, status
 from backend.app.services.file_validation import FileValidator
 from backend.app.infrastructure.files.document_parser import DocumentParser
 from backend.app.infrastructure.summarization.mbart_gateway import SummarizationGateway
+from backend.app.infrastructure.summarization.model_registry import ModelRegistry
+from backend.app.infrastructure.summarization.token_cache import TokenIdsEncoder
 
 # Создаем по одному экземпляру на все приложение
 # Они не хранят состояние, поэтому это безопасно
@@ -21,5 +23,26 @@ def get_summarizer(request: Request) -> SummarizationGateway:
     """
     Возвращает экземпляр SummarizationGateway,
     который был загружен при старте в app.state.
+    До окончания прогрева модели - 503.
     """
-    return request.app.state.summarizer
\ No newline at end of file
+    if not getattr(request.app.state, "ready", False):
+        # Модель ещё загружается и прогревается (см. /ready)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Модель ещё загружается, повторите запрос позже."
+        )
+    return request.app.state.summarizer
+
+def get_token_encoder(request: Request) -> TokenIdsEncoder:
+    """
+    Возвращает TokenIdsEncoder, созданный при старте в app.state.
+    """
+    return request.app.state.token_encoder
+
+
+def get_model_registry(request: Request) -> ModelRegistry:
+    """
+    Возвращает реестр моделей, созданный при старте в app.state
+    (в режимах Celery и сервера модели - только конфигурации и токенизаторы).
+    """
+    return request.app.state.model_registry
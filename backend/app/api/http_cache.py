@@ -0,0 +1,169 @@
+# backend/app/api/http_cache.py
+"""
+Условные GET и быстрая отдача ответов чтения.
+
+Готовые суммаризации и распарсенные документы не меняются, поэтому клиент,
+опрашивающий их, получает 304 по ETag / Last-Modified без тела. Тело
+сериализуется orjson напрямую из полей модели (без повторной сборки
+Pydantic-схемы), крупные тела сжимаются (br при наличии пакета brotli, иначе
+gzip). Готовые байты неизменяемых ответов держатся в LRU-кэше процесса.
+"""
+import gzip
+import hashlib
+import inspect
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, Tuple, Union
+
+import orjson
+from fastapi import Request, Response, status
+
+from backend.app.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость, без неё только gzip
+    brotli = None
+
+CACHE_IMMUTABLE = "private, max-age=31536000, immutable"
+# Ответ может измениться (суммаризация в работе): кэшировать можно, но с проверкой ETag
+CACHE_REVALIDATE = "no-cache"
+
+_GZIP_LEVEL = 6
+_BROTLI_QUALITY = 5
+
+
+def make_etag(*parts: Any) -> str:
+    """Сильный ETag из полей, однозначно определяющих содержимое ответа."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    # Даты в БД - наивные UTC (datetime.utcnow)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Для If-None-Match сравнение слабое: W/"x" совпадает с "x"
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """RFC 9110: If-None-Match главнее If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # Точность HTTP-даты - секунды
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _accepted_encoding(request: Request) -> Optional[str]:
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=_BROTLI_QUALITY)
+    if encoding == "gzip":
+        # mtime=0: одинаковое тело - одинаковые байты
+        return gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0)
+    return body
+
+
+class BodyCache:
+    """
+    LRU готовых тел по (ETag, запрошенная кодировка), лимит в байтах.
+    Значение - (тело, фактическая кодировка): маленькие тела не сжимаются.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._items: "OrderedDict[Tuple[str, Optional[str]], Tuple[bytes, Optional[str]]]" = OrderedDict()
+
+    def get(self, key: Tuple[str, Optional[str]]) -> Optional[Tuple[bytes, Optional[str]]]:
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+        return item
+
+    def put(self, key: Tuple[str, Optional[str]], body: bytes, encoding: Optional[str]) -> None:
+        if len(body) > self.max_bytes or key in self._items:
+            return
+        self._items[key] = (body, encoding)
+        self.size_bytes += len(body)
+        while self.size_bytes > self.max_bytes:
+            _, (evicted, _) = self._items.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+
+body_cache = BodyCache(settings.HTTP_BODY_CACHE_MB * 1024 * 1024)
+
+
+async def conditional_json(
+        request: Request,
+        etag: str,
+        content: Callable[[], Union[Any, Awaitable[Any]]],
+        last_modified: Optional[datetime] = None,
+        immutable: bool = False
+) -> Response:
+    """
+    304, если у клиента актуальная версия; иначе JSON-ответ.
+    content вызывается только когда тела нет в кэше, поэтому тяжёлые поля
+    (parsed_text) можно дочитывать из БД внутри него.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_IMMUTABLE if immutable else CACHE_REVALIDATE,
+        "Vary": "Accept-Encoding",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    accepted = _accepted_encoding(request)
+    cached = body_cache.get((etag, accepted)) if immutable else None
+    if cached is not None:
+        body, encoding = cached
+    else:
+        data = content()
+        if inspect.isawaitable(data):
+            data = await data
+        body = orjson.dumps(data)
+        encoding = accepted if len(body) >= settings.HTTP_COMPRESSION_MIN_BYTES else None
+        body = _compress(body, encoding)
+        if immutable:
+            body_cache.put((etag, accepted), body, encoding)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
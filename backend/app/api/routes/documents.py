@@ -1,4 +1,7 @@
-from fastapi import APIRouter, UploadFile, File, Depends, status, HTTPException
+from beanie import PydanticObjectId
+from fastapi import APIRouter, UploadFile, File, Depends, Query, status, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pymongo.errors import DuplicateKeyError
 from backend.app.api.schemas.documents import DocumentCreateResponse, DocumentListResponse, DocumentListItem, DocumentDetailResponse
 from backend.app.api.schemas.common import ErrorResponse
 from datetime import datetime
@@ -7,8 +10,18 @@ from typing import Optional
 # Сервисы и модели
 from backend.app.services.file_validation import FileValidator
 from backend.app.infrastructure.files.document_parser import DocumentParser
-from backend.app.api.dependencies import get_file_validator, get_document_parser
-from backend.app.infrastructure.database.models import DocumentModel, SummaryModel
+from backend.app.api.dependencies import get_file_validator, get_document_parser, get_token_encoder
+from backend.app.infrastructure.summarization.token_cache import TokenIdsEncoder
+from backend.app.services.document_processing import encode_token_ids
+from backend.app.services.document_text import (
+    UNITS, UNIT_CHARS, build_text_index, iter_text, load_text_index, resolve_range, store_text_chunks
+)
+from backend.app.services.export import build_filter, parse_resume_token, stream_ndjson
+from backend.app.services.document_versions import insert_version, list_versions, version_root_id
+from backend.app.infrastructure.summarization.chunking import diff_paragraphs
+from backend.app.config import settings
+from backend.app.infrastructure.database.models import DocumentMeta, DocumentModel, SummaryModel
+from backend.app.api.http_cache import CACHE_IMMUTABLE, conditional_json, http_date, is_not_modified, make_etag
 from backend.app.core.errors import FileValidationException, DocumentParsingError
 
 
@@ -18,6 +31,54 @@ router = APIRouter(
 )
 
 
+async def _parse_upload(
+        file: UploadFile,
+        validator: FileValidator,
+        parser: DocumentParser,
+        token_encoder: TokenIdsEncoder
+):
+    """Валидация, парсинг и токенизация загруженного файла (общие для документа и его версий)."""
+
+    # 1. Валидация (выбросит исключение, если ошибка)
+    # Глобальный обработчик в main.py поймает его
+    mime_type = await validator.validate(file)
+
+    # 2. Парсинг (выбросит исключение, если ошибка)
+    parsed_text = await parser.parse(file.file, mime_type)
+
+    if not parsed_text:
+        # Дополнительная проверка на пустой текст
+        raise DocumentParsingError("Не удалось извлечь текст (файл пустой?)")
+
+    # 3. Токенизация один раз при загрузке: повторные суммаризации
+    # подают готовые id токенов прямо в модель
+    token_ids = None
+    if settings.TOKENIZE_ON_UPLOAD:
+        [token_ids] = await encode_token_ids(token_encoder, [parsed_text])
+
+    return mime_type, parsed_text, token_ids
+
+
+def _create_response(doc: DocumentModel) -> DocumentCreateResponse:
+    # Генерируем превью
+    parsed_text = doc.parsed_text
+    preview = (parsed_text[:200] + '...') if len(parsed_text) > 200 else parsed_text
+
+    return DocumentCreateResponse(
+        id=str(doc.id),  # Преобразуем ObjectId в str
+        filename=doc.filename,
+        mime_type=doc.mime_type,
+        size_bytes=doc.size_bytes,
+        uploaded_at=doc.uploaded_at,
+        parsed=doc.parsed,
+        parsed_preview=preview,
+        version=doc.version,
+        root_id=doc.root_id,
+        parent_id=doc.parent_id,
+        diff_stats=doc.diff_stats
+    )
+
+
 @router.post(
     "/",
     response_model=DocumentCreateResponse,
@@ -31,50 +92,122 @@ async def upload_document(
         file: UploadFile = File(...),
         title: str | None = None,
         validator: FileValidator = Depends(get_file_validator),
-        parser: DocumentParser = Depends(get_document_parser)
+        parser: DocumentParser = Depends(get_document_parser),
+        token_encoder: TokenIdsEncoder = Depends(get_token_encoder)
 ):
     """
     Принимает файл, валидирует, парсит текст и сохраняет в БД.
     """
+    mime_type, parsed_text, token_ids = await _parse_upload(file, validator, parser, token_encoder)
 
-    # 1. Валидация (выбросит исключение, если ошибка)
-    # Глобальный обработчик в main.py поймает его
-    mime_type = await validator.validate(file)
-
-    # 2. Парсинг (выбросит исключение, если ошибка)
-    parsed_text = await parser.parse(file.file, mime_type)
-
-    if not parsed_text:
-        # Дополнительная проверка на пустой текст
-        raise DocumentParsingError("Не удалось извлечь текст (файл пустой?)")
-
-    # 3. Создание модели
+    # 4. Создание модели
     new_doc = DocumentModel(
         filename=file.filename,
         mime_type=mime_type,
         size_bytes=file.size,
         title=title,
         parsed=True,
-        parsed_text=parsed_text
+        parsed_text=parsed_text,
+        token_ids=token_ids
         # uploaded_at установится автоматически (default_factory)
     )
+    build_text_index(new_doc)
 
-    # 4. Сохранение в БД
+    # 5. Сохранение в БД (текст ещё и кусками - для чтения диапазонами)
     await new_doc.insert()
+    await store_text_chunks(new_doc)
 
-    # 5. Формирование ответа
-    # Генерируем превью
-    preview = (parsed_text[:200] + '...') if len(parsed_text) > 200 else parsed_text
+    # 6. Формирование ответа
+    return _create_response(new_doc)
 
-    return DocumentCreateResponse(
-        id=str(new_doc.id),  # Преобразуем ObjectId в str
-        filename=new_doc.filename,
-        mime_type=new_doc.mime_type,
-        size_bytes=new_doc.size_bytes,
-        uploaded_at=new_doc.uploaded_at,
-        parsed=new_doc.parsed,
-        parsed_preview=preview
+
+@router.post(
+    "/{document_id}/versions",
+    response_model=DocumentCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"model": ErrorResponse, "description": "Файл слишком большой или неверный формат"},
+        404: {"model": ErrorResponse, "description": "Документ не найден"},
+        415: {"model": ErrorResponse, "description": "Неподдерживаемый media type"}
+    }
+)
+async def upload_document_version(
+        document_id: str,
+        file: UploadFile = File(...),
+        title: str | None = None,
+        validator: FileValidator = Depends(get_file_validator),
+        parser: DocumentParser = Depends(get_document_parser),
+        token_encoder: TokenIdsEncoder = Depends(get_token_encoder)
+):
+    """
+    Загружает новую (отредактированную) версию документа.
+    Суммаризация версии со strategy="chunked" переиспользует результаты
+    для абзацев, не изменившихся с прошлых версий.
+    """
+    parent = await DocumentModel.get(document_id)
+    if not parent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Документ с ID '{document_id}' не найден."
+        )
+
+    mime_type, parsed_text, token_ids = await _parse_upload(file, validator, parser, token_encoder)
+
+    root_id = version_root_id(parent)
+    new_doc = DocumentModel(
+        filename=file.filename,
+        mime_type=mime_type,
+        size_bytes=file.size,
+        title=title or parent.title,
+        parsed=True,
+        parsed_text=parsed_text,
+        token_ids=token_ids,
+        root_id=root_id,
+        parent_id=str(parent.id),
+        diff_stats=diff_paragraphs(parent.parsed_text or "", parsed_text)
     )
+    build_text_index(new_doc)
+    try:
+        await insert_version(new_doc)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Не удалось присвоить номер версии: документ одновременно изменяют, повторите запрос."
+        )
+    await store_text_chunks(new_doc)
+
+    return _create_response(new_doc)
+
+
+@router.get(
+    "/{document_id}/versions",
+    response_model=DocumentListResponse,
+    tags=["Documents"],
+    responses={404: {"model": ErrorResponse, "description": "Документ не найден"}}
+)
+async def list_document_versions(document_id: str):
+    """
+    Все версии документа (от новых к старым); document_id - любая из версий.
+    """
+    doc = await DocumentModel.get(document_id)
+    if not doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Документ с ID '{document_id}' не найден."
+        )
+    versions = await list_versions(version_root_id(doc))
+
+    items = [
+        DocumentListItem(
+            id=str(version.id),
+            filename=version.filename,
+            size_bytes=version.size_bytes,
+            uploaded_at=version.uploaded_at,
+            parsed=version.parsed,
+            version=version.version
+        ) for version in versions
+    ]
+    return DocumentListResponse(total=len(items), limit=len(items), offset=0, items=items)
 
 # 1. Роут для получения списка документов (History)
 @router.get(
@@ -100,39 +233,149 @@ async def list_documents(limit: int = 10, offset: int = 0):
             filename=doc.filename,
             size_bytes=doc.size_bytes,
             uploaded_at=doc.uploaded_at,
-            parsed=doc.parsed
+            parsed=doc.parsed,
+            version=doc.version
         ) for doc in docs
     ]
 
     return DocumentListResponse(total=total, limit=limit, offset=offset, items=items)
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    tags=["Documents"],
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "Документы, по одному на строку"},
+        400: {"model": ErrorResponse, "description": "Некорректный токен возобновления"}
+    }
+)
+async def export_documents(
+        uploaded_from: Optional[datetime] = None,
+        uploaded_to: Optional[datetime] = None,
+        include_text: bool = Query(False, description="Добавить parsed_text"),
+        after: Optional[str] = Query(None, description="id последней полученной записи (возобновление выгрузки)"),
+        batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=10_000)
+):
+    """
+    Выгрузка документов в NDJSON в порядке id, фильтр: uploaded_at в
+    [uploaded_from, uploaded_to). Оборванную выгрузку можно продолжить,
+    передав в after id последней полученной строки.
+    """
+    try:
+        after_id = parse_resume_token(after)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    query = build_filter("uploaded_at", uploaded_from, uploaded_to, after_id)
+    fields = [
+        "filename", "mime_type", "size_bytes", "uploaded_at", "title", "parsed",
+        "version", "root_id", "parent_id", "diff_stats", "text_length"
+    ]
+    if include_text:
+        fields.append("parsed_text")
+    return StreamingResponse(
+        stream_ndjson(DocumentModel, query, fields, batch_size), media_type="application/x-ndjson"
+    )
+
+
 # 2. Роут для получения деталей документа
 @router.get(
     "/{document_id}",
     response_model=DocumentDetailResponse,
     tags=["Documents"],
-    responses={404: {"model": ErrorResponse, "description": "Документ не найден"}}
+    responses={
+        304: {"description": "Документ не изменился (If-None-Match / If-Modified-Since)"},
+        404: {"model": ErrorResponse, "description": "Документ не найден"}
+    }
 )
-async def get_document_detail(document_id: str):
+async def get_document_detail(document_id: str, request: Request):
     """
     Получает детали документа, включая распарсенный текст.
+    Документ после загрузки не меняется (правки - новые версии), поэтому
+    ответ неизменяемый: ETag считается без чтения текста, тело кэшируется.
     """
-    doc = await DocumentModel.get(document_id)
-    if not doc:
+    meta = await DocumentModel.find_one(
+        DocumentModel.id == PydanticObjectId(document_id), projection_model=DocumentMeta
+    )
+    if not meta:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Документ с ID '{document_id}' не найден."
         )
 
-    # Приводим к схеме DocumentDetailResponse
-    return DocumentDetailResponse(
-        id=str(doc.id),
-        filename=doc.filename,
-        mime_type=doc.mime_type,
-        size_bytes=doc.size_bytes,
-        uploaded_at=doc.uploaded_at,
-        parsed=doc.parsed,
-        parsed_text=doc.parsed_text,
-        storage_ref=doc.storage_ref
+    async def content():
+        doc = await DocumentModel.get(meta.id)
+        # Поля DocumentDetailResponse
+        return {
+            "id": str(doc.id),
+            "filename": doc.filename,
+            "mime_type": doc.mime_type,
+            "size_bytes": doc.size_bytes,
+            "uploaded_at": doc.uploaded_at,
+            "parsed": doc.parsed,
+            "parsed_text": doc.parsed_text,
+            "storage_ref": doc.storage_ref,
+            "version": doc.version,
+            "root_id": doc.root_id,
+            "parent_id": doc.parent_id,
+            "diff_stats": doc.diff_stats
+        }
+
+    return await conditional_json(
+        request,
+        etag=make_etag("document", meta.id, meta.version, meta.uploaded_at.isoformat()),
+        content=content,
+        last_modified=meta.uploaded_at,
+        immutable=True
     )
+
+
+@router.get(
+    "/{document_id}/text",
+    response_class=StreamingResponse,
+    tags=["Documents"],
+    responses={
+        200: {"content": {"text/plain": {}}, "description": "Фрагмент parsed_text"},
+        304: {"description": "Документ не изменился (If-None-Match / If-Modified-Since)"},
+        400: {"model": ErrorResponse, "description": "Неизвестная единица диапазона"},
+        404: {"model": ErrorResponse, "description": "Документ не найден"}
+    }
+)
+async def get_document_text(
+        document_id: str,
+        request: Request,
+        offset: int = Query(0, ge=0),
+        limit: int = Query(10_000, ge=1, le=1_000_000),
+        unit: str = Query(UNIT_CHARS, description="chars - символы, paragraphs - абзацы")
+):
+    """
+    Фрагмент распарсенного текста (text/plain) без загрузки всего документа:
+    offset/limit в символах или абзацах. Полные размеры текста - в заголовках
+    X-Total-Chars и X-Total-Paragraphs, отданный диапазон символов - в X-Text-Range.
+    """
+    if unit not in UNITS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Неизвестная единица '{unit}'. Доступны: {list(UNITS)}"
+        )
+    index = await load_text_index(document_id)
+    if not index:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Документ с ID '{document_id}' не найден."
+        )
+
+    start, end = resolve_range(index, offset, limit, unit)
+    # Документ не меняется, поэтому и любой его фрагмент неизменяем
+    etag = make_etag("document-text", index.id, index.version, index.uploaded_at.isoformat(), start, end)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(index.uploaded_at),
+        "Cache-Control": CACHE_IMMUTABLE,
+        "X-Total-Chars": str(index.text_length),
+        "X-Total-Paragraphs": str(len(index.paragraph_spans) // 2),
+        "X-Text-Range": f"{start}-{end}",
+    }
+    if is_not_modified(request, etag, index.uploaded_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return StreamingResponse(iter_text(index, start, end), media_type="text/plain; charset=utf-8", headers=headers)
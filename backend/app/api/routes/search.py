@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from backend.app.api.schemas.search import SearchHitResponse, SearchResponse
+from backend.app.api.schemas.common import ErrorResponse
+from backend.app.services.search import SCOPES, SCOPE_ALL, search
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"]
+)
+
+
+@router.get(
+    "",
+    response_model=SearchResponse,
+    responses={400: {"model": ErrorResponse, "description": "Пустой запрос или неизвестная область поиска"}}
+)
+async def search_text(
+        q: str,
+        scope: str = Query(SCOPE_ALL, description="all | documents | summaries"),
+        limit: int = Query(10, ge=1, le=50),
+        offset: int = Query(0, ge=0, le=1000)
+):
+    """
+    Полнотекстовый поиск (со стеммингом русского языка) по тексту и названию
+    документов и по суммаризациям. Результаты - по убыванию релевантности,
+    со сниппетами и позициями совпадений в них. Если total_exact = false,
+    total - нижняя граница числа совпадений.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Поисковый запрос не может быть пустым."
+        )
+    if scope not in SCOPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Неизвестная область поиска '{scope}'. Доступны: {list(SCOPES)}"
+        )
+
+    total, total_exact, hits = await search(q, scope, limit, offset)
+    items = [
+        SearchHitResponse(
+            type=hit.kind,
+            id=hit.id,
+            score=hit.score,
+            document_id=hit.document_id,
+            title=hit.title,
+            created_at=hit.created_at,
+            snippet=hit.snippet,
+            highlights=[list(span) for span in hit.highlights]
+        ) for hit in hits
+    ]
+    return SearchResponse(
+        query=q, total=total, total_exact=total_exact, limit=limit, offset=offset, items=items
+    )
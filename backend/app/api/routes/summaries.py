@@ -1,10 +1,22 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from datetime import datetime
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from backend.app.api.schemas.summaries import SummaryCreateRequest, SummaryResponse
 from backend.app.api.schemas.common import ErrorResponse
 from backend.app.infrastructure.database.models import DocumentModel, SummaryModel
 from backend.app.infrastructure.summarization.mbart_gateway import SummarizationGateway
-from backend.app.api.dependencies import get_summarizer
+from backend.app.api.dependencies import get_model_registry, get_summarizer
+from backend.app.api.http_cache import conditional_json, make_etag
+from backend.app.infrastructure.summarization.chunking import STRATEGIES, STRATEGY_CHUNKED, STRATEGY_SINGLE
+from backend.app.infrastructure.summarization.decoding import get_profile
+from backend.app.infrastructure.summarization.token_cache import to_transport
+from backend.app.infrastructure.database.models import TokenIdsCache
+from backend.app.infrastructure.summarization.model_registry import DEFAULT_METHOD, ModelRegistry
+from backend.app.services.document_versions import find_reusable_chunks
+from backend.app.services.export import build_filter, parse_resume_token, stream_ndjson
+from backend.app.config import settings
 from backend.app.core.errors import SummarizationError
 
 # Проверка режима работы
@@ -26,6 +38,12 @@ async def run_summarization_task(
         min_length: int,
         max_length: int,
         summarizer: SummarizationGateway,
+        profile: str | None = None,
+        max_latency_ms: int | None = None,
+        method: str | None = None,
+        token_ids: TokenIdsCache | None = None,
+        strategy: str | None = None,
+        reused_chunks: Dict[str, str] | None = None,
 ):
     """
     Выполняет суммаризацию и обновляет модель в БД. Запускается в фоне.
@@ -36,19 +54,29 @@ async def run_summarization_task(
 
     await summary_model.set({"status": "running"})
     try:
-        summary_text = await summarizer.summarize(
+        result = await summarizer.summarize(
             text=text_to_summarize,
             min_length=min_length,
-            max_length=max_length
+            max_length=max_length,
+            profile=profile,
+            max_latency_ms=max_latency_ms,
+            method=method,
+            token_ids=token_ids,
+            strategy=strategy,
+            reused_chunks=reused_chunks
         )
         await summary_model.set({
-            "summary_text": summary_text,
-            "status": "done"
+            "summary_text": result.text,
+            "generation_info": result.generation_info,
+            "chunk_summaries": result.chunk_summaries,
+            "status": "done",
+            "finished_at": datetime.utcnow()
         })
     except Exception as e:
         await summary_model.set({
             "status": "failed",
-            "error_message": f"Summarization failed: {e}"
+            "error_message": f"Summarization failed: {e}",
+            "finished_at": datetime.utcnow()
         })
 
 
@@ -65,7 +93,8 @@ async def run_summarization_task(
 async def create_summary(
         body: SummaryCreateRequest,
         background_tasks: BackgroundTasks,
-        summarizer: SummarizationGateway = Depends(get_summarizer)
+        summarizer: SummarizationGateway = Depends(get_summarizer),
+        registry: ModelRegistry = Depends(get_model_registry)
 ):
     """
     Создаёт запись о суммарзиации.
@@ -73,6 +102,8 @@ async def create_summary(
     В режиме BackgroundTasks - запускает задачу в фоне.
     """
     text_to_summarize = ""
+    token_ids = None
+    doc = None
     if body.document_id:
         doc = await DocumentModel.get(body.document_id)
         if not doc or not doc.parsed_text:
@@ -81,6 +112,8 @@ async def create_summary(
                 detail="Документ не найден или еще не обработан.",
             )
         text_to_summarize = doc.parsed_text
+        # id токенов, посчитанные при загрузке (если подходят модели метода)
+        token_ids = doc.token_ids
     elif body.text:
         text_to_summarize = body.text
     else:
@@ -95,11 +128,39 @@ async def create_summary(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="min_length не может быть больше max_length"
         )
+    try:
+        get_profile(body.profile)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    method = body.method or DEFAULT_METHOD
+    if not registry.has_method(method):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Неизвестный метод '{method}'. Доступны: {list(registry.specs)}"
+        )
+    strategy = body.strategy or STRATEGY_SINGLE
+    if strategy not in STRATEGIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Неизвестная стратегия '{strategy}'. Доступны: {list(STRATEGIES)}"
+        )
+
+    params = {
+        "min_length": body.min_length,
+        "max_length": body.max_length,
+        "profile": body.profile,
+        "max_latency_ms": body.max_latency_ms,
+        "strategy": strategy,
+    }
+    # Готовые суммаризации чанков из прошлых версий документа
+    reused_chunks = None
+    if strategy == STRATEGY_CHUNKED and doc:
+        reused_chunks = await find_reusable_chunks(doc, method, params)
 
     new_summary = SummaryModel(
         document_id=body.document_id,
-        method=body.method or "mbart_ru_sum_gazeta",
-        params={"min_length": body.min_length, "max_length": body.max_length},
+        method=method,
+        params=params,
         summary_text=None,
         status="queued"
     )
@@ -112,7 +173,13 @@ async def create_summary(
             str(new_summary.id),
             text_to_summarize,
             body.min_length or 50,
-            body.max_length or 500
+            body.max_length or 500,
+            body.profile,
+            body.max_latency_ms,
+            method,
+            to_transport(token_ids),
+            strategy,
+            reused_chunks
         )
     else:
         # Запуск в фоновом режиме FastAPI
@@ -122,7 +189,13 @@ async def create_summary(
             text_to_summarize=text_to_summarize,
             min_length=body.min_length or 50,
             max_length=body.max_length or 500,
-            summarizer=summarizer
+            summarizer=summarizer,
+            profile=body.profile,
+            max_latency_ms=body.max_latency_ms,
+            method=method,
+            token_ids=token_ids,
+            strategy=strategy,
+            reused_chunks=reused_chunks
         )
 
     # Ответ (немедленный) с текущим состоянием
@@ -134,18 +207,84 @@ async def create_summary(
         summary_text=new_summary.summary_text,
         created_at=new_summary.created_at,
         status=new_summary.status,
-        error_message=new_summary.error_message
+        error_message=new_summary.error_message,
+        generation_info=new_summary.generation_info
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    tags=["Summaries"],
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "Суммаризации, по одной на строку"},
+        400: {"model": ErrorResponse, "description": "Некорректный токен возобновления"}
+    }
+)
+async def export_summaries(
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        status_filter: Optional[str] = Query(None, alias="status", description="queued | running | done | failed"),
+        method: Optional[str] = None,
+        after: Optional[str] = Query(None, description="id последней полученной записи (возобновление выгрузки)"),
+        batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=10_000)
+):
+    """
+    Выгрузка суммаризаций в NDJSON в порядке id, фильтры: created_at в
+    [created_from, created_to), статус, метод. Оборванную выгрузку можно
+    продолжить, передав в after id последней полученной строки.
+    """
+    try:
+        after_id = parse_resume_token(after)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    query = build_filter("created_at", created_from, created_to, after_id, status=status_filter, method=method)
+    fields = [
+        "document_id", "method", "params", "status", "created_at", "finished_at",
+        "summary_text", "error_message", "generation_info"
+    ]
+    return StreamingResponse(
+        stream_ndjson(SummaryModel, query, fields, batch_size), media_type="application/x-ndjson"
+    )
+
+
+async def _summary_response(request: Request, summary: SummaryModel, latest: bool = False):
+    """
+    Ответ чтения суммаризации с ETag: пока задача в очереди или в работе,
+    клиент, опрашивающий статус, получает 304; готовая (done) суммаризация
+    больше не меняется и отдаётся как неизменяемая. Ответ «последняя по
+    документу» (latest) всегда проверяется заново: может появиться новая.
+    """
+    return await conditional_json(
+        request,
+        etag=make_etag("summary", summary.id, summary.status, summary.finished_at, summary.error_message),
+        # Поля SummaryResponse
+        content=lambda: {
+            "id": str(summary.id),
+            "document_id": summary.document_id,
+            "method": summary.method,
+            "params": summary.params,
+            "summary_text": summary.summary_text,
+            "created_at": summary.created_at,
+            "status": summary.status,
+            "error_message": summary.error_message,
+            "generation_info": summary.generation_info
+        },
+        last_modified=summary.finished_at or summary.created_at,
+        immutable=summary.status == "done" and not latest
     )
 
 
-# Остальные эндпоинты остаются без изменений
 @router.get(
     "/{summary_id}",
     response_model=SummaryResponse,
     tags=["Summaries"],
-    responses={404: {"model": ErrorResponse, "description": "Суммаризация не найдена"}}
+    responses={
+        304: {"description": "Суммаризация не изменилась (If-None-Match / If-Modified-Since)"},
+        404: {"model": ErrorResponse, "description": "Суммаризация не найдена"}
+    }
 )
-async def get_summary_detail(summary_id: str):
+async def get_summary_detail(summary_id: str, request: Request):
     """
     Получает статус и результат суммаризации.
     """
@@ -155,43 +294,28 @@ async def get_summary_detail(summary_id: str):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Суммаризация с ID '{summary_id}' не найдена."
         )
-    return SummaryResponse(
-        id=str(summary.id),
-        document_id=summary.document_id,
-        method=summary.method,
-        params=summary.params,
-        summary_text=summary.summary_text,
-        created_at=summary.created_at,
-        status=summary.status,
-        error_message=summary.error_message
-    )
+    return await _summary_response(request, summary)
 
 
 @router.get(
     "/by-document/{document_id}",
     response_model=SummaryResponse,
     tags=["Summaries"],
-    responses={404: {"model": ErrorResponse, "description": "Суммаризация не найдена"}}
+    responses={
+        304: {"description": "Суммаризация не изменилась (If-None-Match / If-Modified-Since)"},
+        404: {"model": ErrorResponse, "description": "Суммаризация не найдена"}
+    }
 )
-async def get_summary_by_document(document_id: str):
+async def get_summary_by_document(document_id: str, request: Request):
     """
     Получает последнюю суммаризацию по ID документа.
     """
-    summary = await SummaryModel.find_one(
+    summary = await SummaryModel.find(
         SummaryModel.document_id == document_id
-    ).sort("-created_at")
+    ).sort("-created_at").first_or_none()
     if not summary:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Суммаризация для документа '{document_id}' не найдена."
         )
-    return SummaryResponse(
-        id=str(summary.id),
-        document_id=summary.document_id,
-        method=summary.method,
-        params=summary.params,
-        summary_text=summary.summary_text,
-        created_at=summary.created_at,
-        status=summary.status,
-        error_message=summary.error_message
-    )
\ No newline at end of file
+    return await _summary_response(request, summary, latest=True)
@@ -6,6 +6,10 @@ class HealthResponse(BaseModel):
     status: str
     uptime: Optional[str]
 
+class ReadinessResponse(BaseModel):
+    status: str = Field(..., examples=["ready"])  # ready | warming_up | failed
+    detail: Optional[str] = None
+
 class ErrorResponse(BaseModel):
     detail: str
     code: str
@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, Dict
 
 class DocumentCreateResponse(BaseModel):
     id: str = Field(..., example="64b7f0db4f1c2c3a9e2f1a9b")
@@ -10,6 +10,12 @@ class DocumentCreateResponse(BaseModel):
     uploaded_at: datetime
     parsed: bool
     parsed_preview: Optional[str] = Field(None, description="Первые ~200 символов parsed_text")
+    version: int = 1
+    root_id: Optional[str] = Field(None, description="id исходного документа (для версий)")
+    parent_id: Optional[str] = None
+    diff_stats: Optional[Dict[str, int]] = Field(
+        None, description="Абзацы unchanged/added/removed/changed относительно parent_id"
+    )
 
 class DocumentListItem(BaseModel):
     id: str
@@ -17,6 +23,7 @@ class DocumentListItem(BaseModel):
     size_bytes: int
     uploaded_at: datetime
     parsed: bool
+    version: int = 1
 
 class DocumentListResponse(BaseModel):
     total: int
@@ -33,3 +40,7 @@ class DocumentDetailResponse(BaseModel):
     parsed: bool
     parsed_text: Optional[str] = None
     storage_ref: Optional[str] = None
+    version: int = 1
+    root_id: Optional[str] = None
+    parent_id: Optional[str] = None
+    diff_stats: Optional[Dict[str, int]] = None
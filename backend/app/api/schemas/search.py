@@ -0,0 +1,23 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+class SearchHitResponse(BaseModel):
+    type: str = Field(..., examples=["document"])  # document | summary
+    id: str
+    score: float = Field(..., description="Релевантность относительно лучшего результата того же типа, (0, 1]")
+    document_id: Optional[str] = None
+    title: Optional[str] = Field(None, description="Название или имя файла (для документов)")
+    created_at: datetime
+    snippet: str = Field(..., description="Фрагмент текста вокруг совпадения")
+    highlights: List[List[int]] = Field(
+        default_factory=list, description="Совпадения в snippet: пары [start, end) в символах"
+    )
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    total_exact: bool = Field(True, description="false - совпадений не меньше total (подсчёт ограничен)")
+    limit: int
+    offset: int
+    items: list[SearchHitResponse]
@@ -8,6 +8,16 @@ class SummaryCreateRequest(BaseModel):
     max_length: Optional[int] = Field(256, ge=16, le=2048)
     min_length: Optional[int] = Field(32, ge=0, le=1024)
     method: Optional[str] = Field("mbart_ru_sum_gazeta")
+    profile: Optional[str] = Field("quality", description="Профиль декодирования: fast | quality | no_repeat")
+    max_latency_ms: Optional[int] = Field(
+        None, ge=100, le=600_000,
+        description="Бюджет латентности генерации; при нехватке профиль понижается, генерация обрывается"
+    )
+    strategy: Optional[str] = Field(
+        "single",
+        description="single - весь текст одним прогоном; chunked - по чанкам абзацев с итоговой "
+                    "суммаризацией (для версий документа неизменённые чанки не пересчитываются)"
+    )
 
     class Config:
         json_schema_extra = {
@@ -15,7 +25,8 @@ class SummaryCreateRequest(BaseModel):
                 "document_id": "64b7f0db4f1c2c3a9e2f1a9b",
                 "max_length": 256,
                 "min_length": 32,
-                "method": "mbart_ru_sum_gazeta"
+                "method": "mbart_ru_sum_gazeta",
+                "profile": "quality"
             }
         }
 
@@ -27,4 +38,5 @@ class SummaryResponse(BaseModel):
     summary_text: Optional[str]
     created_at: datetime
     status: str = Field(..., example="done")
-    error_message: Optional[str] = None
\ No newline at end of file
+    error_message: Optional[str] = None
+    generation_info: Optional[Dict[str, Any]] = None
\ No newline at end of file
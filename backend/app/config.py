@@ -1,3 +1,4 @@
+from typing import Any, Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -7,6 +8,96 @@ class Settings(BaseSettings):
 
     # Имя модели (важно для transformers)
     MODEL_NAME: str = "IlyaGusev/mbart_ru_sum_gazeta"
+    # Маленькая (дистиллированная) модель с тем же словарём для спекулятивного
+    # декодирования; None - выключено. Работает только для жадного профиля fast:
+    # профиль по умолчанию quality (beam search, 4 луча) draft-модель не использует
+    DRAFT_MODEL_NAME: Optional[str] = None
+    # Сколько токенов draft-модель предлагает за один шаг проверки
+    SPECULATIVE_NUM_TOKENS: int = 5
+
+    # Дополнительные методы суммаризации: {"method": {"model_name": ..., "tokenizer_name": ...}}
+    # Метод mbart_ru_sum_gazeta всегда соответствует MODEL_NAME
+    SUMMARIZATION_MODELS: Dict[str, Dict[str, Any]] = {}
+    # Сколько моделей одновременно держать в памяти
+    MODEL_REGISTRY_MAX_RESIDENT: int = 2
+    # Бюджет памяти под модели (МБ), None - без ограничения
+    MODEL_REGISTRY_MEMORY_BUDGET_MB: Optional[int] = None
+    # Выгружать модели, не использовавшиеся дольше N секунд (проверка в фоне
+    # каждые N/2 секунд), None - не выгружать
+    MODEL_REGISTRY_IDLE_TTL_S: Optional[float] = 1800
+    # Длинные тексты перед нейросетевой моделью сокращаются экстрактивно
+    # до самых значимых предложений, а не обрезаются по началу
+    EXTRACTIVE_PREFILTER: bool = True
+    # Считать id токенов при загрузке документа, чтобы не токенизировать при каждой суммаризации
+    TOKENIZE_ON_UPLOAD: bool = True
+
+    # Кэш выходов энкодера (МБ в памяти процесса), 0 - выключен
+    ENCODER_CACHE_MAX_MB: int = 256
+    # Хранить скрытые состояния в fp16: вдвое больше записей в том же лимите, но декодер
+    # получает округлённые значения и суммаризация из кэша может немного отличаться от пересчёта
+    ENCODER_CACHE_FP16: bool = False
+    # Каталог для вытесненных из памяти записей, None - не сбрасывать на диск
+    ENCODER_CACHE_SPILL_DIR: Optional[str] = None
+    ENCODER_CACHE_SPILL_MAX_MB: int = 2048
+
+    # Куски parsed_text для чтения диапазонами (GET /documents/{id}/text), в символах
+    TEXT_CHUNK_CHARS: int = 64 * 1024
+
+    # Чанки для map-reduce суммаризации (strategy="chunked"), в словах
+    CHUNK_MIN_WORDS: int = 150
+    CHUNK_MAX_WORDS: int = 500
+
+    # --- Прогрев и компиляция при загрузке модели ---
+    WARMUP_ENABLED: bool = True
+    # Вход модели дополняется до ближайшей корзины длины (в токенах)
+    INPUT_LENGTH_BUCKETS: List[int] = [128, 256, 512, 1024]
+    # none | torchscript | torch_compile
+    WARMUP_COMPILE: str = "none"
+    # Кэш скомпилированных артефактов между перезапусками
+    COMPILE_CACHE_DIR: str = "/tmp/summarizer-compile-cache"
+
+    # --- Ответы API ---
+    # Тела меньше не сжимаются (gzip / br)
+    HTTP_COMPRESSION_MIN_BYTES: int = 1024
+    # Кэш готовых тел неизменяемых ответов (документы, готовые суммаризации)
+    HTTP_BODY_CACHE_MB: int = 64
+    # Записей в пачке курсора при выгрузке NDJSON (/summaries/export, /documents/export)
+    EXPORT_BATCH_SIZE: int = 500
+
+    # --- Исполнение инференса на CPU ---
+    # Сколько процессов инференса делят машину (воркеры uvicorn / --concurrency Celery)
+    INFERENCE_PROCESSES: int = 1
+    # Номер этого процесса среди них (для привязки к своей доле ядер);
+    # без него при INFERENCE_PROCESSES > 1 привязка к ядрам отключается
+    INFERENCE_PROCESS_INDEX: Optional[int] = None
+    # Число параллельных generate в процессе и потоков torch на каждый; None - по числу ядер
+    INFERENCE_SLOTS: Optional[int] = None
+    INFERENCE_THREADS_PER_SLOT: Optional[int] = None
+    # Привязывать слоты к ядрам (соседним в пределах NUMA-узла)
+    INFERENCE_PIN_CPUS: bool = False
+
+    # --- Сервер модели (python -m backend.app.workers.model_server) ---
+    # Если задан, API в режиме BackgroundTasks не грузит модель, а обращается к серверу
+    MODEL_SERVER_SOCKET: Optional[str] = None
+    MODEL_SERVER_MAX_BATCH: int = 8
+    MODEL_SERVER_BATCH_WAIT_MS: float = 5.0
+    # Тексты длиннее передаются через shared memory
+    MODEL_SERVER_SHM_THRESHOLD_BYTES: int = 64 * 1024
+
+    # --- Автоскейлер воркеров (python -m backend.app.workers.autoscaler) ---
+    AUTOSCALER_MIN_WORKERS: int = 1
+    AUTOSCALER_MAX_WORKERS: int = 4
+    # Задач в очереди на воркера (пока нет данных о латентности)
+    AUTOSCALER_QUEUE_PER_WORKER: float = 4.0
+    # Целевое ожидание задачи в очереди; None - масштабирование только по глубине очереди
+    AUTOSCALER_TARGET_WAIT_MS: Optional[float] = None
+    AUTOSCALER_SCALE_DOWN_RATIO: float = 0.5
+    AUTOSCALER_SCALE_UP_AFTER_S: float = 10.0
+    AUTOSCALER_SCALE_DOWN_AFTER_S: float = 60.0
+    AUTOSCALER_COOLDOWN_S: float = 30.0
+    AUTOSCALER_WORKER_MEMORY_MB: float = 1500.0
+    AUTOSCALER_MEMORY_BUDGET_MB: Optional[float] = None
+    AUTOSCALER_INTERVAL_S: float = 5.0
 
     class Config:
         # Это позволит Pydantic читать переменные из .env файла
@@ -0,0 +1,13 @@
+# backend/app/domain/entities.py
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+
+@dataclass
+class SummarizationResult:
+    """Результат суммаризации вместе с информацией о том, как он был получен."""
+    text: str
+    # Метаданные генерации (профиль, латентность и т.п.), сохраняются в SummaryModel
+    generation_info: Dict[str, Any] = field(default_factory=dict)
+    # Суммаризации чанков по хэшу (strategy="chunked"), переиспользуются следующими версиями документа
+    chunk_summaries: Dict[str, str] = field(default_factory=dict)
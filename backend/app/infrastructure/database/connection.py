@@ -1,6 +1,13 @@
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
-from backend.app.infrastructure.database.models import DocumentModel, SummaryModel
+from backend.app.infrastructure.database.models import DocumentModel, DocumentTextChunk, SummaryModel
+
+# Список всех ваших Beanie-моделей
+DOCUMENT_MODELS = [
+    DocumentModel,
+    DocumentTextChunk,
+    SummaryModel
+]
 
 
 async def init_database(db_url: str, db_name: str):
@@ -11,14 +18,8 @@ async def init_database(db_url: str, db_name: str):
     client = AsyncIOMotorClient(db_url)
     database = client[db_name]  # Имя БД берется из DSN
 
-    # Список всех ваших Beanie-моделей
-    document_models = [
-        DocumentModel,
-        SummaryModel
-    ]
-
     await init_beanie(
         database=database,
-        document_models=document_models
+        document_models=DOCUMENT_MODELS
     )
     print("Beanie initialization complete.")
\ No newline at end of file
@@ -1,8 +1,16 @@
 # app/infrastructure/database/models.py
-from beanie import Document
-from pydantic import Field
+from beanie import Document, PydanticObjectId
+from pymongo import IndexModel, TEXT
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+
+class TokenIdsCache(BaseModel):
+    """Заранее посчитанные id токенов входа модели (компактный массив uint16/int32)."""
+    key: str  # токенизатор + длина входа + пре-фильтр, см. token_cache.cache_key
+    dtype: str  # "uint16" | "int32"
+    data: bytes
 
 
 class DocumentModel(Document):
@@ -14,12 +22,66 @@ class DocumentModel(Document):
     parsed_text: Optional[str] = None
     storage_ref: Optional[str] = None  # если используете GridFS/S3
     title: Optional[str] = None
+    token_ids: Optional[TokenIdsCache] = None  # считается при загрузке, см. token_cache
+    # Версии: все версии ссылаются на исходный документ (root_id), первая версия - сам исходный
+    root_id: Optional[str] = None
+    parent_id: Optional[str] = None
+    version: int = 1
+    diff_stats: Optional[Dict[str, int]] = None  # изменения абзацев относительно parent_id
+    # Индекс текста для чтения диапазонами (GET /documents/{id}/text), строится при загрузке
+    text_length: Optional[int] = None
+    paragraph_spans: Optional[List[int]] = None  # [start0, end0, start1, end1, ...] в символах
+    text_chunk_chars: Optional[int] = None  # размер чанка DocumentTextChunk; None - чанков нет
 
     class Settings:
         name = "documents"
         indexes = [
             "uploaded_at",
-            [("filename", 1)]
+            [("filename", 1)],
+            # Номер версии уникален в цепочке; у исходных документов root_id нет
+            IndexModel(
+                [("root_id", 1), ("version", 1)],
+                name="root_id_version_unique",
+                unique=True,
+                partialFilterExpression={"root_id": {"$type": "string"}}
+            ),
+            # Полнотекстовый поиск (GET /search), стемминг русского языка
+            IndexModel(
+                [("title", TEXT), ("parsed_text", TEXT)],
+                name="documents_text",
+                default_language="russian",
+                weights={"title": 5, "parsed_text": 1}
+            )
+        ]
+
+
+class DocumentMeta(BaseModel):
+    """Проекция DocumentModel без текста: ETag и Last-Modified без чтения parsed_text."""
+    id: PydanticObjectId = Field(alias="_id")
+    uploaded_at: datetime
+    version: int = 1
+
+
+class DocumentTextIndex(BaseModel):
+    """Проекция DocumentModel для чтения текста диапазонами (без parsed_text)."""
+    id: PydanticObjectId = Field(alias="_id")
+    uploaded_at: datetime
+    version: int = 1
+    text_length: Optional[int] = None
+    paragraph_spans: Optional[List[int]] = None
+    text_chunk_chars: Optional[int] = None
+
+
+class DocumentTextChunk(Document):
+    """Кусок parsed_text фиксированной длины: диапазон текста читается без всего документа."""
+    document_id: str
+    index: int  # кусок покрывает символы [index * text_chunk_chars, (index + 1) * text_chunk_chars)
+    text: str
+
+    class Settings:
+        name = "document_text_chunks"
+        indexes = [
+            IndexModel([("document_id", 1), ("index", 1)], unique=True)
         ]
 
 
@@ -29,12 +91,16 @@ class SummaryModel(Document):
     params: Dict[str, Any] = Field(default_factory=dict)
     summary_text: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None  # переход в done/failed (Last-Modified ответа)
     status: str = Field("done")  # queued|running|done|failed
     error_message: Optional[str] = None
+    generation_info: Dict[str, Any] = Field(default_factory=dict)  # профиль, латентность и т.п.
+    chunk_summaries: Dict[str, str] = Field(default_factory=dict)  # хэш чанка -> суммаризация
 
     class Settings:
         name = "summaries"
         indexes = [
             [("document_id", 1)],
-            [("created_at", -1)]
+            [("created_at", -1)],
+            IndexModel([("summary_text", TEXT)], name="summaries_text", default_language="russian")
         ]
\ No newline at end of file
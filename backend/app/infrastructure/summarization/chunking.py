@@ -0,0 +1,110 @@
+# backend/app/infrastructure/summarization/chunking.py
+"""
+Разбиение текста на чанки по абзацам для map-reduce суммаризации.
+
+Границы чанков определяются содержимым абзацев (content-defined chunking),
+а не сквозным счётчиком длины: правка в одном месте документа меняет только
+соседние чанки, остальные сохраняют хэш, и их суммаризации можно взять
+из предыдущей версии документа.
+"""
+import difflib
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+STRATEGY_SINGLE = "single"  # весь текст одним прогоном модели
+STRATEGY_CHUNKED = "chunked"  # суммаризация чанков + итоговая по их суммаризациям
+STRATEGIES = (STRATEGY_SINGLE, STRATEGY_CHUNKED)
+
+# После набора min_words чанк заканчивается на абзаце, хэш которого делится на это число
+_BOUNDARY_DIVISOR = 3
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    text: str
+    hash: str
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Парсеры соединяют абзацы через '\\n'; пустые строки отбрасываются."""
+    return [p.strip() for p in text.splitlines() if p.strip()]
+
+
+def paragraph_spans(text: str) -> List[int]:
+    """
+    Границы абзацев split_paragraphs в исходном тексте, плоским списком
+    [start0, end0, start1, end1, ...] (смещения в символах, end - не включая).
+    """
+    spans = []
+    position = 0
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped:
+            start = position + line.index(stripped[0])
+            spans += [start, start + len(stripped)]
+        position += len(line)
+    return spans
+
+
+def paragraph_hash(paragraph: str) -> str:
+    """Хэш абзаца без учёта различий в пробелах."""
+    normalized = _WHITESPACE_RE.sub(" ", paragraph).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def chunk_paragraphs(paragraphs: List[str], min_words: int, max_words: int) -> List[Chunk]:
+    """
+    Собирает абзацы в чанки от min_words до max_words слов (абзац длиннее
+    max_words - отдельный чанк). Граница после абзаца зависит только от него
+    самого, поэтому вставка/удаление абзаца не сдвигает границы дальше по тексту.
+    """
+    chunks = []
+    current: List[str] = []
+    current_words = 0
+
+    def flush():
+        nonlocal current, current_words
+        if current:
+            text = "\n".join(current)
+            chunks.append(Chunk(text=text, hash=hashlib.sha256(text.encode("utf-8")).hexdigest()))
+        current, current_words = [], 0
+
+    for paragraph in paragraphs:
+        words = len(paragraph.split())
+        if current and current_words + words > max_words:
+            flush()
+        current.append(paragraph)
+        current_words += words
+        if current_words >= min_words and int(paragraph_hash(paragraph), 16) % _BOUNDARY_DIVISOR == 0:
+            flush()
+    flush()
+    return chunks
+
+
+def chunk_text(text: str, min_words: int, max_words: int) -> List[Chunk]:
+    return chunk_paragraphs(split_paragraphs(text), min_words, max_words)
+
+
+def diff_paragraphs(old_text: str, new_text: str) -> Dict[str, int]:
+    """Сводка изменений между версиями на уровне абзацев."""
+    old = [paragraph_hash(p) for p in split_paragraphs(old_text)]
+    new = [paragraph_hash(p) for p in split_paragraphs(new_text)]
+    stats = {"unchanged": 0, "added": 0, "removed": 0, "changed": 0}
+    matcher = difflib.SequenceMatcher(a=old, b=new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            stats["unchanged"] += i2 - i1
+        elif tag == "insert":
+            stats["added"] += j2 - j1
+        elif tag == "delete":
+            stats["removed"] += i2 - i1
+        else:  # replace
+            common = min(i2 - i1, j2 - j1)
+            stats["changed"] += common
+            stats["removed"] += (i2 - i1) - common
+            stats["added"] += (j2 - j1) - common
+    return stats
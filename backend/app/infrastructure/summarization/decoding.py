@@ -0,0 +1,100 @@
+# backend/app/infrastructure/summarization/decoding.py
+"""
+Профили декодирования и выбор профиля под бюджет латентности.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class DecodingProfile:
+    """Набор параметров model.generate с оценкой относительной стоимости."""
+    name: str
+    generate_kwargs: Dict[str, Any] = field(default_factory=dict)
+    # Стоимость относительно жадного декодирования (для оценки латентности)
+    relative_cost: float = 1.0
+    # Профиль, на который понижаемся, если не укладываемся в бюджет
+    fallback: Optional[str] = None
+
+
+PROFILES: Dict[str, DecodingProfile] = {
+    "fast": DecodingProfile(
+        name="fast",
+        generate_kwargs={"num_beams": 1, "do_sample": False},
+        relative_cost=1.0,
+    ),
+    "quality": DecodingProfile(
+        name="quality",
+        generate_kwargs={"num_beams": 4, "early_stopping": True},
+        relative_cost=4.0,
+        fallback="fast",
+    ),
+    "no_repeat": DecodingProfile(
+        name="no_repeat",
+        generate_kwargs={"num_beams": 4, "early_stopping": True, "no_repeat_ngram_size": 3},
+        relative_cost=4.5,
+        fallback="fast",
+    ),
+}
+
+DEFAULT_PROFILE = "quality"
+
+
+def get_profile(name: Optional[str]) -> DecodingProfile:
+    """Возвращает профиль по имени (None -> профиль по умолчанию)."""
+    profile = PROFILES.get(name or DEFAULT_PROFILE)
+    if profile is None:
+        raise ValueError(f"Неизвестный профиль декодирования '{name}'. Доступны: {list(PROFILES)}")
+    return profile
+
+
+class LatencyEstimator:
+    """
+    Скользящая (EMA) оценка времени генерации одного токена для каждого профиля.
+    Используется, чтобы заранее понизить профиль, если он не уложится в бюджет.
+    """
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self._ms_per_token: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, profile: DecodingProfile, max_length: int, latency_ms: float) -> None:
+        rate = latency_ms / max(max_length, 1)
+        with self._lock:
+            prev = self._ms_per_token.get(profile.name)
+            self._ms_per_token[profile.name] = rate if prev is None else prev + self.alpha * (rate - prev)
+
+    def predict(self, profile: DecodingProfile, max_length: int) -> Optional[float]:
+        """Прогноз латентности в мс или None, если данных ещё нет."""
+        with self._lock:
+            rate = self._ms_per_token.get(profile.name)
+            if rate is None:
+                # Нет замеров по этому профилю - пересчитываем из любого другого
+                for name, other_rate in self._ms_per_token.items():
+                    rate = other_rate / PROFILES[name].relative_cost * profile.relative_cost
+                    break
+        return None if rate is None else rate * max_length
+
+
+def choose_profile(
+        profile: DecodingProfile,
+        max_length: int,
+        max_latency_ms: Optional[int],
+        estimator: LatencyEstimator,
+) -> Tuple[DecodingProfile, bool]:
+    """
+    Понижает профиль по цепочке fallback, пока прогноз не уложится в бюджет.
+    Возвращает (профиль, был_ли_понижен).
+    """
+    if not max_latency_ms:
+        return profile, False
+
+    chosen = profile
+    while chosen.fallback:
+        predicted = estimator.predict(chosen, max_length)
+        if predicted is None or predicted <= max_latency_ms:
+            break
+        chosen = PROFILES[chosen.fallback]
+    return chosen, chosen is not profile
@@ -0,0 +1,177 @@
+# backend/app/infrastructure/summarization/encoder_cache.py
+"""
+Кэш выходов энкодера: повторная суммаризация того же входа с другими
+min_length/max_length/профилем запускает только декодер.
+"""
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import torch
+
+log = logging.getLogger(__name__)
+
+
+def encoder_cache_key(model_name: str, input_ids: torch.Tensor) -> str:
+    """Ключ: модель + точные id токенов входа (хэш, а не сам текст)."""
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    digest.update(input_ids.detach().cpu().numpy().tobytes())
+    return digest.hexdigest()
+
+
+class EncoderOutputCache:
+    """
+    LRU-кэш last_hidden_state энкодера в памяти процесса (ограничение по байтам).
+    Вытесненные записи по желанию сбрасываются на локальный диск (тоже с лимитом)
+    и поднимаются обратно в память при следующем обращении. Размер и порядок
+    файлов на диске учитываются в памяти (каталог читается один раз при
+    старте), лимит диска - на процесс.
+    """
+
+    def __init__(
+            self,
+            max_bytes: int,
+            fp16: bool = False,
+            spill_dir: Optional[str] = None,
+            spill_max_bytes: int = 0,
+    ):
+        self.max_bytes = max_bytes
+        self.fp16 = fp16
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
+
+        self._entries: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Файлы на диске: ключ -> размер, от давно использованных к недавним
+        self._spilled: "OrderedDict[str, int]" = OrderedDict()
+        self._spill_size = 0
+
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            if self.spill_max_bytes > 0:
+                self._scan_spill_dir()
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["EncoderOutputCache"]:
+        if settings.ENCODER_CACHE_MAX_MB <= 0:
+            return None
+        return cls(
+            max_bytes=settings.ENCODER_CACHE_MAX_MB * 1024 * 1024,
+            fp16=settings.ENCODER_CACHE_FP16,
+            spill_dir=settings.ENCODER_CACHE_SPILL_DIR,
+            spill_max_bytes=settings.ENCODER_CACHE_SPILL_MAX_MB * 1024 * 1024,
+        )
+
+    def get(self, key: str, device: str, dtype: torch.dtype) -> Optional[torch.Tensor]:
+        with self._lock:
+            hidden = self._entries.get(key)
+            if hidden is not None:
+                self._entries.move_to_end(key)
+        if hidden is None:
+            hidden = self._load_spilled(key)
+            if hidden is not None:
+                self._put_in_memory(key, hidden)
+
+        with self._lock:
+            if hidden is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if hidden is None:
+            return None
+        return hidden.to(device=device, dtype=dtype)
+
+    def put(self, key: str, hidden: torch.Tensor) -> None:
+        stored = hidden.detach().to("cpu", dtype=torch.float16 if self.fp16 else hidden.dtype).contiguous()
+        self._put_in_memory(key, stored)
+
+    def _put_in_memory(self, key: str, stored: torch.Tensor) -> None:
+        nbytes = stored.numel() * stored.element_size()
+        if nbytes > self.max_bytes:
+            return
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = stored
+            self._size += nbytes
+            while self._size > self.max_bytes:
+                old_key, old = self._entries.popitem(last=False)
+                self._size -= old.numel() * old.element_size()
+                evicted.append((old_key, old))
+        # Запись на диск вне блокировки
+        for old_key, old in evicted:
+            self._spill(old_key, old)
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, f"{key}.pt")
+
+    def _scan_spill_dir(self) -> None:
+        """Файлы, оставшиеся с прошлого запуска, в порядке последнего использования."""
+        files = []
+        for entry in os.scandir(self.spill_dir):
+            if entry.name.endswith(".pt"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(".pt")], stat.st_size))
+        for _, key, size in sorted(files):
+            self._spilled[key] = size
+            self._spill_size += size
+        self._trim_spill_dir()
+
+    def _spill(self, key: str, stored: torch.Tensor) -> None:
+        if not self.spill_dir or self.spill_max_bytes <= 0:
+            return
+        path = self._spill_path(key)
+        try:
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            torch.save(stored, tmp_path)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning(f"Failed to spill encoder output to disk: {e}")
+            return
+        with self._lock:
+            self._spill_size += size - self._spilled.pop(key, 0)
+            self._spilled[key] = size
+        self._trim_spill_dir()
+
+    def _load_spilled(self, key: str) -> Optional[torch.Tensor]:
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(key)
+        try:
+            hidden = torch.load(path, weights_only=True)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(f"Failed to load spilled encoder output '{path}': {e}")
+            return None
+        with self._lock:
+            if key in self._spilled:
+                self._spilled.move_to_end(key)
+        try:
+            os.utime(path)  # порядок LRU для следующего запуска
+        except OSError:
+            pass
+        return hidden
+
+    def _trim_spill_dir(self) -> None:
+        """Удаляет самые давно использованные файлы сверх spill_max_bytes."""
+        removed = []
+        with self._lock:
+            while self._spill_size > self.spill_max_bytes and self._spilled:
+                key, size = self._spilled.popitem(last=False)
+                self._spill_size -= size
+                removed.append(key)
+        for key in removed:
+            try:
+                os.remove(self._spill_path(key))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,161 @@
+# backend/app/infrastructure/summarization/execution.py
+"""
+Модель исполнения инференса на CPU: K слотов (потоков) с фиксированным
+числом потоков torch и, по желанию, привязкой к ядрам / NUMA-узлам.
+
+Без этого несколько параллельных generate (и несколько процессов Celery)
+каждый пытаются занять все ядра и мешают друг другу.
+"""
+import glob
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+import torch
+
+log = logging.getLogger(__name__)
+
+# Больше ~4 потоков на один generate на CPU почти не ускоряет, лучше отдать ядра другому слоту
+_AUTO_MAX_THREADS_PER_SLOT = 4
+
+
+def _parse_cpulist(value: str) -> List[int]:
+    """'0-3,8,10-11' -> [0, 1, 2, 3, 8, 10, 11]"""
+    cpus = []
+    for part in value.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-")
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def available_cpus() -> List[int]:
+    """Доступные процессу ядра, упорядоченные по NUMA-узлам (если топология известна)."""
+    if hasattr(os, "sched_getaffinity"):
+        allowed = set(os.sched_getaffinity(0))
+    else:
+        allowed = set(range(os.cpu_count() or 1))
+
+    ordered = []
+    for node_path in sorted(glob.glob("/sys/devices/system/node/node[0-9]*/cpulist")):
+        try:
+            with open(node_path) as f:
+                ordered.extend(cpu for cpu in _parse_cpulist(f.read()) if cpu in allowed)
+        except OSError:
+            continue
+    # Ядра, не попавшие ни в один узел (или нет /sys) - в конец по порядку
+    ordered.extend(sorted(allowed - set(ordered)))
+    return ordered
+
+
+@dataclass(frozen=True)
+class InferencePolicy:
+    """Сколько слотов инференса, по сколько потоков torch и к каким ядрам они привязаны."""
+    slots: int
+    threads_per_slot: int
+    # Наборы ядер по слотам; None - без привязки
+    cpu_sets: Optional[List[List[int]]] = None
+
+    @classmethod
+    def detect(
+            cls,
+            settings,
+            slots: Optional[int] = None,
+            process_index: Optional[int] = None,
+    ) -> "InferencePolicy":
+        """
+        Делит доступные ядра между INFERENCE_PROCESSES процессами, а долю
+        процесса - между слотами. slots/process_index переопределяют настройки
+        (например, воркер Celery всегда работает одним слотом).
+        """
+        cpus = available_cpus()
+        processes = max(settings.INFERENCE_PROCESSES, 1)
+        share = max(len(cpus) // processes, 1)
+
+        index = settings.INFERENCE_PROCESS_INDEX if process_index is None else process_index
+        pin = settings.INFERENCE_PIN_CPUS
+        if processes > 1 and index is not None and len(cpus) >= processes:
+            start = (index % processes) * share
+            process_cpus = cpus[start:start + share]
+        else:
+            process_cpus = cpus[:share]
+            if pin and processes > 1:
+                # Без номера процесса все процессы взяли бы одни и те же первые ядра
+                log.warning(
+                    f"INFERENCE_PROCESSES={processes}, but process index is unknown: "
+                    f"CPU pinning disabled (set INFERENCE_PROCESS_INDEX per process)"
+                )
+                pin = False
+
+        slots = slots or settings.INFERENCE_SLOTS
+        threads = settings.INFERENCE_THREADS_PER_SLOT
+        if slots and not threads:
+            threads = max(share // slots, 1)
+        elif threads and not slots:
+            slots = max(share // threads, 1)
+        elif not slots and not threads:
+            threads = min(share, _AUTO_MAX_THREADS_PER_SLOT)
+            slots = max(share // threads, 1)
+
+        cpu_sets = None
+        if pin:
+            # Соседние ядра (в порядке NUMA-узлов) - одному слоту
+            cpu_sets = [
+                process_cpus[i * threads:(i + 1) * threads] or process_cpus
+                for i in range(slots)
+            ]
+        return cls(slots=slots, threads_per_slot=threads, cpu_sets=cpu_sets)
+
+    def apply_to_process(self) -> None:
+        """Число потоков torch задаётся на весь процесс (одинаково для всех слотов)."""
+        torch.set_num_threads(self.threads_per_slot)
+        try:
+            # Межоперационный параллелизм не нужен: параллельность дают слоты
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Можно задать только до первого параллельного участка
+            pass
+        log.info(
+            f"Inference policy: {self.slots} slot(s) x {self.threads_per_slot} torch thread(s), "
+            f"pinning: {self.cpu_sets if self.cpu_sets else 'off'}"
+        )
+
+    def pin_current_thread(self, slot: int) -> None:
+        """
+        Привязывает текущий поток к ядрам слота. Потоки OpenMP, которые torch
+        создаёт из этого потока, наследуют привязку.
+        """
+        if not self.cpu_sets or not hasattr(os, "sched_setaffinity"):
+            return
+        cpus = self.cpu_sets[slot % len(self.cpu_sets)]
+        try:
+            os.sched_setaffinity(threading.get_native_id(), cpus)
+            torch.set_num_threads(self.threads_per_slot)
+        except OSError as e:
+            log.warning(f"Failed to pin inference slot {slot} to CPUs {cpus}: {e}")
+
+
+class InferenceExecutor(ThreadPoolExecutor):
+    """Выделенный пул из policy.slots потоков инференса, каждый привязан к своему набору ядер."""
+
+    def __init__(self, policy: InferencePolicy):
+        self.policy = policy
+        policy.apply_to_process()
+
+        free_slots: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+        for slot in range(policy.slots):
+            free_slots.put(slot)
+
+        super().__init__(
+            max_workers=policy.slots,
+            thread_name_prefix="inference",
+            initializer=lambda: policy.pin_current_thread(free_slots.get()),
+        )
@@ -0,0 +1,184 @@
+# backend/app/infrastructure/summarization/extractive.py
+"""
+Экстрактивная суммаризация (TextRank поверх TF-IDF, NumPy/SciPy sparse).
+
+Работает за миллисекунды и используется двумя способами:
+как самостоятельный метод и как пре-фильтр, отбирающий самые
+значимые предложения под бюджет входа нейросетевой модели.
+"""
+import re
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+# Границы предложений: знак препинания + пробел + заглавная буква/цифра/кавычка
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+(?=[«\"(\[]?[A-ZА-ЯЁ0-9])")
+_WORD_RE = re.compile(r"[a-zа-яё0-9]+")
+
+# Грубый стемминг: усечение слова до префикса (достаточно для весов TF-IDF)
+_STEM_LEN = 6
+_MIN_WORD_LEN = 3
+# Термины, встречающиеся в большей доле предложений, не учитываются
+_MAX_DF = 0.5
+# Суммарная близость ниже порога - шум округления: предложение ни с чем не связано
+_MIN_OUT_WEIGHT = 1e-9
+
+_STOPWORDS = frozenset(
+    "это как так что его она они оно был была были быть для или при без над под про "
+    "все всё уже еще ещё даже только также тоже чтобы если когда где там тут здесь "
+    "этот эта эти того тем том той который которая которые которых the and for with".split()
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Делит текст на предложения (абзацы - всегда отдельные границы)."""
+    sentences = []
+    for paragraph in text.split("\n"):
+        paragraph = paragraph.strip()
+        if paragraph:
+            sentences.extend(s.strip() for s in _SENTENCE_RE.split(paragraph) if s.strip())
+    return sentences
+
+
+def _term_matrix(sentences: Sequence[str]) -> sparse.csr_matrix:
+    """Матрица предложение x термин с весами log-TF * IDF, строки L2-нормированы."""
+    vocab: dict[str, int] = {}
+    rows, cols = [], []
+    for i, sentence in enumerate(sentences):
+        for word in _WORD_RE.findall(sentence.lower()):
+            if len(word) < _MIN_WORD_LEN or word in _STOPWORDS:
+                continue
+            rows.append(i)
+            cols.append(vocab.setdefault(word[:_STEM_LEN], len(vocab)))
+
+    n = len(sentences)
+    tf = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(n, len(vocab)),
+    )
+    tf.sum_duplicates()
+
+    df = np.bincount(tf.indices, minlength=len(vocab))
+    idf = np.log((1 + n) / (1 + df)).astype(np.float32) + 1.0
+    if n > 2:
+        idf[df > _MAX_DF * n] = 0.0
+
+    tf.data = 1.0 + np.log(tf.data)
+    weighted = sparse.csr_matrix(tf.multiply(idf[np.newaxis, :]))
+    norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ weighted
+
+
+def textrank_scores(
+        sentences: Sequence[str],
+        damping: float = 0.85,
+        max_iter: int = 50,
+        tol: float = 1e-6,
+) -> np.ndarray:
+    """PageRank по графу косинусной близости предложений."""
+    n = len(sentences)
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    if n == 1:
+        return np.ones(1, dtype=np.float32)
+
+    # Матрица близости S = X X^T (без диагонали) не строится явно:
+    # S r = X (X^T r) - diag(S) r, что даёт O(nnz) на итерацию вместо O(n^2)
+    # float64: в float32 ошибка округления X X^T сравнима с малыми весами рёбер
+    x = _term_matrix(sentences).astype(np.float64)
+    xt = x.T.tocsr()
+    self_similarity = np.asarray(x.multiply(x).sum(axis=1)).ravel()
+
+    def similarity_dot(v: np.ndarray) -> np.ndarray:
+        return x @ (xt @ v) - self_similarity * v
+
+    out_weight = similarity_dot(np.ones(n))
+    dangling = out_weight <= _MIN_OUT_WEIGHT
+    out_weight[dangling] = 1.0
+
+    scores = np.full(n, 1.0 / n, dtype=np.float64)
+    for _ in range(max_iter):
+        dangling_mass = scores[dangling].sum() / n
+        # Переход по строкам нормированной S: r' = S^T (r / w), S симметрична
+        spread = scores / out_weight
+        spread[dangling] = 0.0
+        updated = (1 - damping) / n + damping * (similarity_dot(spread) + dangling_mass)
+        if np.abs(updated - scores).sum() < tol:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def select_salient(
+        text: str,
+        token_budget: int,
+        count_tokens: Callable[[List[str]], List[int]],
+) -> Optional[str]:
+    """
+    Отбирает самые значимые предложения, суммарно не длиннее token_budget
+    токенов, и возвращает их в исходном порядке. count_tokens считает
+    токены для списка предложений (батчем). Возвращает None, если текст
+    и так укладывается в бюджет.
+    """
+    sentences = split_sentences(text)
+    lengths = count_tokens(sentences)
+    if sum(lengths) <= token_budget:
+        return None
+
+    scores = textrank_scores(sentences)
+    chosen, used = [], 0
+    for idx in np.argsort(-scores, kind="stable"):
+        if used + lengths[idx] > token_budget:
+            continue
+        chosen.append(idx)
+        used += lengths[idx]
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def prefilter_for_model(text: str, tokenizer, max_input_tokens: int) -> Optional[str]:
+    """
+    Если текст не помещается во вход модели, отбирает самые значимые
+    предложения под бюджет токенов. None - текст помещается целиком.
+    """
+    budget = max_input_tokens - 2  # место под служебные токены
+    # Токен не короче символа, поэтому короткие тексты заведомо помещаются
+    if len(text) <= budget:
+        return None
+
+    def count_tokens(sentences: List[str]) -> List[int]:
+        # Батч-вызов быстрого (Rust) токенизатора
+        ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+        return [len(sentence_ids) for sentence_ids in ids]
+
+    return select_salient(text, budget, count_tokens)
+
+
+class ExtractiveSummarizer:
+    """Самостоятельный экстрактивный метод суммаризации."""
+
+    def summarize(self, text: str, min_words: int, max_words: int) -> str:
+        """
+        Возвращает лучшие предложения в исходном порядке: не меньше
+        min_words слов (если хватает текста) и не больше max_words.
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            return ""
+        scores = textrank_scores(sentences)
+        lengths = [len(s.split()) for s in sentences]
+
+        chosen, used = [], 0
+        for idx in np.argsort(-scores, kind="stable"):
+            if used >= min_words and used + lengths[idx] > max_words:
+                break
+            if used + lengths[idx] > max_words:
+                continue
+            chosen.append(idx)
+            used += lengths[idx]
+        if not chosen:
+            # Даже самое короткое из лучших предложений длиннее max_words - обрезаем лучшее
+            return " ".join(sentences[int(np.argmax(scores))].split()[:max_words])
+        return " ".join(sentences[i] for i in sorted(chosen))
@@ -0,0 +1,219 @@
+# backend/app/infrastructure/summarization/ipc_protocol.py
+"""
+Бинарный протокол между API и локальным сервером модели (Unix-сокет).
+
+Кадр: заголовок HEADER (версия, тип, флаги, id запроса, длина) + полезная
+нагрузка. Поля нагрузки - числа фиксированной ширины и строки с префиксом
+длины. Большие тексты передаются через shared memory: в кадре только имя
+сегмента и размер, сегмент создаёт и удаляет клиент.
+"""
+import asyncio
+import json
+import struct
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Tuple
+
+from backend.app.domain.entities import SummarizationResult
+from backend.app.infrastructure.database.models import TokenIdsCache
+
+PROTOCOL_VERSION = 1
+# version, type, flags, request_id, payload_len
+HEADER = struct.Struct("!BBHII")
+
+MSG_SUMMARIZE = 1
+MSG_RESULT = 2
+MSG_ERROR = 3
+
+FLAG_TEXT_SHM = 0x1  # текст запроса лежит в shared memory
+
+
+class ProtocolError(Exception):
+    pass
+
+
+@dataclass
+class SummarizeRequest:
+    text: str
+    min_length: int
+    max_length: int
+    profile: Optional[str] = None
+    max_latency_ms: Optional[int] = None
+    method: Optional[str] = None
+    token_ids: Optional[TokenIdsCache] = None
+    strategy: Optional[str] = None
+    reused_chunks: Dict[str, str] = field(default_factory=dict)
+
+
+class _Writer:
+    def __init__(self):
+        self._parts = []
+
+    def pack(self, fmt: str, *values) -> None:
+        self._parts.append(struct.pack("!" + fmt, *values))
+
+    def bytes32(self, data: bytes) -> None:
+        self.pack("I", len(data))
+        self._parts.append(data)
+
+    def str16(self, value: Optional[str]) -> None:
+        data = (value or "").encode("utf-8")
+        self.pack("H", len(data))
+        self._parts.append(data)
+
+    def str32(self, value: str) -> None:
+        self.bytes32(value.encode("utf-8"))
+
+    def str_map(self, values: Dict[str, str]) -> None:
+        self.pack("I", len(values))
+        for key, value in values.items():
+            self.str16(key)
+            self.str32(value)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._parts)
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def unpack(self, fmt: str) -> Tuple:
+        fmt = "!" + fmt
+        values = struct.unpack_from(fmt, self._view, self._pos)
+        self._pos += struct.calcsize(fmt)
+        return values
+
+    def _take(self, size: int) -> bytes:
+        if self._pos + size > len(self._view):
+            raise ProtocolError("Truncated payload")
+        data = self._view[self._pos:self._pos + size].tobytes()
+        self._pos += size
+        return data
+
+    def bytes32(self) -> bytes:
+        (size,) = self.unpack("I")
+        return self._take(size)
+
+    def str16(self) -> Optional[str]:
+        (size,) = self.unpack("H")
+        return self._take(size).decode("utf-8") or None
+
+    def str32(self) -> str:
+        return self.bytes32().decode("utf-8")
+
+    def str_map(self) -> Dict[str, str]:
+        (count,) = self.unpack("I")
+        return {self.str16(): self.str32() for _ in range(count)}
+
+
+# --- shared memory ---
+
+def write_shared_text(text: str) -> Tuple[shared_memory.SharedMemory, int]:
+    """Кладёт текст в новый сегмент; вызывающий обязан сделать close() и unlink()."""
+    data = text.encode("utf-8")
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[:len(data)] = data
+    return shm, len(data)
+
+
+def read_shared_text(name: str, size: int) -> str:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # Сегмент принадлежит клиенту: без этого resource_tracker сервера удалит его при выходе
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return bytes(shm.buf[:size]).decode("utf-8")
+    finally:
+        shm.close()
+
+
+# --- сообщения ---
+
+def encode_request(request: SummarizeRequest, shm_name: Optional[str] = None, shm_size: int = 0) -> Tuple[int, bytes]:
+    """Возвращает (флаги, нагрузка). При shm_name текст берётся из shared memory."""
+    w = _Writer()
+    w.pack("HHI", request.min_length, request.max_length, request.max_latency_ms or 0)
+    w.str16(request.profile)
+    w.str16(request.method)
+    w.str16(request.strategy)
+    flags = 0
+    if shm_name:
+        flags |= FLAG_TEXT_SHM
+        w.str16(shm_name)
+        w.pack("I", shm_size)
+    else:
+        w.str32(request.text)
+    w.pack("?", request.token_ids is not None)
+    if request.token_ids is not None:
+        w.str16(request.token_ids.key)
+        w.str16(request.token_ids.dtype)
+        w.bytes32(request.token_ids.data)
+    w.str_map(request.reused_chunks)
+    return flags, w.getvalue()
+
+
+def decode_request(flags: int, payload: bytes) -> SummarizeRequest:
+    r = _Reader(payload)
+    min_length, max_length, max_latency_ms = r.unpack("HHI")
+    profile, method, strategy = r.str16(), r.str16(), r.str16()
+    if flags & FLAG_TEXT_SHM:
+        name = r.str16()
+        (size,) = r.unpack("I")
+        text = read_shared_text(name, size)
+    else:
+        text = r.str32()
+    token_ids = None
+    (has_token_ids,) = r.unpack("?")
+    if has_token_ids:
+        token_ids = TokenIdsCache(key=r.str16(), dtype=r.str16(), data=r.bytes32())
+    return SummarizeRequest(
+        text=text,
+        min_length=min_length,
+        max_length=max_length,
+        profile=profile,
+        max_latency_ms=max_latency_ms or None,
+        method=method,
+        token_ids=token_ids,
+        strategy=strategy,
+        reused_chunks=r.str_map(),
+    )
+
+
+def encode_result(result: SummarizationResult) -> bytes:
+    w = _Writer()
+    w.str32(result.text)
+    # generation_info - произвольный словарь метаданных, он небольшой
+    w.str32(json.dumps(result.generation_info, ensure_ascii=False))
+    w.str_map(result.chunk_summaries)
+    return w.getvalue()
+
+
+def decode_result(payload: bytes) -> SummarizationResult:
+    r = _Reader(payload)
+    return SummarizationResult(text=r.str32(), generation_info=json.loads(r.str32()), chunk_summaries=r.str_map())
+
+
+def encode_error(message: str) -> bytes:
+    w = _Writer()
+    w.str32(message)
+    return w.getvalue()
+
+
+def decode_error(payload: bytes) -> str:
+    return _Reader(payload).str32()
+
+
+# --- кадры ---
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, int, int, bytes]:
+    """(тип, флаги, id запроса, нагрузка); IncompleteReadError - соединение закрыто."""
+    version, msg_type, flags, request_id, size = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+    return msg_type, flags, request_id, await reader.readexactly(size)
+
+
+def write_frame(writer: asyncio.StreamWriter, msg_type: int, request_id: int, payload: bytes, flags: int = 0) -> None:
+    writer.write(HEADER.pack(PROTOCOL_VERSION, msg_type, flags, request_id, len(payload)))
+    writer.write(payload)
@@ -1,86 +1,473 @@
 # backend/app/infrastructure/summarization/mbart_gateway.py
 import asyncio
 import logging
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+import time
+from collections import defaultdict
+from contextlib import nullcontext
 import torch
+from transformers.modeling_outputs import BaseModelOutput
+from backend.app.config import settings
 from backend.app.core.errors import SummarizationError
+from backend.app.domain.entities import SummarizationResult
+from backend.app.infrastructure.database.models import TokenIdsCache
+from backend.app.infrastructure.summarization.chunking import STRATEGY_CHUNKED, chunk_text
+from backend.app.infrastructure.summarization.decoding import LatencyEstimator, choose_profile, get_profile
+from backend.app.infrastructure.summarization.execution import InferenceExecutor, InferencePolicy
+from backend.app.infrastructure.summarization.encoder_cache import EncoderOutputCache, encoder_cache_key
+from backend.app.infrastructure.summarization.extractive import prefilter_for_model
+from backend.app.infrastructure.summarization.model_registry import (
+    DEFAULT_METHOD,
+    KIND_EXTRACTIVE,
+    LoadedModel,
+    ModelRegistry,
+)
+from backend.app.infrastructure.summarization.speculative import SpeculativeStats, supports_speculative
+from backend.app.infrastructure.summarization.token_cache import cache_key, unpack_ids
+from backend.app.infrastructure.summarization.warmup import (
+    bucket_length,
+    compile_model,
+    input_buckets,
+    pad_to_bucket,
+    warmup_model,
+)
 
 log = logging.getLogger(__name__)
 
 class SummarizationGateway:
     """
-    Обёртка для загрузки модели и выполнения инференса (суммаризации).
+    Обёртка для выполнения инференса (суммаризации).
+    Модели по методам загружаются и выгружаются через ModelRegistry.
     """
 
-    def __init__(self, model_name: str):
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+    def __init__(
+            self,
+            model_name: str | None = None,
+            device: str | None = None,
+            registry: ModelRegistry | None = None,
+            executor: InferenceExecutor | None = None,
+            preload: bool = True
+    ):
+        # Устройство можно задать явно (например, для бенчмарков cpu vs cuda)
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         log.info(f"Using device: {self.device}")  # <-- Изменить print на log.info
 
-        try:
-            log.info(f"Loading tokenizer '{model_name}'...")
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            log.info(f"Loading model '{model_name}' to {self.device}...")
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name).to(self.device)
-            log.info("Model and tokenizer loaded.")
-        except Exception as e:
-            log.error(f"Failed to load model '{model_name}': {e}")  # <-- Добавить лог
-            raise RuntimeError(f"Failed to load model '{model_name}': {e}")
+        # Выделенный пул слотов инференса с фиксированным числом потоков torch
+        self.executor = executor or InferenceExecutor(InferencePolicy.detect(settings))
+
+        # model_name переопределяет модель метода по умолчанию (settings.MODEL_NAME)
+        self.registry = registry or ModelRegistry.from_settings(
+            settings, device=self.device, default_model_name=model_name
+        )
+        # Каждая загружаемая модель компилируется (по настройке) и прогревается
+        self.registry.on_load = self._prepare_model
+        self.registry.start_idle_sweep()
+        self.ready = False
+        if preload:
+            self.warmup()
+
+        # Выходы энкодера по (модель, вход) - для повторных прогонов с другими параметрами
+        self.encoder_cache = EncoderOutputCache.from_settings(settings)
+
+        # Оценки латентности ведутся отдельно для каждого метода (модели)
+        self._latency_estimators: dict[str, LatencyEstimator] = defaultdict(LatencyEstimator)
+
+    def warmup(self) -> None:
+        """
+        Загрузка и прогрев модели по умолчанию, чтобы ошибки конфигурации
+        были видны на старте, а первые запросы не платили за прогрев.
+        """
+        self.registry.get(DEFAULT_METHOD)
+        self.ready = True
+
+    def _prepare_model(self, loaded: LoadedModel) -> None:
+        buckets = input_buckets(loaded.spec.max_input_tokens, settings.INPUT_LENGTH_BUCKETS)
+        compile_model(loaded, settings.WARMUP_COMPILE, buckets, settings.COMPILE_CACHE_DIR)
+        if settings.WARMUP_ENABLED:
+            warmup_model(loaded, buckets)
+
+    def close(self) -> None:
+        """Останавливает фоновую выгрузку простаивающих моделей."""
+        self.registry.stop_idle_sweep()
+
+    def _encode_input(
+            self,
+            text: str,
+            loaded: LoadedModel,
+            token_ids: TokenIdsCache | None = None
+    ) -> tuple[torch.Tensor, torch.Tensor, dict]:
+        """Возвращает (input_ids, attention_mask, сведения о входе) для generate."""
+        # Паддинг до корзины длины, а не до max_input_tokens: форм входа немного,
+        # и под них прогрета (и скомпилирована) модель
+        buckets = input_buckets(loaded.spec.max_input_tokens, settings.INPUT_LENGTH_BUCKETS)
+        pad_id = loaded.tokenizer.pad_token_id
+
+        if token_ids is not None and token_ids.key == cache_key(loaded.spec):
+            input_ids = unpack_ids(token_ids)
+            input_ids, attention_mask = pad_to_bucket(input_ids, torch.ones_like(input_ids), buckets, pad_id)
+            return input_ids.to(self.device), attention_mask.to(self.device), {"token_ids_cached": True}
+
+        # Экстрактивный пре-фильтр для текстов длиннее входа модели
+        prefiltered = (
+            prefilter_for_model(text, loaded.tokenizer, loaded.spec.max_input_tokens)
+            if settings.EXTRACTIVE_PREFILTER else None
+        )
+        inputs = loaded.tokenizer(
+            prefiltered or text,
+            return_tensors="pt",
+            truncation=True,
+            max_length=loaded.spec.max_input_tokens  # Ограничение на вход модели
+        )
+        input_ids, attention_mask = pad_to_bucket(inputs["input_ids"], inputs["attention_mask"], buckets, pad_id)
+        return input_ids.to(self.device), attention_mask.to(self.device), {
+            "token_ids_cached": False,
+            "prefiltered": prefiltered is not None,
+        }
+
+    def _encoder_outputs(
+            self,
+            loaded: LoadedModel,
+            input_ids: torch.Tensor,
+            attention_mask: torch.Tensor
+    ) -> tuple[BaseModelOutput, bool]:
+        """
+        Прогоняет энкодер или берёт его выход из кэша.
+        Возвращает (encoder_outputs для generate, было_ли_попадание).
+        """
+        model_dtype = loaded.model.dtype
+        key = None
+        if self.encoder_cache is not None:
+            key = encoder_cache_key(loaded.spec.model_name, input_ids)
+            hidden = self.encoder_cache.get(key, device=self.device, dtype=model_dtype)
+            if hidden is not None:
+                return BaseModelOutput(last_hidden_state=hidden), True
+
+        with torch.inference_mode():
+            # Скомпилированный энкодер (если есть для этой формы), иначе eager
+            hidden = loaded.compiled_encoder(input_ids, attention_mask) if loaded.compiled_encoder is not None else None
+            if hidden is None:
+                hidden = loaded.model.get_encoder()(
+                    input_ids=input_ids, attention_mask=attention_mask, return_dict=True
+                ).last_hidden_state
+        if key is not None:
+            self.encoder_cache.put(key, hidden)
+        return BaseModelOutput(last_hidden_state=hidden), False
+
+    def _extractive_summarize(self, text: str, min_length: int, max_length: int, loaded: LoadedModel) -> SummarizationResult:
+        """Экстрактивный метод: длины интерпретируются в словах, профиль не используется."""
+        started = time.perf_counter()
+        summary = loaded.model.summarize(text, min_words=min_length, max_words=max_length)
+        return SummarizationResult(
+            text=summary,
+            generation_info={
+                "method": loaded.spec.method,
+                "model": loaded.spec.model_name,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
 
     def _blocking_summarize(
             self,
             text: str,
             min_length: int,
-            max_length: int
-    ) -> str:
+            max_length: int,
+            profile: str | None = None,
+            max_latency_ms: int | None = None,
+            method: str | None = None,
+            token_ids: TokenIdsCache | None = None
+    ) -> SummarizationResult:
         """
         Синхронная (блокирующая) функция инференса.
+        При заданном max_latency_ms профиль может быть понижен заранее,
+        а генерация остановлена досрочно по истечении бюджета.
         """
+        started = time.perf_counter()
+        method = method or DEFAULT_METHOD
         try:
-            # 1. Токенизация
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                padding="max_length",
-                truncation=True,
-                max_length=1024  # Ограничение на вход mbart
-            ).to(self.device)
+            requested = get_profile(profile)
+            loaded = self.registry.get(method)
+        except ValueError as e:
+            raise SummarizationError(str(e))
+        if loaded.spec.kind == KIND_EXTRACTIVE:
+            return self._extractive_summarize(text, min_length, max_length, loaded)
+
+        estimator = self._latency_estimators[method]
+        chosen, downgraded = choose_profile(requested, max_length, max_latency_ms, estimator)
+
+        try:
+            # 1. Токенизация (или готовые id токенов, посчитанные при загрузке документа)
+            input_ids, attention_mask, input_info = self._encode_input(text, loaded, token_ids)
 
             # 2. Генерация
-            summary_ids = self.model.generate(
-                inputs["input_ids"],
-                num_beams=4,
-                min_length=min_length,
-                max_length=max_length,
-                early_stopping=True,
-            )
+            generate_kwargs = dict(chosen.generate_kwargs)
+
+            # 2a. Энкодер (или его закэшированный выход), затем только декодирование.
+            # input_ids передаются тоже: по ним draft-модель считает свой энкодер
+            encoder_outputs, encoder_cached = self._encoder_outputs(loaded, input_ids, attention_mask)
+            if max_latency_ms:
+                # Оставшийся бюджет после токенизации и энкодера - жёсткий предел для generate
+                elapsed = time.perf_counter() - started
+                generate_kwargs["max_time"] = max(max_latency_ms / 1000 - elapsed, 0.001)
+
+            # 2b. Спекулятивное декодирование для жадных профилей, если есть draft-модель
+            speculative = loaded.draft_model is not None and supports_speculative(chosen)
+            if speculative:
+                generate_kwargs["assistant_model"] = loaded.draft_model
+            stats = SpeculativeStats(loaded.model, loaded.draft_model) if speculative else nullcontext()
+
+            with stats:
+                summary_ids = loaded.model.generate(
+                    input_ids,
+                    encoder_outputs=encoder_outputs,
+                    attention_mask=attention_mask,
+                    min_length=min_length,
+                    max_length=max_length,
+                    **generate_kwargs,
+                )
 
             # 3. Декодирование
-            summary = self.tokenizer.decode(
+            summary = loaded.tokenizer.decode(
                 summary_ids[0],
                 skip_special_tokens=True,
                 clean_up_tokenization_spaces=False
             )
-            return summary
         except Exception as e:
             # Ловим ошибки на уровне инференса
             print(f"Error during model inference: {e}")
             raise SummarizationError(f"Ошибка модели: {e}")
 
+        latency_ms = (time.perf_counter() - started) * 1000
+        # Генерация, прерванная по max_time, не заканчивается EOS
+        time_limited = bool(
+            max_latency_ms
+            and summary_ids.shape[-1] < max_length
+            and summary_ids[0, -1].item() != loaded.model.config.eos_token_id
+        )
+        if not time_limited:
+            # Оборванные прогоны не отражают реальную стоимость профиля
+            estimator.observe(chosen, max_length, latency_ms)
+
+        speculative_info = {}
+        if speculative:
+            # Первый токен - decoder_start_token, он не генерируется
+            speculative_info = stats.metrics(generated_tokens=summary_ids.shape[-1] - 1)
+            log.info(
+                f"Speculative decoding ({method}): acceptance_rate={speculative_info['acceptance_rate']}, "
+                f"tokens_per_target_pass={speculative_info['tokens_per_target_pass']}"
+            )
+
+        return SummarizationResult(
+            text=summary,
+            generation_info={
+                "method": method,
+                "model": loaded.spec.model_name,
+                "profile": chosen.name,
+                "requested_profile": requested.name,
+                "downgraded": downgraded,
+                "time_limited": time_limited,
+                **input_info,
+                "encoder_cached": encoder_cached,
+                **speculative_info,
+                "latency_ms": round(latency_ms, 1),
+            },
+        )
+
+    def _blocking_summarize_chunked(
+            self,
+            text: str,
+            min_length: int,
+            max_length: int,
+            profile: str | None = None,
+            max_latency_ms: int | None = None,
+            method: str | None = None,
+            reused_chunks: dict[str, str] | None = None
+    ) -> SummarizationResult:
+        """
+        Map-reduce: суммаризация каждого чанка, затем итоговая суммаризация
+        по их результатам. Чанки, суммаризации которых есть в reused_chunks
+        (по хэшу, из предыдущей версии документа), заново не считаются.
+        Бюджет max_latency_ms - общий на все прогоны модели; суммаризации
+        чанков, обрезанные по времени, в результат для переиспользования
+        не попадают.
+        """
+        started = time.perf_counter()
+        reused_chunks = reused_chunks or {}
+
+        def remaining_ms() -> int | None:
+            if not max_latency_ms:
+                return None
+            return max(int(max_latency_ms - (time.perf_counter() - started) * 1000), 1)
+
+        chunks = chunk_text(text, settings.CHUNK_MIN_WORDS, settings.CHUNK_MAX_WORDS)
+        chunk_results: dict[str, SummarizationResult] = {}
+        reused = 0
+        for chunk in chunks:
+            if chunk.hash in chunk_results:
+                continue
+            if chunk.hash in reused_chunks:
+                chunk_results[chunk.hash] = SummarizationResult(
+                    text=reused_chunks[chunk.hash],
+                    generation_info={"method": method or DEFAULT_METHOD, "time_limited": False},
+                )
+                reused += 1
+                continue
+            chunk_results[chunk.hash] = self._blocking_summarize(
+                chunk.text, min_length, max_length, profile, remaining_ms(), method
+            )
+
+        # Только полные суммаризации: обрезанную по бюджету лучше пересчитать в следующей версии
+        chunk_summaries = {
+            chunk_hash: result.text
+            for chunk_hash, result in chunk_results.items()
+            if not result.generation_info.get("time_limited")
+        }
+        chunks_time_limited = len(chunk_results) - len(chunk_summaries)
+
+        # Reduce: единственный чанк уже является итогом
+        if len(chunks) == 1:
+            final = chunk_results[chunks[0].hash]
+        else:
+            final = self._blocking_summarize(
+                "\n".join(chunk_results[chunk.hash].text for chunk in chunks),
+                min_length, max_length, profile, remaining_ms(), method
+            )
+
+        log.info(f"Chunked summarization: {len(chunks)} chunks, {reused} reused, {chunks_time_limited} time-limited")
+        latency_ms = (time.perf_counter() - started) * 1000
+        return SummarizationResult(
+            text=final.text,
+            generation_info={
+                **final.generation_info,
+                "strategy": STRATEGY_CHUNKED,
+                "chunks_total": len(chunks),
+                "chunks_reused": reused,
+                "chunks_summarized": len(chunk_results) - reused,
+                "chunks_time_limited": chunks_time_limited,
+                "time_limited": bool(final.generation_info.get("time_limited")) or chunks_time_limited > 0,
+                "latency_ms": round(latency_ms, 1),
+            },
+            chunk_summaries=chunk_summaries,
+        )
+
+    def _blocking_summarize_batch(
+            self,
+            texts: list[str],
+            min_length: int,
+            max_length: int,
+            profile: str | None = None,
+            method: str | None = None,
+            token_ids: list[TokenIdsCache | None] | None = None
+    ) -> list[SummarizationResult]:
+        """
+        Один generate на пачку запросов с одинаковыми параметрами (очередь
+        сервера модели). Без бюджета латентности и кэша энкодера; то, что
+        пачкой не считается (экстрактивный метод, спекулятивное декодирование),
+        выполняется по одному.
+        """
+        started = time.perf_counter()
+        method = method or DEFAULT_METHOD
+        token_ids = token_ids or [None] * len(texts)
+        try:
+            chosen = get_profile(profile)
+            loaded = self.registry.get(method)
+        except ValueError as e:
+            raise SummarizationError(str(e))
+        if (
+                len(texts) == 1
+                or loaded.spec.kind == KIND_EXTRACTIVE
+                or (loaded.draft_model is not None and supports_speculative(chosen))
+        ):
+            return [
+                self._blocking_summarize(text, min_length, max_length, profile, None, method, ids)
+                for text, ids in zip(texts, token_ids)
+            ]
+
+        try:
+            # Входы без паддинга: пачка дополняется до корзины самого длинного
+            rows, infos = [], []
+            for text, ids in zip(texts, token_ids):
+                input_ids, attention_mask, info = self._encode_input(text, loaded, ids)
+                rows.append(input_ids[0][attention_mask[0].bool()])
+                infos.append(info)
+            pad_id = loaded.tokenizer.pad_token_id
+            buckets = input_buckets(loaded.spec.max_input_tokens, settings.INPUT_LENGTH_BUCKETS)
+            width = bucket_length(max(len(row) for row in rows), buckets)
+            batch_ids = torch.full((len(rows), width), pad_id, device=self.device)
+            batch_mask = torch.zeros_like(batch_ids)
+            for i, row in enumerate(rows):
+                batch_ids[i, :len(row)] = row
+                batch_mask[i, :len(row)] = 1
+
+            summary_ids = loaded.model.generate(
+                batch_ids,
+                attention_mask=batch_mask,
+                min_length=min_length,
+                max_length=max_length,
+                **chosen.generate_kwargs,
+            )
+            summaries = loaded.tokenizer.batch_decode(
+                summary_ids, skip_special_tokens=True, clean_up_tokenization_spaces=False
+            )
+        except Exception as e:
+            log.error(f"Error during batched model inference: {e}")
+            raise SummarizationError(f"Ошибка модели: {e}")
+
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        return [
+            SummarizationResult(
+                text=summary,
+                generation_info={
+                    "method": method,
+                    "model": loaded.spec.model_name,
+                    "profile": chosen.name,
+                    "requested_profile": chosen.name,
+                    "downgraded": False,
+                    "time_limited": False,
+                    **info,
+                    "encoder_cached": False,
+                    "batch_size": len(texts),
+                    "latency_ms": latency_ms,
+                },
+            )
+            for summary, info in zip(summaries, infos)
+        ]
+
     async def summarize(
             self,
             text: str,
             min_length: int,
-            max_length: int
-    ) -> str:
+            max_length: int,
+            profile: str | None = None,
+            max_latency_ms: int | None = None,
+            method: str | None = None,
+            token_ids: TokenIdsCache | None = None,
+            strategy: str | None = None,
+            reused_chunks: dict[str, str] | None = None
+    ) -> SummarizationResult:
         """
         Асинхронный вызов, запускающий блокирующую
         функцию инференса в отдельном потоке.
         """
         loop = asyncio.get_running_loop()
+        if strategy == STRATEGY_CHUNKED:
+            return await loop.run_in_executor(
+                self.executor,
+                self._blocking_summarize_chunked,
+                text,
+                min_length,
+                max_length,
+                profile,
+                max_latency_ms,
+                method,
+                reused_chunks
+            )
         return await loop.run_in_executor(
-            None,  # Использует ThreadPoolExecutor по умолчанию
+            self.executor,  # Слоты инференса (см. InferencePolicy)
             self._blocking_summarize,
             text,
             min_length,
-            max_length
-        )
\ No newline at end of file
+            max_length,
+            profile,
+            max_latency_ms,
+            method,
+            token_ids
+        )
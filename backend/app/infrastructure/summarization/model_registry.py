@@ -0,0 +1,387 @@
+# backend/app/infrastructure/summarization/model_registry.py
+"""
+Реестр моделей суммаризации: method -> конфигурация модели,
+ленивая загрузка и вытеснение по LRU / бюджету памяти.
+"""
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import torch
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSeq2SeqLM
+from backend.app.infrastructure.summarization.extractive import ExtractiveSummarizer
+
+log = logging.getLogger(__name__)
+
+DEFAULT_METHOD = "mbart_ru_sum_gazeta"
+EXTRACTIVE_METHOD = "extractive_textrank"
+
+# Виды методов: нейросетевая seq2seq-модель или экстрактивный алгоритм без весов
+KIND_SEQ2SEQ = "seq2seq"
+KIND_EXTRACTIVE = "extractive"
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """Конфигурация одного метода суммаризации."""
+    method: str
+    model_name: str
+    # Модели с одинаковым tokenizer_name используют один экземпляр токенизатора
+    tokenizer_name: Optional[str] = None
+    # Максимальная длина входа в токенах
+    max_input_tokens: int = 1024
+    kind: str = KIND_SEQ2SEQ
+    # Маленькая seq2seq-модель с тем же словарём для спекулятивного декодирования
+    draft_model_name: Optional[str] = None
+
+    @property
+    def tokenizer_key(self) -> str:
+        return self.tokenizer_name or self.model_name
+
+
+@dataclass
+class LoadedModel:
+    """Загруженная в память модель вместе с токенизатором."""
+    spec: ModelSpec
+    model: Any
+    tokenizer: Any
+    memory_bytes: int
+    last_used: float
+    draft_model: Any = None
+    # (input_ids, attention_mask) -> last_hidden_state или None, если форма не скомпилирована
+    compiled_encoder: Optional[Callable] = None
+
+
+def specs_from_settings(settings, default_model_name: Optional[str] = None) -> Dict[str, ModelSpec]:
+    """Конфигурации методов: метод по умолчанию (MODEL_NAME) + SUMMARIZATION_MODELS."""
+    specs = {
+        DEFAULT_METHOD: ModelSpec(
+            method=DEFAULT_METHOD,
+            model_name=default_model_name or settings.MODEL_NAME,
+            draft_model_name=settings.DRAFT_MODEL_NAME,
+        ),
+        EXTRACTIVE_METHOD: ModelSpec(method=EXTRACTIVE_METHOD, model_name="textrank", kind=KIND_EXTRACTIVE),
+    }
+    for method, config in settings.SUMMARIZATION_MODELS.items():
+        specs[method] = ModelSpec(method=method, **config)
+    return specs
+
+
+def _model_memory_bytes(model) -> int:
+    """Объём параметров и буферов модели в байтах."""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def estimate_model_bytes(model_name: str) -> int:
+    """
+    Оценка памяти модели до загрузки: размер весов в локальном каталоге
+    модели, иначе - число параметров по конфигу (float32); 0, если неизвестно.
+    """
+    if os.path.isdir(model_name):
+        files = os.listdir(model_name)
+        weights = [f for f in files if f.endswith(".safetensors")] or [f for f in files if f.endswith(".bin")]
+        if weights:
+            return sum(os.path.getsize(os.path.join(model_name, f)) for f in weights)
+    try:
+        config = AutoConfig.from_pretrained(model_name)
+    except Exception as e:
+        log.warning(f"Cannot estimate size of model '{model_name}': {e}")
+        return 0
+    d = getattr(config, "d_model", 0)
+    embeddings = (config.vocab_size + 2 * getattr(config, "max_position_embeddings", 0)) * d
+    encoder = getattr(config, "encoder_layers", 0) * (4 * d * d + 2 * d * getattr(config, "encoder_ffn_dim", 0))
+    # У слоя декодера ещё и cross-attention
+    decoder = getattr(config, "decoder_layers", 0) * (8 * d * d + 2 * d * getattr(config, "decoder_ffn_dim", 0))
+    return (embeddings + encoder + decoder) * 4
+
+
+class _PendingLoad:
+    """Идущая загрузка модели: остальные запросы того же метода ждут её, а не грузят повторно."""
+
+    def __init__(self, estimated_bytes: int):
+        self.estimated_bytes = estimated_bytes
+        self.done = threading.Event()
+        self.entry: Optional[LoadedModel] = None
+        self.error: Optional[BaseException] = None
+
+
+class ModelRegistry:
+    """
+    Держит не более max_resident моделей (и не больше memory_budget_mb),
+    загружает их при первом обращении и выгружает самые давно
+    использованные, а также простаивающие дольше idle_ttl_s.
+
+    Загрузка (скачивание, from_pretrained, on_load - компиляция и прогрев)
+    идёт без блокировки реестра: запросы к уже загруженным моделям не ждут
+    её. Место под модель (по оценке её размера) освобождается до загрузки.
+    """
+
+    def __init__(
+            self,
+            specs: Dict[str, ModelSpec],
+            device: str,
+            max_resident: int = 2,
+            memory_budget_mb: Optional[int] = None,
+            idle_ttl_s: Optional[float] = None,
+            speculative_num_tokens: int = 5,
+            on_load: Optional[Callable[[LoadedModel], None]] = None,
+    ):
+        self.specs = specs
+        self.device = device
+        self.max_resident = max(max_resident, 1)
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024 if memory_budget_mb else None
+        self.idle_ttl_s = idle_ttl_s
+        self.speculative_num_tokens = speculative_num_tokens
+        # Вызывается для каждой загруженной seq2seq-модели (компиляция, прогрев) до публикации в реестре
+        self.on_load = on_load
+
+        self._loaded: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self._tokenizers: Dict[str, Any] = {}
+        # Экстрактивные методы не занимают места под модели и не участвуют в LRU
+        self._extractive: Dict[str, LoadedModel] = {}
+        self._loading: Dict[str, _PendingLoad] = {}
+        self._size_estimates: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._sweep_stop: Optional[threading.Event] = None
+
+    @classmethod
+    def from_settings(cls, settings, device: str, default_model_name: Optional[str] = None) -> "ModelRegistry":
+        """Строит реестр из настроек: метод по умолчанию + SUMMARIZATION_MODELS."""
+        return cls(
+            specs_from_settings(settings, default_model_name),
+            device=device,
+            max_resident=settings.MODEL_REGISTRY_MAX_RESIDENT,
+            memory_budget_mb=settings.MODEL_REGISTRY_MEMORY_BUDGET_MB,
+            idle_ttl_s=settings.MODEL_REGISTRY_IDLE_TTL_S,
+            speculative_num_tokens=settings.SPECULATIVE_NUM_TOKENS,
+        )
+
+    def has_method(self, method: str) -> bool:
+        return method in self.specs
+
+    def start_idle_sweep(self, interval_s: Optional[float] = None) -> None:
+        """
+        Фоновая выгрузка простаивающих моделей. Без неё простаивающий сервер
+        (без новых запросов и, значит, без get()) держит модели в памяти вечно.
+        """
+        if not self.idle_ttl_s or self._sweep_stop is not None:
+            return
+        interval_s = interval_s or max(self.idle_ttl_s / 2, 1.0)
+        self._sweep_stop = stop = threading.Event()
+
+        def sweep() -> None:
+            while not stop.wait(interval_s):
+                self.evict_idle()
+
+        threading.Thread(target=sweep, name="model-idle-sweep", daemon=True).start()
+
+    def stop_idle_sweep(self) -> None:
+        if self._sweep_stop is not None:
+            self._sweep_stop.set()
+            self._sweep_stop = None
+
+    def evict_idle(self) -> None:
+        """Выгружает модели, простаивающие дольше idle_ttl_s."""
+        with self._lock:
+            self._evict_idle()
+
+    def resident_methods(self) -> list[str]:
+        with self._lock:
+            return list(self._loaded)
+
+    def get(self, method: str) -> LoadedModel:
+        """
+        Возвращает загруженную модель для метода, загружая её при необходимости.
+        Вытесненная модель освобождается, как только её перестанут использовать
+        уже идущие запросы (они держат собственную ссылку).
+        """
+        spec = self.get_spec(method)
+        # Оценка может читать конфиг из сети/кэша HF - считаем её вне блокировки
+        estimated = 0
+        if spec.kind != KIND_EXTRACTIVE and method not in self._loaded:
+            estimated = self._estimate_bytes(spec)
+
+        with self._lock:
+            if spec.kind == KIND_EXTRACTIVE:
+                if method not in self._extractive:
+                    self._extractive[method] = LoadedModel(
+                        spec=spec, model=ExtractiveSummarizer(), tokenizer=None,
+                        memory_bytes=0, last_used=time.monotonic()
+                    )
+                return self._extractive[method]
+
+            self._evict_idle()
+            entry = self._loaded.get(method)
+            if entry is not None:
+                return self._touch(entry)
+            pending = self._loading.get(method)
+            owner = pending is None
+            if owner:
+                pending = _PendingLoad(estimated)
+                self._loading[method] = pending
+                # Место под новую модель освобождаем заранее, а не после загрузки
+                self._make_room()
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            with self._lock:
+                return self._touch(pending.entry)
+
+        try:
+            entry = self._load(spec)
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(method, None)
+            pending.error = e
+            pending.done.set()
+            raise
+        with self._lock:
+            self._loading.pop(method, None)
+            self._loaded[method] = entry
+            # Оценка могла ошибиться: проверяем лимиты по фактическому размеру
+            self._evict_over_budget(keep=method)
+            entry = self._touch(entry)
+        pending.entry = entry
+        pending.done.set()
+        return entry
+
+    def _touch(self, entry: LoadedModel) -> LoadedModel:
+        if entry.spec.method in self._loaded:
+            self._loaded.move_to_end(entry.spec.method)
+        entry.last_used = time.monotonic()
+        return entry
+
+    def _estimate_bytes(self, spec: ModelSpec) -> int:
+        if self.memory_budget_bytes is None:
+            return 0
+        estimated = 0
+        for model_name in filter(None, (spec.model_name, spec.draft_model_name)):
+            if model_name not in self._size_estimates:
+                self._size_estimates[model_name] = estimate_model_bytes(model_name)
+            estimated += self._size_estimates[model_name]
+        return estimated
+
+    def _make_room(self) -> None:
+        """Выгружает давно использованные модели, чтобы загружаемые поместились в лимиты."""
+        while self._loaded:
+            over_count = len(self._loaded) + len(self._loading) > self.max_resident
+            reserved = sum(p.estimated_bytes for p in self._loading.values())
+            over_memory = (
+                self.memory_budget_bytes is not None
+                and self._resident_bytes() + reserved > self.memory_budget_bytes
+            )
+            if not (over_count or over_memory):
+                break
+            self._unload(next(iter(self._loaded)))
+
+    def get_spec(self, method: str) -> ModelSpec:
+        spec = self.specs.get(method)
+        if spec is None:
+            raise ValueError(f"Неизвестный метод суммаризации '{method}'. Доступны: {list(self.specs)}")
+        return spec
+
+    def get_tokenizer(self, method: str):
+        """Токенизатор метода без загрузки самой модели (например, для токенизации при загрузке документа)."""
+        spec = self.get_spec(method)
+        if spec.kind == KIND_EXTRACTIVE:
+            return None
+        return self._tokenizer_for(spec)
+
+    def evict(self, method: str) -> None:
+        with self._lock:
+            self._unload(method)
+
+    def _tokenizer_for(self, spec: ModelSpec):
+        with self._lock:
+            tokenizer = self._tokenizers.get(spec.tokenizer_key)
+        if tokenizer is None:
+            log.info(f"Loading tokenizer '{spec.tokenizer_key}'...")
+            tokenizer = AutoTokenizer.from_pretrained(spec.tokenizer_key, use_fast=True)
+            with self._lock:
+                tokenizer = self._tokenizers.setdefault(spec.tokenizer_key, tokenizer)
+        return tokenizer
+
+    def _load(self, spec: ModelSpec) -> LoadedModel:
+        tokenizer = self._tokenizer_for(spec)
+
+        log.info(f"Loading model '{spec.model_name}' for method '{spec.method}' to {self.device}...")
+        model = self._load_seq2seq(spec.model_name)
+        memory_bytes = _model_memory_bytes(model)
+
+        draft_model = None
+        if spec.draft_model_name:
+            log.info(f"Loading draft model '{spec.draft_model_name}' for method '{spec.method}'...")
+            draft_model = self._load_seq2seq(spec.draft_model_name)
+            if draft_model.config.vocab_size != model.config.vocab_size:
+                # Проверка draft-токенов основной моделью требует общего словаря
+                log.warning(
+                    f"Draft model '{spec.draft_model_name}' has a different vocabulary, "
+                    f"speculative decoding disabled for method '{spec.method}'."
+                )
+                draft_model = None
+            else:
+                # Фиксированное число предлагаемых токенов за шаг проверки
+                draft_model.generation_config.num_assistant_tokens = self.speculative_num_tokens
+                draft_model.generation_config.num_assistant_tokens_schedule = "constant"
+                memory_bytes += _model_memory_bytes(draft_model)
+
+        log.info(f"Model '{spec.model_name}' loaded ({memory_bytes / 1024 / 1024:.0f} MB).")
+        loaded = LoadedModel(
+            spec=spec, model=model, tokenizer=tokenizer, memory_bytes=memory_bytes,
+            last_used=time.monotonic(), draft_model=draft_model
+        )
+        if self.on_load is not None:
+            self.on_load(loaded)
+        return loaded
+
+    def _load_seq2seq(self, model_name: str):
+        try:
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name).to(self.device)
+        except Exception as e:
+            log.error(f"Failed to load model '{model_name}': {e}")
+            raise RuntimeError(f"Failed to load model '{model_name}': {e}")
+        model.eval()
+        return model
+
+    def _resident_bytes(self) -> int:
+        return sum(entry.memory_bytes for entry in self._loaded.values())
+
+    def _evict_over_budget(self, keep: str) -> None:
+        """Выгружает самые давно использованные модели сверх лимитов (кроме keep)."""
+        for method in list(self._loaded):
+            over_count = len(self._loaded) > self.max_resident
+            over_memory = self.memory_budget_bytes is not None and self._resident_bytes() > self.memory_budget_bytes
+            if not (over_count or over_memory):
+                break
+            if method != keep:
+                self._unload(method)
+
+    def _evict_idle(self) -> None:
+        if not self.idle_ttl_s:
+            return
+        deadline = time.monotonic() - self.idle_ttl_s
+        for method, entry in list(self._loaded.items()):
+            if entry.last_used < deadline:
+                log.info(f"Model for method '{method}' idle for more than {self.idle_ttl_s}s.")
+                self._unload(method)
+
+    def _unload(self, method: str) -> None:
+        entry = self._loaded.pop(method, None)
+        if entry is None:
+            return
+        log.info(f"Unloading model for method '{method}'.")
+        # Токенизатор освобождаем, только если он больше никем не используется
+        if all(e.spec.tokenizer_key != entry.spec.tokenizer_key for e in self._loaded.values()):
+            self._tokenizers.pop(entry.spec.tokenizer_key, None)
+        del entry
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
@@ -0,0 +1,140 @@
+# backend/app/infrastructure/summarization/remote_gateway.py
+"""
+Клиент сервера модели (workers/model_server.py): тот же интерфейс summarize,
+что у SummarizationGateway, но модель живёт в отдельном процессе.
+"""
+import asyncio
+import itertools
+import logging
+from typing import Dict, Optional
+
+from backend.app.core.errors import SummarizationError
+from backend.app.domain.entities import SummarizationResult
+from backend.app.infrastructure.database.models import TokenIdsCache
+from backend.app.infrastructure.summarization import ipc_protocol as proto
+
+log = logging.getLogger(__name__)
+
+
+class _Connection:
+    """Соединение с сервером модели и ожидающие ответа запросы, отправленные по нему."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.write_lock = asyncio.Lock()
+        self.reader_task: Optional[asyncio.Task] = None
+
+    def is_open(self) -> bool:
+        return not self.writer.is_closing()
+
+
+class RemoteSummarizationGateway:
+    """
+    Одно соединение на процесс API, запросы мультиплексируются по id.
+    Тексты длиннее shm_threshold_bytes передаются через shared memory.
+    При обрыве открывается новое соединение; запросы старого завершаются
+    ошибкой его задачи чтения и не затрагивают новое.
+    """
+
+    def __init__(self, socket_path: str, shm_threshold_bytes: int = 64 * 1024):
+        self.socket_path = socket_path
+        self.shm_threshold_bytes = shm_threshold_bytes
+        self._connection: Optional[_Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+
+    async def _ensure_connected(self) -> _Connection:
+        async with self._connect_lock:
+            if self._connection is not None and self._connection.is_open():
+                return self._connection
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path)
+            except OSError as e:
+                raise SummarizationError(f"Сервер модели недоступен ({self.socket_path}): {e}")
+            connection = _Connection(reader, writer)
+            connection.reader_task = asyncio.create_task(self._read_responses(connection))
+            self._connection = connection
+            return connection
+
+    @staticmethod
+    async def _read_responses(connection: _Connection) -> None:
+        error: Exception = SummarizationError("Соединение с сервером модели закрыто")
+        try:
+            while True:
+                msg_type, _, request_id, payload = await proto.read_frame(connection.reader)
+                future = connection.pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if msg_type == proto.MSG_RESULT:
+                    future.set_result(proto.decode_result(payload))
+                else:
+                    future.set_exception(SummarizationError(proto.decode_error(payload)))
+        except asyncio.IncompleteReadError:
+            pass
+        except Exception as e:
+            log.error(f"Model server connection failed: {e}")
+            error = SummarizationError(f"Ошибка соединения с сервером модели: {e}")
+        finally:
+            # Ожидающие запросы этого соединения больше не получат ответ
+            for future in connection.pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            connection.pending.clear()
+            connection.writer.close()
+
+    async def summarize(
+            self,
+            text: str,
+            min_length: int,
+            max_length: int,
+            profile: str | None = None,
+            max_latency_ms: int | None = None,
+            method: str | None = None,
+            token_ids: TokenIdsCache | None = None,
+            strategy: str | None = None,
+            reused_chunks: dict[str, str] | None = None
+    ) -> SummarizationResult:
+        connection = await self._ensure_connected()
+        request = proto.SummarizeRequest(
+            text=text,
+            min_length=min_length,
+            max_length=max_length,
+            profile=profile,
+            max_latency_ms=max_latency_ms,
+            method=method,
+            token_ids=token_ids,
+            strategy=strategy,
+            reused_chunks=reused_chunks or {},
+        )
+
+        shm = None
+        if len(text) * 4 >= self.shm_threshold_bytes:  # до 4 байт на символ в UTF-8
+            shm, size = proto.write_shared_text(text)
+            flags, payload = proto.encode_request(request, shm_name=shm.name, shm_size=size)
+        else:
+            flags, payload = proto.encode_request(request)
+
+        request_id = next(self._ids) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        connection.pending[request_id] = future
+        try:
+            async with connection.write_lock:
+                proto.write_frame(connection.writer, proto.MSG_SUMMARIZE, request_id, payload, flags)
+                await connection.writer.drain()
+            return await future
+        except ConnectionError as e:
+            raise SummarizationError(f"Ошибка соединения с сервером модели: {e}")
+        finally:
+            connection.pending.pop(request_id, None)
+            if shm is not None:
+                # Сервер копирует текст при разборе запроса, сегмент можно удалять
+                shm.close()
+                shm.unlink()
+
+    async def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.writer.close()
+            connection.reader_task.cancel()
@@ -0,0 +1,70 @@
+# backend/app/infrastructure/summarization/speculative.py
+"""
+Спекулятивное (assisted) декодирование с маленькой draft-моделью.
+
+Сама генерация выполняется transformers (generate(assistant_model=...)):
+draft-модель предлагает несколько токенов, основная проверяет их одним
+проходом декодера, результат совпадает с жадным декодированием.
+Здесь - подсчёт метрик принятия, чтобы оценивать выигрыш на конкретной
+инсталляции.
+"""
+import threading
+from typing import Any, Dict
+
+from backend.app.infrastructure.summarization.decoding import DecodingProfile
+
+
+def supports_speculative(profile: DecodingProfile) -> bool:
+    """Спекулятивное декодирование эквивалентно только жадному поиску."""
+    kwargs = profile.generate_kwargs
+    return kwargs.get("num_beams", 1) == 1 and not kwargs.get("do_sample", False)
+
+
+class SpeculativeStats:
+    """
+    Считает проходы декодеров основной и draft-модели во время одного generate.
+    Хуки фильтруют вызовы по потоку, поэтому параллельные запросы к тем же
+    моделям не смешиваются.
+    """
+
+    def __init__(self, target_model, draft_model):
+        self._decoders = {
+            "target": target_model.get_decoder(),
+            "draft": draft_model.get_decoder(),
+        }
+        self._calls = {"target": 0, "draft": 0}
+        self._thread_id = threading.get_ident()
+        self._handles = []
+
+    def _hook(self, name: str):
+        def count(module, args, output):
+            if threading.get_ident() == self._thread_id:
+                self._calls[name] += 1
+        return count
+
+    def __enter__(self) -> "SpeculativeStats":
+        for name, decoder in self._decoders.items():
+            self._handles.append(decoder.register_forward_hook(self._hook(name)))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for handle in self._handles:
+            handle.remove()
+        self._handles.clear()
+
+    def metrics(self, generated_tokens: int) -> Dict[str, Any]:
+        """
+        Каждый проход основной модели даёт (принятые draft-токены + 1) токен,
+        поэтому принятых токенов = сгенерировано - проходов основной модели.
+        """
+        target_passes = self._calls["target"]
+        drafted = self._calls["draft"]
+        accepted = max(generated_tokens - target_passes, 0)
+        return {
+            "speculative": True,
+            "draft_tokens": drafted,
+            "accepted_tokens": accepted,
+            "target_forward_passes": target_passes,
+            "acceptance_rate": round(accepted / drafted, 3) if drafted else 0.0,
+            "tokens_per_target_pass": round(generated_tokens / target_passes, 2) if target_passes else 0.0,
+        }
@@ -0,0 +1,80 @@
+# backend/app/infrastructure/summarization/token_cache.py
+"""
+Кэш id токенов документа: входной текст модели токенизируется один раз
+(при загрузке документа) и хранится компактным массивом uint16/int32,
+чтобы повторные суммаризации не токенизировали parsed_text заново.
+"""
+import base64
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import torch
+
+from backend.app.config import settings
+from backend.app.infrastructure.database.models import TokenIdsCache
+from backend.app.infrastructure.summarization.extractive import prefilter_for_model
+from backend.app.infrastructure.summarization.model_registry import DEFAULT_METHOD, ModelRegistry, ModelSpec
+
+
+def cache_key(spec: ModelSpec) -> str:
+    """
+    Ключ кэша: id токенов годятся, только если совпадают токенизатор,
+    длина входа и режим пре-фильтра.
+    """
+    return f"{spec.tokenizer_key}|{spec.max_input_tokens}|prefilter={int(settings.EXTRACTIVE_PREFILTER)}"
+
+
+def pack_ids(ids: List[int], key: str, vocab_size: int) -> TokenIdsCache:
+    dtype = "uint16" if vocab_size <= np.iinfo(np.uint16).max + 1 else "int32"
+    return TokenIdsCache(key=key, dtype=dtype, data=np.asarray(ids, dtype=dtype).tobytes())
+
+
+def unpack_ids(cache: TokenIdsCache) -> torch.Tensor:
+    """Тензор input_ids формы (1, n) для model.generate."""
+    ids = np.frombuffer(cache.data, dtype=cache.dtype).astype(np.int64)
+    return torch.from_numpy(ids).unsqueeze(0)
+
+
+def to_transport(cache: Optional[TokenIdsCache]) -> Optional[Dict[str, Any]]:
+    """JSON-совместимое представление (для аргументов задачи Celery)."""
+    if cache is None:
+        return None
+    return {"key": cache.key, "dtype": cache.dtype, "data": base64.b64encode(cache.data).decode("ascii")}
+
+
+def from_transport(payload: Optional[Dict[str, Any]]) -> Optional[TokenIdsCache]:
+    if payload is None:
+        return None
+    return TokenIdsCache(key=payload["key"], dtype=payload["dtype"], data=base64.b64decode(payload["data"]))
+
+
+class TokenIdsEncoder:
+    """
+    Считает id токенов входа модели для пачки текстов через батч-API
+    быстрого токенизатора. Пре-фильтр длинных текстов применяется так же,
+    как в SummarizationGateway, поэтому результат можно подавать в generate.
+    """
+
+    def __init__(self, registry: ModelRegistry, method: str = DEFAULT_METHOD):
+        self.registry = registry
+        self.method = method
+
+    def encode_batch(self, texts: List[str]) -> List[TokenIdsCache]:
+        """Синхронная (блокирующая) токенизация пачки текстов."""
+        spec = self.registry.get_spec(self.method)
+        tokenizer = self.registry.get_tokenizer(self.method)
+        key = cache_key(spec)
+
+        model_inputs = []
+        for text in texts:
+            prefiltered = (
+                prefilter_for_model(text, tokenizer, spec.max_input_tokens)
+                if settings.EXTRACTIVE_PREFILTER else None
+            )
+            model_inputs.append(prefiltered or text)
+
+        encoded = tokenizer(model_inputs, truncation=True, max_length=spec.max_input_tokens)
+        return [pack_ids(ids, key, len(tokenizer)) for ids in encoded["input_ids"]]
+
+    def encode(self, text: str) -> TokenIdsCache:
+        return self.encode_batch([text])[0]
@@ -0,0 +1,202 @@
+# backend/app/infrastructure/summarization/warmup.py
+"""
+Прогрев модели при загрузке и (по желанию) компиляция энкодера.
+
+Вход модели дополняется не до max_input_tokens, а до ближайшей «корзины»
+длины (INPUT_LENGTH_BUCKETS), поэтому форм входа немного. Прогрев прогоняет
+каждую корзину через энкодер и короткий generate всех профилей: ядра,
+пулы аллокатора и токенизатор готовы до первого настоящего запроса.
+
+Компиляция:
+- torchscript - trace энкодера для каждой корзины, артефакты сохраняются
+  на диск и при следующем старте загружаются без трассировки;
+- torch_compile - torch.compile энкодера (статические формы) и декодера
+  (динамическая длина кэша); скомпилированные графы кэширует на диске
+  inductor (TORCHINDUCTOR_CACHE_DIR).
+"""
+import hashlib
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+import torch
+import transformers
+from transformers.modeling_outputs import BaseModelOutput
+
+from backend.app.infrastructure.summarization.decoding import PROFILES
+
+log = logging.getLogger(__name__)
+
+COMPILE_NONE = "none"
+COMPILE_TORCHSCRIPT = "torchscript"
+COMPILE_TORCH = "torch_compile"
+COMPILE_MODES = (COMPILE_NONE, COMPILE_TORCHSCRIPT, COMPILE_TORCH)
+
+# Длина генерации при прогреве: достаточно нескольких шагов декодера
+_WARMUP_MAX_LENGTH = 8
+
+
+def input_buckets(max_input_tokens: int, buckets: List[int]) -> List[int]:
+    """Корзины не длиннее входа модели; последняя - сам max_input_tokens."""
+    return sorted({b for b in buckets if 0 < b < max_input_tokens} | {max_input_tokens})
+
+
+def bucket_length(length: int, buckets: List[int]) -> int:
+    for bucket in buckets:
+        if length <= bucket:
+            return bucket
+    return buckets[-1]
+
+
+def pad_to_bucket(
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor,
+        buckets: List[int],
+        pad_token_id: int
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Дополняет вход (1, n) справа паддингом до длины корзины."""
+    length = input_ids.shape[-1]
+    padding = bucket_length(length, buckets) - length
+    if padding <= 0:
+        return input_ids, attention_mask
+    input_ids = torch.nn.functional.pad(input_ids, (0, padding), value=pad_token_id)
+    attention_mask = torch.nn.functional.pad(attention_mask, (0, padding), value=0)
+    return input_ids, attention_mask
+
+
+class _EncoderForTrace(torch.nn.Module):
+    """Энкодер с тензорным выходом (trace не работает с ModelOutput)."""
+
+    def __init__(self, encoder):
+        super().__init__()
+        self.encoder = encoder
+
+    def forward(self, input_ids, attention_mask):
+        return self.encoder(input_ids=input_ids, attention_mask=attention_mask, return_dict=True).last_hidden_state
+
+
+def _artifact_path(cache_dir: str, model_name: str, model, bucket: int) -> str:
+    """Артефакт годится только для той же модели, версий библиотек, dtype и устройства."""
+    key = "|".join([
+        model_name, torch.__version__, transformers.__version__, str(model.dtype), str(model.device)
+    ])
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"encoder-{digest}-{bucket}.pt")
+
+
+def _compile_torchscript(loaded, buckets: List[int], cache_dir: str) -> Callable:
+    encoder = _EncoderForTrace(loaded.model.get_encoder()).eval()
+    traced: Dict[int, torch.jit.ScriptModule] = {}
+    os.makedirs(cache_dir, exist_ok=True)
+    for bucket in buckets:
+        path = _artifact_path(cache_dir, loaded.spec.model_name, loaded.model, bucket)
+        if os.path.exists(path):
+            traced[bucket] = torch.jit.load(path, map_location=loaded.model.device)
+            continue
+        example_ids = torch.full((1, bucket), loaded.model.config.pad_token_id, device=loaded.model.device)
+        example_mask = torch.ones_like(example_ids)
+        with torch.inference_mode():
+            module = torch.jit.trace(encoder, (example_ids, example_mask), check_trace=False)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        torch.jit.save(module, tmp_path)
+        os.replace(tmp_path, path)
+        traced[bucket] = module
+        log.info(f"Encoder traced for {bucket} tokens -> {path}")
+
+    def run(input_ids: torch.Tensor, attention_mask: torch.Tensor) -> Optional[torch.Tensor]:
+        module = traced.get(input_ids.shape[-1]) if input_ids.shape[0] == 1 else None
+        return module(input_ids, attention_mask) if module is not None else None
+    return run
+
+
+def _compile_torch(loaded, cache_dir: str) -> Callable:
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", cache_dir)
+    torch._inductor.config.fx_graph_cache = True
+
+    encoder = torch.compile(_EncoderForTrace(loaded.model.get_encoder()), dynamic=False)
+    # Декодер вызывает generate: длина кэша растёт с каждым шагом
+    loaded.model.set_decoder(torch.compile(loaded.model.get_decoder(), dynamic=True))
+    return encoder
+
+
+def _check_compiled(loaded, buckets: List[int]) -> None:
+    """
+    По одному проходу энкодера и декодера на корзину: torch.compile ленивый,
+    и ошибки компиляции (BackendCompilerFailed) появляются только при вызове.
+    """
+    model = loaded.model
+    for bucket in buckets:
+        input_ids = torch.full((1, bucket), model.config.pad_token_id, device=model.device)
+        attention_mask = torch.ones_like(input_ids)
+        with torch.inference_mode():
+            hidden = loaded.compiled_encoder(input_ids, attention_mask)
+            if hidden is None:
+                hidden = model.get_encoder()(
+                    input_ids=input_ids, attention_mask=attention_mask, return_dict=True
+                ).last_hidden_state
+            decoder_input_ids = torch.full((1, 1), model.config.decoder_start_token_id, device=model.device)
+            model.get_decoder()(
+                input_ids=decoder_input_ids, encoder_hidden_states=hidden, encoder_attention_mask=attention_mask
+            )
+
+
+def compile_model(loaded, mode: str, buckets: List[int], cache_dir: str) -> None:
+    """
+    Ставит loaded.compiled_encoder; при любой ошибке компиляции (в том числе
+    при первом вызове) возвращает исходные энкодер и декодер - eager-режим.
+    """
+    if mode == COMPILE_NONE:
+        return
+    started = time.perf_counter()
+    decoder = loaded.model.get_decoder()
+    try:
+        if mode == COMPILE_TORCHSCRIPT:
+            loaded.compiled_encoder = _compile_torchscript(loaded, buckets, cache_dir)
+        elif mode == COMPILE_TORCH:
+            loaded.compiled_encoder = _compile_torch(loaded, cache_dir)
+        else:
+            raise ValueError(f"Неизвестный режим компиляции '{mode}'. Доступны: {list(COMPILE_MODES)}")
+        _check_compiled(loaded, buckets)
+    except Exception as e:
+        log.warning(f"Compilation '{mode}' failed for '{loaded.spec.model_name}', using eager mode: {e}")
+        loaded.compiled_encoder = None
+        if loaded.model.get_decoder() is not decoder:
+            loaded.model.set_decoder(decoder)
+        return
+    log.info(f"Model '{loaded.spec.model_name}' compiled ({mode}) in {time.perf_counter() - started:.1f}s")
+
+
+def warmup_model(loaded, buckets: List[int]) -> None:
+    """Энкодер и короткий generate каждого профиля для каждой корзины длины."""
+    started = time.perf_counter()
+    tokenizer, model = loaded.tokenizer, loaded.model
+    for bucket in buckets:
+        encoded = tokenizer("прогрев " * bucket, return_tensors="pt", truncation=True, max_length=bucket)
+        input_ids, attention_mask = pad_to_bucket(
+            encoded["input_ids"], encoded["attention_mask"], buckets, tokenizer.pad_token_id
+        )
+        input_ids, attention_mask = input_ids.to(model.device), attention_mask.to(model.device)
+        with torch.inference_mode():
+            hidden = loaded.compiled_encoder(input_ids, attention_mask) if loaded.compiled_encoder is not None else None
+            if hidden is None:
+                hidden = model.get_encoder()(
+                    input_ids=input_ids, attention_mask=attention_mask, return_dict=True
+                ).last_hidden_state
+        for profile in PROFILES.values():
+            model.generate(
+                input_ids,
+                encoder_outputs=BaseModelOutput(last_hidden_state=hidden),
+                attention_mask=attention_mask,
+                max_length=_WARMUP_MAX_LENGTH,
+                **profile.generate_kwargs,
+            )
+        if loaded.draft_model is not None:
+            model.generate(
+                input_ids, attention_mask=attention_mask, max_length=_WARMUP_MAX_LENGTH,
+                assistant_model=loaded.draft_model, **PROFILES["fast"].generate_kwargs,
+            )
+    log.info(
+        f"Model '{loaded.spec.model_name}' warmed up for input buckets {buckets} "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
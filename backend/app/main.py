@@ -1,15 +1,20 @@
+import asyncio
 import logging
 import os
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from backend.app.api.schemas.common import HealthResponse, ErrorResponse
-from backend.app.api.routes import documents, summaries
+from fastapi.middleware.gzip import GZipMiddleware
+from backend.app.api.schemas.common import HealthResponse, ErrorResponse, ReadinessResponse
+from backend.app.api.routes import documents, search, summaries
 from backend.app.config import settings
 from backend.app.infrastructure.database.connection import init_database
 from backend.app.core.errors import AppBaseException
 from backend.app.infrastructure.summarization.mbart_gateway import SummarizationGateway
+from backend.app.infrastructure.summarization.model_registry import ModelRegistry
+from backend.app.infrastructure.summarization.remote_gateway import RemoteSummarizationGateway
+from backend.app.infrastructure.summarization.token_cache import TokenIdsEncoder
 
 # --- Настройка логирования ---
 logging.basicConfig(level=logging.INFO)
@@ -19,6 +24,21 @@ log = logging.getLogger(__name__)
 IS_CELERY_MODE = os.getenv("USE_CELERY", "false").lower() == "true"
 
 
+async def _warm_up(app: FastAPI) -> None:
+    """Загрузка и прогрев модели в слоте инференса; затем приложение готово."""
+    app.state.ready = False
+    app.state.warmup_error = None
+    summarizer = app.state.summarizer
+    try:
+        await asyncio.get_running_loop().run_in_executor(summarizer.executor, summarizer.warmup)
+    except Exception as e:
+        log.error(f"Model warmup failed: {e}")
+        app.state.warmup_error = str(e)
+        return
+    app.state.ready = True
+    log.info("Model loaded and warmed up for BackgroundTasks mode.")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -31,20 +51,46 @@ async def lifespan(app: FastAPI):
     await init_database(mongo_url, db_name)
     log.info("Database connection established successfully.")
 
-    if not IS_CELERY_MODE:
-        # Загрузка модели для режима BackgroundTasks
+    if not IS_CELERY_MODE and settings.MODEL_SERVER_SOCKET:
+        # Модель в отдельном процессе, общем для всех воркеров uvicorn
+        log.info(f"Using model server at {settings.MODEL_SERVER_SOCKET}")
+        app.state.summarizer = RemoteSummarizationGateway(
+            settings.MODEL_SERVER_SOCKET, settings.MODEL_SERVER_SHM_THRESHOLD_BYTES
+        )
+        registry = ModelRegistry.from_settings(settings, device="cpu")
+    elif not IS_CELERY_MODE:
+        # Загрузка и прогрев модели для режима BackgroundTasks идут в фоне:
+        # приложение отвечает сразу, /ready переключается после прогрева
         log.info("Loading summarization model in BackgroundTasks mode...")
-        app.state.summarizer = SummarizationGateway(model_name=settings.MODEL_NAME)
-        log.info("Model loaded successfully for BackgroundTasks mode.")
+        app.state.summarizer = SummarizationGateway(model_name=settings.MODEL_NAME, preload=False)
+        app.state.warmup_task = asyncio.create_task(_warm_up(app))
+        registry = app.state.summarizer.registry
     else:
         log.info("Running in Celery worker mode - model will be loaded by workers")
+        # Модель в API не грузится, но токенизатор нужен для кэша id токенов
+        registry = ModelRegistry.from_settings(settings, device="cpu")
+
+    # Конфигурации методов (проверка method в запросах) и токенизаторы
+    app.state.model_registry = registry
+    # Токенизация документов при загрузке (id токенов кэшируются в DocumentModel)
+    app.state.token_encoder = TokenIdsEncoder(registry)
+    if not hasattr(app.state, "warmup_task"):
+        # Модель прогревается в другом процессе (воркер Celery / сервер модели)
+        app.state.ready = True
 
     yield
 
     # Код на этапе завершения работы приложения
     log.info("Shutting down application...")
 
+    if hasattr(app.state, "warmup_task"):
+        app.state.warmup_task.cancel()
+
     if hasattr(app.state, "summarizer"):
+        if isinstance(app.state.summarizer, RemoteSummarizationGateway):
+            await app.state.summarizer.close()
+        else:
+            app.state.summarizer.close()
         del app.state.summarizer
         log.info("Summarization model unloaded.")
 
@@ -67,7 +113,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Размеры текста для GET /documents/{id}/text
+    expose_headers=["X-Total-Chars", "X-Total-Paragraphs", "X-Text-Range"],
 )
+# Сжатие остальных ответов; ответы с ETag (http_cache) приходят уже сжатыми и проходят как есть
+app.add_middleware(GZipMiddleware, minimum_size=settings.HTTP_COMPRESSION_MIN_BYTES)
 
 
 # --- Глобальный обработчик кастомных ошибок ---
@@ -99,6 +149,24 @@ def health_check():
     }
 
 
+@app.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    tags=["Health"],
+    responses={503: {"model": ReadinessResponse, "description": "Модель ещё прогревается"}}
+)
+def readiness_check(request: Request):
+    """Готовность принимать суммаризации: модель загружена и прогрета."""
+    if getattr(request.app.state, "ready", False):
+        return ReadinessResponse(status="ready")
+    error = getattr(request.app.state, "warmup_error", None)
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=ReadinessResponse(status="failed" if error else "warming_up", detail=error).model_dump()
+    )
+
+
 # --- Подключение API-роутеров ---
 app.include_router(documents.router)
-app.include_router(summaries.router)
\ No newline at end of file
+app.include_router(summaries.router)
+app.include_router(search.router)
\ No newline at end of file
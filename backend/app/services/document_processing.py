@@ -0,0 +1,68 @@
+# backend/app/services/document_processing.py
+"""
+Обработка документов после парсинга: подготовка id токенов для кэша.
+"""
+import asyncio
+import logging
+from typing import List, Optional
+
+from backend.app.infrastructure.database.models import DocumentModel, TokenIdsCache
+from backend.app.infrastructure.summarization.token_cache import TokenIdsEncoder, cache_key
+
+log = logging.getLogger(__name__)
+
+
+async def encode_token_ids(encoder: TokenIdsEncoder, texts: List[str]) -> List[Optional[TokenIdsCache]]:
+    """
+    Токенизирует пачку текстов в отдельном потоке.
+    Кэш - оптимизация, поэтому при ошибке документ просто остаётся без него.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(None, encoder.encode_batch, texts)
+    except Exception as e:
+        log.warning(f"Failed to compute token ids: {e}")
+        return [None] * len(texts)
+
+
+async def backfill_token_ids(encoder: TokenIdsEncoder, batch_size: int = 64) -> int:
+    """
+    Досчитывает id токенов для документов без кэша (или с кэшем под другой
+    токенизатор/настройки). Возвращает число обновлённых документов.
+    """
+    key = cache_key(encoder.registry.get_spec(encoder.method))
+    updated = 0
+    while True:
+        docs = await DocumentModel.find(
+            {"parsed_text": {"$ne": None}, "token_ids.key": {"$ne": key}}
+        ).limit(batch_size).to_list()
+        if not docs:
+            break
+
+        caches = await encode_token_ids(encoder, [doc.parsed_text for doc in docs])
+        if any(cache is None for cache in caches):
+            log.error("Backfill stopped: tokenization failed.")
+            break
+        for doc, cache in zip(docs, caches):
+            await doc.set({DocumentModel.token_ids: cache})
+        updated += len(docs)
+        log.info(f"Token ids computed for {updated} documents...")
+    return updated
+
+
+if __name__ == "__main__":
+    # Досчитать кэш для уже загруженных документов:
+    #   python -m backend.app.services.document_processing
+    from backend.app.config import settings
+    from backend.app.infrastructure.database.connection import init_database
+    from backend.app.infrastructure.summarization.model_registry import ModelRegistry
+
+    async def _main():
+        db_name = settings.MONGO_DSN.split("/")[-1].split("?")[0]
+        await init_database(settings.MONGO_DSN, db_name)
+        encoder = TokenIdsEncoder(ModelRegistry.from_settings(settings, device="cpu"))
+        total = await backfill_token_ids(encoder)
+        log.info(f"Backfill complete: {total} documents updated.")
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
@@ -0,0 +1,102 @@
+# backend/app/services/document_text.py
+"""
+Чтение parsed_text диапазонами.
+
+При загрузке документа текст режется на куски фиксированной длины
+(DocumentTextChunk), а в DocumentModel сохраняются длина текста и границы
+абзацев. Диапазон (в символах или абзацах) переводится в номера кусков
+арифметикой, и из БД читаются только они - независимо от размера документа.
+Документы, загруженные до появления индекса, читаются из parsed_text.
+"""
+import logging
+from typing import AsyncIterator, Optional, Tuple
+
+from beanie import PydanticObjectId
+
+from backend.app.config import settings
+from backend.app.infrastructure.database.models import DocumentModel, DocumentTextChunk, DocumentTextIndex
+from backend.app.infrastructure.summarization.chunking import paragraph_spans
+
+log = logging.getLogger(__name__)
+
+UNIT_CHARS = "chars"
+UNIT_PARAGRAPHS = "paragraphs"
+UNITS = (UNIT_CHARS, UNIT_PARAGRAPHS)
+
+
+def build_text_index(doc: DocumentModel) -> None:
+    """Длина и границы абзацев; вызывается до insert() документа."""
+    text = doc.parsed_text or ""
+    doc.text_length = len(text)
+    doc.paragraph_spans = paragraph_spans(text)
+
+
+async def store_text_chunks(doc: DocumentModel) -> None:
+    """
+    Сохраняет куски текста уже вставленного документа. Это оптимизация:
+    при ошибке документ читается из parsed_text.
+    """
+    text = doc.parsed_text or ""
+    size = settings.TEXT_CHUNK_CHARS
+    chunks = [
+        DocumentTextChunk(document_id=str(doc.id), index=i, text=text[start:start + size])
+        for i, start in enumerate(range(0, len(text), size))
+    ]
+    try:
+        if chunks:
+            await DocumentTextChunk.insert_many(chunks)
+        await doc.set({DocumentModel.text_chunk_chars: size})
+    except Exception as e:
+        log.warning(f"Failed to store text chunks for document {doc.id}: {e}")
+
+
+def resolve_range(index: DocumentTextIndex, offset: int, limit: int, unit: str) -> Tuple[int, int]:
+    """Диапазон [start, end) в символах для offset/limit в единицах unit."""
+    if unit == UNIT_PARAGRAPHS:
+        spans = index.paragraph_spans
+        count = len(spans) // 2
+        if offset >= count:
+            return index.text_length, index.text_length
+        last = min(offset + limit, count) - 1
+        return spans[2 * offset], spans[2 * last + 1]
+    start = min(offset, index.text_length)
+    return start, min(start + limit, index.text_length)
+
+
+async def load_text_index(document_id: str) -> Optional[DocumentTextIndex]:
+    index = await DocumentModel.find_one(
+        DocumentModel.id == PydanticObjectId(document_id), projection_model=DocumentTextIndex
+    )
+    if index is not None and index.paragraph_spans is None:
+        # Документ загружен до индекса: строим его один раз и сохраняем
+        doc = await DocumentModel.get(index.id)
+        build_text_index(doc)
+        await doc.set({
+            DocumentModel.text_length: doc.text_length,
+            DocumentModel.paragraph_spans: doc.paragraph_spans
+        })
+        await store_text_chunks(doc)
+        index.text_length, index.paragraph_spans = doc.text_length, doc.paragraph_spans
+        index.text_chunk_chars = doc.text_chunk_chars
+    return index
+
+
+async def iter_text(index: DocumentTextIndex, start: int, end: int) -> AsyncIterator[str]:
+    """Текст [start, end) по кускам, в порядке следования."""
+    if start >= end:
+        return
+    size = index.text_chunk_chars
+    if not size:
+        doc = await DocumentModel.get(index.id)
+        yield (doc.parsed_text or "")[start:end]
+        return
+
+    first, last = start // size, (end - 1) // size
+    chunks = DocumentTextChunk.find(
+        DocumentTextChunk.document_id == str(index.id),
+        DocumentTextChunk.index >= first,
+        DocumentTextChunk.index <= last
+    ).sort("+index")
+    async for chunk in chunks:
+        chunk_start = chunk.index * size
+        yield chunk.text[max(start - chunk_start, 0):end - chunk_start]
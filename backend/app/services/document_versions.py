@@ -0,0 +1,84 @@
+# backend/app/services/document_versions.py
+"""
+Версии документа и переиспользование суммаризаций чанков между ними.
+"""
+from typing import Any, Dict, List
+
+from beanie.operators import In
+from pymongo.errors import DuplicateKeyError
+
+from backend.app.infrastructure.database.models import DocumentModel, SummaryModel
+from backend.app.infrastructure.summarization.chunking import STRATEGY_CHUNKED
+
+# Сколько последних суммаризаций версий просматривать в поисках готовых чанков
+REUSE_LOOKBACK = 5
+# Попыток вставить версию, если её номер одновременно занял другой запрос
+VERSION_INSERT_ATTEMPTS = 5
+
+
+def version_root_id(doc: DocumentModel) -> str:
+    """id исходного документа цепочки версий."""
+    return doc.root_id or str(doc.id)
+
+
+async def list_versions(root_id: str) -> List[DocumentModel]:
+    """Все версии документа, от новых к старым (исходный документ - версия 1)."""
+    versions = await DocumentModel.find(DocumentModel.root_id == root_id).sort("-version").to_list()
+    root = await DocumentModel.get(root_id)
+    if root:
+        versions.append(root)
+    return versions
+
+
+async def next_version_number(root_id: str) -> int:
+    latest = await DocumentModel.find(DocumentModel.root_id == root_id).sort("-version").first_or_none()
+    return latest.version + 1 if latest else 2
+
+
+async def insert_version(doc: DocumentModel) -> DocumentModel:
+    """
+    Вставляет новую версию цепочки doc.root_id со следующим номером.
+    Номер читается и вставляется не атомарно: при конфликте по уникальному
+    индексу (root_id, version) номер перечитывается.
+    """
+    for attempt in range(VERSION_INSERT_ATTEMPTS):
+        doc.version = await next_version_number(doc.root_id)
+        try:
+            return await doc.insert()
+        except DuplicateKeyError:
+            if attempt == VERSION_INSERT_ATTEMPTS - 1:
+                raise
+
+
+async def find_reusable_chunks(doc: DocumentModel, method: str, params: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Суммаризации чанков из готовых chunked-суммаризаций версий того же
+    документа с теми же параметрами генерации. При совпадении хэша
+    берётся результат более новой суммаризации.
+
+    Обрезанные по бюджету латентности суммаризации чанков не сохраняются
+    (см. chunks_time_limited), но суммаризации, записанные раньше, могут
+    их содержать - такие при time_limited пропускаются целиком.
+    """
+    version_ids = [str(version.id) for version in await list_versions(version_root_id(doc))]
+    summaries = await SummaryModel.find(
+        In(SummaryModel.document_id, version_ids),
+        SummaryModel.status == "done",
+        SummaryModel.method == method,
+        {
+            "params.strategy": STRATEGY_CHUNKED,
+            "params.min_length": params["min_length"],
+            "params.max_length": params["max_length"],
+            "params.profile": params["profile"],
+            "$or": [
+                {"generation_info.time_limited": {"$ne": True}},
+                {"generation_info.chunks_time_limited": {"$exists": True}},
+            ],
+        },
+    ).sort("-created_at").limit(REUSE_LOOKBACK).to_list()
+
+    reusable: Dict[str, str] = {}
+    for summary in summaries:
+        for chunk_hash, text in summary.chunk_summaries.items():
+            reusable.setdefault(chunk_hash, text)
+    return reusable
@@ -0,0 +1,77 @@
+# backend/app/services/export.py
+"""
+Потоковая выгрузка коллекций в NDJSON (одна запись - одна строка JSON).
+
+Записи читаются курсором Motor по возрастанию _id с проекцией только нужных
+полей и сериализуются orjson без Pydantic-моделей; в памяти держится одна
+пачка курсора. Возобновление: after - id последней полученной записи.
+"""
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import orjson
+from beanie import Document
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+def parse_resume_token(after: Optional[str]) -> Optional[ObjectId]:
+    """ValueError, если токен - не id записи."""
+    if after is None:
+        return None
+    try:
+        return ObjectId(after)
+    except (InvalidId, TypeError):
+        raise ValueError(f"Некорректный токен возобновления '{after}'")
+
+
+def build_filter(
+        date_field: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        after: Optional[ObjectId] = None,
+        **equals: Any
+) -> Dict[str, Any]:
+    """Фильтр Mongo: диапазон дат [date_from, date_to), _id > after, равенство полей (None - без фильтра)."""
+    query: Dict[str, Any] = {field: value for field, value in equals.items() if value is not None}
+    dates = {}
+    if date_from is not None:
+        dates["$gte"] = date_from
+    if date_to is not None:
+        dates["$lt"] = date_to
+    if dates:
+        query[date_field] = dates
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    return query
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError
+
+
+async def stream_ndjson(
+        model: type[Document],
+        query: Dict[str, Any],
+        fields: List[str],
+        batch_size: int
+) -> AsyncIterator[bytes]:
+    """Строки NDJSON записей model по query; _id выгружается как id."""
+    projection = {field: 1 for field in fields}
+    cursor = model.get_motor_collection().find(
+        query, projection, sort=[("_id", 1)], batch_size=batch_size
+    )
+    lines = []
+    try:
+        async for record in cursor:
+            lines.append(orjson.dumps({"id": record.pop("_id"), **record}, default=_default))
+            if len(lines) >= batch_size:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+    finally:
+        # Клиент мог отключиться посреди выгрузки
+        await cursor.close()
@@ -0,0 +1,176 @@
+# backend/app/services/search.py
+"""
+Полнотекстовый поиск по документам и суммаризациям.
+
+Поиск идёт по текстовым индексам Mongo (default_language="russian", т.е. со
+стеммингом): documents - parsed_text и title, summaries - summary_text.
+Ранжирование - textScore; из каждой коллекции читается не больше
+offset + limit лучших совпадений без текста, тексты дочитываются только для
+записей страницы, чтобы построить сниппеты.
+
+textScore коллекций несопоставим (разные поля и веса индексов), поэтому
+перед слиянием он нормируется на лучший результат своей коллекции. Число
+совпадений считается, только если страница заполнена, и не дальше
+COUNT_LIMIT: при большем числе total - нижняя граница.
+"""
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from backend.app.infrastructure.database.models import DocumentModel, SummaryModel
+
+SCOPE_ALL = "all"
+SCOPE_DOCUMENTS = "documents"
+SCOPE_SUMMARIES = "summaries"
+SCOPES = (SCOPE_ALL, SCOPE_DOCUMENTS, SCOPE_SUMMARIES)
+
+SNIPPET_CHARS = 240
+# Дальше совпадения не считаются: total становится нижней границей
+COUNT_LIMIT = 1000
+
+_WORD_RE = re.compile(r"-?\w+")
+# Слова короче не обрезаются; у длинных отбрасывается окончание (до 2 букв)
+_MIN_STEM = 4
+
+
+@dataclass
+class SearchHit:
+    kind: str  # document | summary
+    id: str
+    score: float  # textScore, делённый на лучший в коллекции: (0, 1]
+    created_at: datetime
+    document_id: Optional[str] = None
+    title: Optional[str] = None
+    text: str = ""
+    snippet: str = ""
+    highlights: List[Tuple[int, int]] = field(default_factory=list)
+
+
+def _query_stems(query: str) -> List[str]:
+    """
+    Приблизительные основы слов запроса для подсветки: сам поиск стеммингом
+    Mongo находит словоформы, а здесь достаточно совпадения по началу слова.
+    Исключённые слова (-слово) не подсвечиваются.
+    """
+    stems = set()
+    for word in _WORD_RE.findall(query.lower()):
+        if word.startswith("-"):
+            continue
+        stems.add(word if len(word) <= _MIN_STEM else word[:max(_MIN_STEM, len(word) - 2)])
+    return sorted(stems, key=len, reverse=True)
+
+
+def make_snippet(text: str, query: str, width: int = SNIPPET_CHARS) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Фрагмент text длиной около width вокруг первого совпадения и
+    диапазоны [start, end) совпадений внутри фрагмента.
+    """
+    stems = _query_stems(query)
+    if not text or not stems:
+        return text[:width], []
+    pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, stems)) + r")\w*", re.IGNORECASE)
+
+    first = pattern.search(text)
+    start = 0
+    if first is not None and first.start() > width // 3:
+        start = first.start() - width // 3
+        # Не резать слово пополам
+        space = text.find(" ", start)
+        if 0 <= space < first.start():
+            start = space + 1
+    end = min(len(text), start + width)
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        if space > start:
+            end = space
+
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(text) else ""
+    snippet = prefix + text[start:end] + suffix
+    shift = len(prefix) - start
+    highlights = [(m.start() + shift, m.end() + shift) for m in pattern.finditer(text, start, end)]
+    return snippet, highlights
+
+
+async def _top_hits(
+        model: type, kind: str, query: str, count: int, fields: Dict[str, Any]
+) -> Tuple[int, bool, List[SearchHit]]:
+    """(число совпадений, точное ли оно, лучшие count совпадений с нормированным score)."""
+    collection = model.get_motor_collection()
+    text_filter = {"$text": {"$search": query}}
+    if count == 0:
+        return 0, True, []
+
+    cursor = collection.find(
+        text_filter, {"score": {"$meta": "textScore"}, **fields}
+    ).sort([("score", {"$meta": "textScore"})]).limit(count)
+    hits = []
+    async for record in cursor:
+        if kind == SCOPE_DOCUMENTS:
+            hit = SearchHit(
+                kind="document",
+                id=str(record["_id"]),
+                score=record["score"],
+                created_at=record["uploaded_at"],
+                document_id=str(record["_id"]),
+                title=record.get("title") or record.get("filename"),
+            )
+        else:
+            hit = SearchHit(
+                kind="summary",
+                id=str(record["_id"]),
+                score=record["score"],
+                created_at=record["created_at"],
+                document_id=record.get("document_id"),
+                text=record.get("summary_text") or "",
+            )
+        hits.append(hit)
+    if hits:
+        # Лучший результат коллекции одинаков для любой страницы
+        top = hits[0].score or 1.0
+        for hit in hits:
+            hit.score /= top
+
+    if len(hits) < count:
+        return len(hits), True, hits
+    total = await collection.count_documents(text_filter, limit=COUNT_LIMIT)
+    return max(total, len(hits)), total < COUNT_LIMIT, hits
+
+
+async def search(query: str, scope: str, limit: int, offset: int) -> Tuple[int, bool, List[SearchHit]]:
+    """(число совпадений, точное ли оно, страница результатов по убыванию релевантности)."""
+    count = offset + limit
+    total, exact, hits = 0, True, []
+    if scope in (SCOPE_ALL, SCOPE_DOCUMENTS):
+        found, found_exact, top = await _top_hits(
+            DocumentModel, SCOPE_DOCUMENTS, query, count, {"filename": 1, "title": 1, "uploaded_at": 1}
+        )
+        total, exact, hits = total + found, exact and found_exact, hits + top
+    if scope in (SCOPE_ALL, SCOPE_SUMMARIES):
+        found, found_exact, top = await _top_hits(
+            SummaryModel, SCOPE_SUMMARIES, query, count,
+            {"document_id": 1, "created_at": 1, "summary_text": 1}
+        )
+        total, exact, hits = total + found, exact and found_exact, hits + top
+
+    page = sorted(hits, key=lambda hit: hit.score, reverse=True)[offset:count]
+
+    # Текст документов - только для сниппетов страницы
+    document_ids = [ObjectId(hit.id) for hit in page if hit.kind == "document"]
+    if document_ids:
+        texts = {}
+        cursor = DocumentModel.get_motor_collection().find(
+            {"_id": {"$in": document_ids}}, {"parsed_text": 1}
+        )
+        async for record in cursor:
+            texts[str(record["_id"])] = record.get("parsed_text") or ""
+        for hit in page:
+            if hit.kind == "document":
+                hit.text = texts.get(hit.id, "")
+
+    for hit in page:
+        hit.snippet, hit.highlights = make_snippet(hit.text, query)
+    return total, exact, page
@@ -0,0 +1,162 @@
+import queue
+import sys
+import time
+from unittest import mock
+
+import pytest
+
+from backend.app.workers import autoscaler
+from backend.app.workers.autoscaler import Autoscaler, InMemoryBroker, Metrics, ScalingPolicy, Supervisor
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakePool:
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+
+    def size(self) -> int:
+        return self.workers
+
+    def spawn(self) -> None:
+        self.workers += 1
+
+    def retire(self) -> None:
+        self.workers -= 1
+
+    def memory_mb(self):
+        return None
+
+    def shutdown(self) -> None:
+        self.workers = 0
+
+
+POLICY = ScalingPolicy(
+    min_workers=1, max_workers=4, queue_per_worker=2,
+    scale_up_after_s=10, scale_down_after_s=60, cooldown_s=30,
+)
+
+
+def test_scale_up_waits_for_sustained_load():
+    clock = _Clock()
+    scaler = Autoscaler(POLICY, clock=clock)
+
+    assert scaler.desired_workers(Metrics(queue_depth=6, workers=1)) == 1
+    clock.now = 5
+    assert scaler.desired_workers(Metrics(queue_depth=6, workers=1)) == 1
+    clock.now = 10
+    # Рост сразу до нужного числа: 6 задач / 2 на воркера
+    assert scaler.desired_workers(Metrics(queue_depth=6, workers=1)) == 3
+
+
+def test_spike_shorter_than_delay_is_ignored():
+    clock = _Clock()
+    scaler = Autoscaler(POLICY, clock=clock)
+
+    scaler.desired_workers(Metrics(queue_depth=6, workers=1))
+    clock.now = 5
+    scaler.desired_workers(Metrics(queue_depth=0, workers=1))
+    clock.now = 12
+    assert scaler.desired_workers(Metrics(queue_depth=6, workers=1)) == 1
+
+
+def test_scale_down_one_by_one_after_cooldown():
+    clock = _Clock()
+    scaler = Autoscaler(POLICY, clock=clock)
+    scaler.desired_workers(Metrics(queue_depth=20, workers=1))
+    clock.now = 10
+    assert scaler.desired_workers(Metrics(queue_depth=20, workers=1)) == 4
+
+    clock.now = 20
+    assert scaler.desired_workers(Metrics(queue_depth=0, workers=4)) == 4
+    clock.now = 80
+    assert scaler.desired_workers(Metrics(queue_depth=0, workers=4)) == 3
+    # Следующее сокращение - снова после выдержки
+    clock.now = 100
+    assert scaler.desired_workers(Metrics(queue_depth=0, workers=3)) == 3
+
+
+def test_latency_target_and_memory_budget():
+    policy = ScalingPolicy(
+        min_workers=1, max_workers=8, target_wait_ms=1000,
+        scale_up_after_s=0, cooldown_s=0, worker_memory_mb=1000, memory_budget_mb=3500,
+    )
+    scaler = Autoscaler(policy, clock=_Clock())
+
+    # 10 задач по 500 мс при цели 1 с - нужно 5 воркеров, бюджет памяти даёт 3
+    assert scaler.needed_workers(Metrics(queue_depth=10, workers=1, latency_p50_ms=500)) == 5
+    assert scaler.desired_workers(Metrics(queue_depth=10, workers=1, latency_p50_ms=500)) == 3
+    # Измеренный RSS больше оценки - бюджет пересчитывается
+    assert scaler.capacity(Metrics(queue_depth=0, workers=1, worker_memory_mb=1700)) == 2
+
+
+def test_bounds_apply_immediately():
+    scaler = Autoscaler(POLICY, clock=_Clock())
+    assert scaler.desired_workers(Metrics(queue_depth=0, workers=0)) == 1
+    assert scaler.desired_workers(Metrics(queue_depth=0, workers=6)) == 4
+
+
+def test_in_memory_broker_depth_and_latencies():
+    broker = InMemoryBroker()
+    for job_ms in (100, 200, 300):
+        broker.publish(job_ms)
+    assert broker.queue_depth() == 3
+
+    assert broker.take(timeout=1) == 100
+    assert broker.queue_depth() == 2
+    broker.take(timeout=1)
+    broker.take(timeout=1)
+    with pytest.raises(queue.Empty):
+        broker.take(timeout=0.05)
+    assert broker.queue_depth() == 0
+
+    broker.report_latency(100.0)
+    broker.report_latency(150.0)
+    # Очередь multiprocessing передаёт данные фоновым потоком
+    deadline = time.monotonic() + 5
+    while len(broker.recent_latencies_ms()) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert broker.recent_latencies_ms() == [100.0, 150.0]
+
+
+def test_supervisor_follows_broker_queue():
+    broker = InMemoryBroker()
+    policy = ScalingPolicy(min_workers=1, max_workers=4, queue_per_worker=2, scale_up_after_s=0, cooldown_s=0)
+    pool = _FakePool()
+    supervisor = Supervisor(broker, pool, Autoscaler(policy, clock=_Clock()))
+
+    for _ in range(8):
+        broker.publish(100)
+    assert supervisor.step().queue_depth == 8
+    assert pool.workers == 4
+
+
+def _fake_redis(**from_url):
+    redis = mock.MagicMock()
+    redis.Redis.from_url = mock.MagicMock(**from_url)
+    autoscaler._redis_client.cache_clear()
+    return mock.patch.dict(sys.modules, {"redis": redis}), redis
+
+
+def test_record_job_latency_reuses_client():
+    patch, redis = _fake_redis()
+    with patch:
+        autoscaler.record_job_latency("redis://localhost:6379/0", 10.0)
+        autoscaler.record_job_latency("redis://localhost:6379/0", 20.0)
+    autoscaler._redis_client.cache_clear()
+
+    redis.Redis.from_url.assert_called_once_with("redis://localhost:6379/0")
+    assert redis.Redis.from_url.return_value.pipeline.call_count == 2
+
+
+def test_record_job_latency_never_raises():
+    patch, _ = _fake_redis(side_effect=ConnectionError("down"))
+    with patch:
+        autoscaler.record_job_latency("redis://localhost:6379/0", 10.0)
+    autoscaler._redis_client.cache_clear()
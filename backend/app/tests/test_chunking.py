@@ -0,0 +1,83 @@
+from backend.app.domain.entities import SummarizationResult
+from backend.app.infrastructure.summarization import mbart_gateway
+from backend.app.infrastructure.summarization.chunking import chunk_text, diff_paragraphs, split_paragraphs
+
+PARAGRAPHS = [f"Абзац номер {i} про тему {i % 7} и ещё несколько слов." for i in range(40)]
+TEXT = "\n".join(PARAGRAPHS)
+
+
+def test_chunks_cover_text_within_limits():
+    chunks = chunk_text(TEXT, min_words=20, max_words=40)
+
+    assert "\n".join(chunk.text for chunk in chunks) == TEXT
+    # Лимит превышается только абзацем длиннее max_words
+    assert all(len(chunk.text.split()) <= 40 for chunk in chunks)
+    assert all(len(chunk.text.split()) >= 20 for chunk in chunks[:-1])
+
+
+def test_insertion_keeps_later_chunk_boundaries():
+    before = chunk_text(TEXT, min_words=20, max_words=80)
+    edited = PARAGRAPHS[:3] + ["Новый абзац в начале документа."] + PARAGRAPHS[3:]
+    after = chunk_text("\n".join(edited), min_words=20, max_words=80)
+
+    before_hashes = {chunk.hash for chunk in before}
+    assert len(before) > 2
+    assert before[-1].hash in {chunk.hash for chunk in after}
+    # Правка затрагивает не больше пары чанков
+    assert len(before_hashes - {chunk.hash for chunk in after}) <= 2
+
+
+def test_diff_paragraphs():
+    old = "Первый.\nВторой.\nТретий.\nЧетвёртый."
+    new = "Первый.\n  Второй.  \nТретий, исправленный.\nЧетвёртый.\nПятый."
+
+    assert diff_paragraphs(old, new) == {"unchanged": 3, "added": 1, "removed": 0, "changed": 1}
+    assert diff_paragraphs(old, "") == {"unchanged": 0, "added": 0, "removed": 4, "changed": 0}
+
+
+def test_split_paragraphs_drops_blank_lines():
+    assert split_paragraphs(" а \n\n\tб\n") == ["а", "б"]
+
+
+def _gateway(time_limited_calls):
+    gateway = mbart_gateway.SummarizationGateway.__new__(mbart_gateway.SummarizationGateway)
+    calls = []
+
+    def summarize(text, min_length, max_length, profile, max_latency_ms, method, token_ids=None):
+        calls.append(text)
+        return SummarizationResult(
+            text=f"summary {len(calls)}",
+            generation_info={"profile": "fast", "latency_ms": 1.0, "time_limited": len(calls) in time_limited_calls},
+        )
+
+    gateway._blocking_summarize = summarize
+    return gateway, calls
+
+
+def test_chunked_does_not_keep_time_limited_chunks(monkeypatch):
+    monkeypatch.setattr(mbart_gateway.settings, "CHUNK_MIN_WORDS", 20)
+    monkeypatch.setattr(mbart_gateway.settings, "CHUNK_MAX_WORDS", 40)
+    chunks = chunk_text(TEXT, 20, 40)
+    gateway, calls = _gateway(time_limited_calls={2})
+
+    result = gateway._blocking_summarize_chunked(TEXT, 5, 50, None, 1000, "mbart")
+
+    assert chunks[1].hash not in result.chunk_summaries
+    assert len(result.chunk_summaries) == len(chunks) - 1
+    assert result.generation_info["chunks_time_limited"] == 1
+    assert result.generation_info["time_limited"] is True
+    # Итоговый прогон по всем чанкам, включая обрезанный
+    assert calls[-1].count("summary") == len(chunks)
+
+
+def test_single_chunk_keeps_generation_info(monkeypatch):
+    monkeypatch.setattr(mbart_gateway.settings, "CHUNK_MIN_WORDS", 1000)
+    monkeypatch.setattr(mbart_gateway.settings, "CHUNK_MAX_WORDS", 2000)
+    gateway, calls = _gateway(time_limited_calls=set())
+
+    result = gateway._blocking_summarize_chunked(TEXT, 5, 50, None, 1000, "mbart")
+
+    assert len(calls) == 1
+    assert result.generation_info["profile"] == "fast"
+    assert result.generation_info["time_limited"] is False
+    assert len(result.chunk_summaries) == 1
@@ -0,0 +1,44 @@
+import pytest
+
+from backend.app.infrastructure.summarization.decoding import (
+    DEFAULT_PROFILE, LatencyEstimator, choose_profile, get_profile
+)
+
+FAST, QUALITY = get_profile("fast"), get_profile("quality")
+
+
+def test_get_profile():
+    assert get_profile(None).name == DEFAULT_PROFILE
+    with pytest.raises(ValueError):
+        get_profile("greedy-ish")
+
+
+def test_estimator_ema_per_token():
+    estimator = LatencyEstimator(alpha=0.5)
+    assert estimator.predict(FAST, 100) is None
+
+    estimator.observe(FAST, 100, 1000)  # 10 мс/токен
+    estimator.observe(FAST, 100, 2000)  # 20 мс/токен -> EMA 15
+    assert estimator.predict(FAST, 200) == pytest.approx(3000)
+
+
+def test_estimator_scales_other_profile_by_relative_cost():
+    estimator = LatencyEstimator()
+    estimator.observe(FAST, 100, 1000)
+    assert estimator.predict(QUALITY, 100) == pytest.approx(1000 * QUALITY.relative_cost)
+
+
+def test_choose_profile_downgrades_over_budget():
+    estimator = LatencyEstimator()
+    estimator.observe(QUALITY, 100, 4000)
+
+    assert choose_profile(QUALITY, 100, 5000, estimator) == (QUALITY, False)
+    assert choose_profile(QUALITY, 100, 2000, estimator) == (FAST, True)
+    # У fast нет fallback: остаётся им, даже если не укладывается
+    assert choose_profile(QUALITY, 100, 10, estimator) == (FAST, True)
+
+
+def test_choose_profile_without_budget_or_data():
+    estimator = LatencyEstimator()
+    assert choose_profile(QUALITY, 100, None, estimator) == (QUALITY, False)
+    assert choose_profile(QUALITY, 100, 10, estimator) == (QUALITY, False)
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from backend.app.infrastructure.database.models import DocumentTextIndex
+from backend.app.infrastructure.summarization.chunking import paragraph_spans, split_paragraphs
+from backend.app.services.document_text import UNIT_CHARS, UNIT_PARAGRAPHS, resolve_range
+
+TEXT = "  Первый абзац.\n\nВторой\tабзац  \r\n\n   \nТретий"
+
+
+def _index(text: str) -> DocumentTextIndex:
+    return DocumentTextIndex(
+        _id=ObjectId(), uploaded_at=datetime(2026, 1, 1),
+        text_length=len(text), paragraph_spans=paragraph_spans(text)
+    )
+
+
+def test_paragraph_spans_match_split_paragraphs():
+    spans = paragraph_spans(TEXT)
+    paragraphs = [TEXT[start:end] for start, end in zip(spans[::2], spans[1::2])]
+    assert paragraphs == split_paragraphs(TEXT)
+    assert paragraph_spans("") == []
+
+
+def test_resolve_chars_clamped_to_text():
+    index = _index(TEXT)
+    assert resolve_range(index, 2, 5, UNIT_CHARS) == (2, 7)
+    assert resolve_range(index, len(TEXT) - 2, 100, UNIT_CHARS) == (len(TEXT) - 2, len(TEXT))
+    assert resolve_range(index, 1000, 10, UNIT_CHARS) == (len(TEXT), len(TEXT))
+
+
+def test_resolve_paragraphs():
+    index = _index(TEXT)
+    start, end = resolve_range(index, 1, 1, UNIT_PARAGRAPHS)
+    assert TEXT[start:end] == "Второй\tабзац"
+
+    start, end = resolve_range(index, 1, 10, UNIT_PARAGRAPHS)
+    assert TEXT[start:end].startswith("Второй") and TEXT[start:end].endswith("Третий")
+    assert end == len(TEXT)
+
+    assert resolve_range(index, 3, 1, UNIT_PARAGRAPHS) == (len(TEXT), len(TEXT))
@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+import torch
+
+from backend.app.infrastructure.summarization.decoding import LatencyEstimator
+from backend.app.infrastructure.summarization.encoder_cache import EncoderOutputCache, encoder_cache_key
+from backend.app.infrastructure.summarization.mbart_gateway import SummarizationGateway
+from backend.app.infrastructure.summarization.model_registry import LoadedModel, ModelSpec
+
+
+def _hidden(value: float, tokens: int = 16) -> torch.Tensor:
+    # 1 x tokens x 16 float32 = tokens * 64 байт
+    return torch.full((1, tokens, 16), float(value))
+
+
+def test_key_depends_on_model_and_tokens():
+    ids = torch.tensor([[1, 2, 3]])
+    assert encoder_cache_key("a", ids) == encoder_cache_key("a", ids.clone())
+    assert encoder_cache_key("a", ids) != encoder_cache_key("b", ids)
+    assert encoder_cache_key("a", ids) != encoder_cache_key("a", torch.tensor([[1, 2, 4]]))
+
+
+def test_lru_in_memory_and_counters():
+    cache = EncoderOutputCache(max_bytes=2 * 1024)
+    cache.put("a", _hidden(1))
+    cache.put("b", _hidden(2))
+    assert cache.get("a", "cpu", torch.float32) is not None
+    cache.put("c", _hidden(3))
+
+    assert cache.get("b", "cpu", torch.float32) is None
+    assert torch.equal(cache.get("a", "cpu", torch.float32), _hidden(1))
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_fp16_is_opt_in():
+    value = torch.full((1, 4, 4), 1 / 3)
+    exact = EncoderOutputCache(max_bytes=1024)
+    exact.put("k", value)
+    assert torch.equal(exact.get("k", "cpu", torch.float32), value)
+
+    compact = EncoderOutputCache(max_bytes=1024, fp16=True)
+    compact.put("k", value)
+    restored = compact.get("k", "cpu", torch.float32)
+    assert restored.dtype == torch.float32
+    assert torch.allclose(restored, value, atol=1e-3)
+
+
+def _spilled(path):
+    return sorted(name for name in os.listdir(path) if name.endswith(".pt"))
+
+
+def _disk_usage(path) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in _spilled(path))
+
+
+def _file_size(tmp_path) -> int:
+    """Размер файла одной записи на диске (с накладными расходами torch.save)."""
+    probe = EncoderOutputCache(max_bytes=1, spill_dir=str(tmp_path / "probe"), spill_max_bytes=1024 * 1024)
+    probe._spill("probe", _hidden(0))
+    return os.path.getsize(tmp_path / "probe" / "probe.pt")
+
+
+def test_spill_to_disk_and_trim(tmp_path):
+    size = _file_size(tmp_path)
+    cache = EncoderOutputCache(max_bytes=16 * 64, spill_dir=str(tmp_path / "spill"), spill_max_bytes=3 * size)
+    for i in range(6):
+        cache.put(str(i), _hidden(i))
+
+    # В памяти - последняя запись, на диске - три предыдущих, самые старые удалены
+    assert _spilled(tmp_path / "spill") == ["2.pt", "3.pt", "4.pt"]
+    assert cache._spill_size == _disk_usage(tmp_path / "spill")
+    assert torch.equal(cache.get("2", "cpu", torch.float32), _hidden(2))
+    assert cache.get("0", "cpu", torch.float32) is None
+
+    # Поднятая с диска запись становится недавней и не удаляется следующей
+    cache.put("6", _hidden(6))
+    assert "2.pt" in _spilled(tmp_path / "spill")
+
+
+def test_spill_accounting_survives_restart(tmp_path):
+    size = _file_size(tmp_path)
+    spill_dir = str(tmp_path / "spill")
+    first = EncoderOutputCache(max_bytes=16 * 64, spill_dir=spill_dir, spill_max_bytes=10 * size)
+    for i in range(5):
+        first.put(str(i), _hidden(i))
+    assert len(_spilled(spill_dir)) == 4
+
+    # Новый процесс с меньшим лимитом: учёт строится по каталогу, лишнее удаляется
+    second = EncoderOutputCache(max_bytes=16 * 64, spill_dir=spill_dir, spill_max_bytes=2 * size)
+    assert len(_spilled(spill_dir)) == 2
+    assert second._spill_size == _disk_usage(spill_dir)
+
+
+def test_concurrent_gets_count_every_lookup():
+    cache = EncoderOutputCache(max_bytes=1024 * 1024)
+    cache.put("hit", _hidden(1))
+
+    def lookups():
+        for _ in range(500):
+            cache.get("hit", "cpu", torch.float32)
+            cache.get("miss", "cpu", torch.float32)
+
+    threads = [threading.Thread(target=lookups) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (cache.hits, cache.misses) == (2000, 2000)
+
+
+def _timed_gateway(encoder_delay_s: float):
+    """Шлюз с заглушками модели: запоминает kwargs generate, энкодер спит encoder_delay_s."""
+    calls = []
+
+    def generate(input_ids, **kwargs):
+        calls.append(kwargs)
+        return torch.tensor([[2, 5, 3]])
+
+    model = SimpleNamespace(generate=generate, config=SimpleNamespace(eos_token_id=3))
+    loaded = LoadedModel(
+        spec=ModelSpec(method="m", model_name="m"), model=model,
+        tokenizer=SimpleNamespace(decode=lambda ids, **kwargs: "итог"), memory_bytes=0, last_used=0.0
+    )
+    gateway = SummarizationGateway.__new__(SummarizationGateway)
+    gateway.registry = SimpleNamespace(get=lambda method: loaded)
+    gateway._latency_estimators = defaultdict(LatencyEstimator)
+    ids = torch.tensor([[5, 6, 7]])
+    gateway._encode_input = lambda text, loaded, token_ids: (ids, torch.ones_like(ids), {})
+
+    def encoder_outputs(loaded, input_ids, attention_mask):
+        time.sleep(encoder_delay_s)
+        return None, False
+
+    gateway._encoder_outputs = encoder_outputs
+    return gateway, calls
+
+
+def test_encoder_time_is_taken_from_latency_budget():
+    gateway, calls = _timed_gateway(encoder_delay_s=0.0)
+    gateway._blocking_summarize("текст", 1, 10, profile="fast", max_latency_ms=1000)
+    gateway, slow_calls = _timed_gateway(encoder_delay_s=0.3)
+    gateway._blocking_summarize("текст", 1, 10, profile="fast", max_latency_ms=1000)
+
+    assert calls[0]["max_time"] > 0.9
+    # Промах кэша энкодера: его время уже потрачено из бюджета generate
+    assert slow_calls[0]["max_time"] <= 0.7
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.infrastructure.summarization import execution
+from backend.app.infrastructure.summarization.execution import InferencePolicy, _parse_cpulist
+
+
+def _settings(**overrides):
+    values = dict(
+        INFERENCE_PROCESSES=1, INFERENCE_PROCESS_INDEX=None, INFERENCE_SLOTS=None,
+        INFERENCE_THREADS_PER_SLOT=None, INFERENCE_PIN_CPUS=True,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture(autouse=True)
+def _cpus(monkeypatch):
+    monkeypatch.setattr(execution, "available_cpus", lambda: list(range(16)))
+
+
+def test_parse_cpulist():
+    assert _parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+
+
+def test_auto_slots_and_threads():
+    policy = InferencePolicy.detect(_settings())
+    assert (policy.slots, policy.threads_per_slot) == (4, 4)
+    assert policy.cpu_sets == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11], [12, 13, 14, 15]]
+
+
+def test_slots_or_threads_given():
+    assert InferencePolicy.detect(_settings(INFERENCE_SLOTS=2)).threads_per_slot == 8
+    assert InferencePolicy.detect(_settings(INFERENCE_THREADS_PER_SLOT=2)).slots == 8
+    assert InferencePolicy.detect(_settings(INFERENCE_PIN_CPUS=False)).cpu_sets is None
+
+
+def test_process_share_by_index():
+    settings = _settings(INFERENCE_PROCESSES=4)
+    policies = [InferencePolicy.detect(settings, slots=1, process_index=i) for i in range(4)]
+
+    assert [policy.cpu_sets for policy in policies] == [
+        [[0, 1, 2, 3]], [[4, 5, 6, 7]], [[8, 9, 10, 11]], [[12, 13, 14, 15]]
+    ]
+    assert all(policy.threads_per_slot == 4 for policy in policies)
+    # Номер из настроек - то же самое
+    assert InferencePolicy.detect(_settings(INFERENCE_PROCESSES=4, INFERENCE_PROCESS_INDEX=2)).cpu_sets == [
+        [8, 9, 10, 11]
+    ]
+
+
+def test_unknown_index_disables_pinning():
+    policy = InferencePolicy.detect(_settings(INFERENCE_PROCESSES=4))
+    # Доля ядер по-прежнему делится, но без привязки процессы не мешают друг другу на одних ядрах
+    assert (policy.slots, policy.threads_per_slot) == (1, 4)
+    assert policy.cpu_sets is None
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime
+
+import orjson
+import pytest
+from bson import ObjectId
+
+from backend.app.services.export import build_filter, parse_resume_token, stream_ndjson
+
+
+def test_build_filter_dates_resume_and_equals():
+    after = ObjectId()
+    query = build_filter(
+        "created_at", datetime(2026, 1, 1), datetime(2026, 2, 1), after, status="done", method=None
+    )
+    assert query == {
+        "status": "done",
+        "created_at": {"$gte": datetime(2026, 1, 1), "$lt": datetime(2026, 2, 1)},
+        "_id": {"$gt": after},
+    }
+    assert build_filter("uploaded_at") == {}
+    assert build_filter("uploaded_at", date_to=datetime(2026, 1, 1)) == {"uploaded_at": {"$lt": datetime(2026, 1, 1)}}
+
+
+def test_parse_resume_token():
+    token = ObjectId()
+    assert parse_resume_token(str(token)) == token
+    assert parse_resume_token(None) is None
+    with pytest.raises(ValueError):
+        parse_resume_token("not-an-id")
+
+
+class _Cursor:
+    def __init__(self, records):
+        self.records = records
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for record in self.records:
+            yield record
+
+    async def close(self):
+        self.closed = True
+
+
+class _Model:
+    def __init__(self, records):
+        self.cursor = _Cursor(records)
+        self.calls = []
+
+    def get_motor_collection(self):
+        return self
+
+    def find(self, query, projection, **kwargs):
+        self.calls.append((query, projection, kwargs))
+        return self.cursor
+
+
+def test_stream_ndjson_batches_lines():
+    ids = [ObjectId() for _ in range(5)]
+    model = _Model([{"_id": i, "document_id": ObjectId(), "status": "done"} for i in ids])
+
+    async def collect():
+        return [part async for part in stream_ndjson(model, {"status": "done"}, ["status"], batch_size=2)]
+
+    parts = asyncio.run(collect())
+
+    assert [part.count(b"\n") for part in parts] == [2, 2, 1]
+    lines = [orjson.loads(line) for line in b"".join(parts).splitlines()]
+    assert [line["id"] for line in lines] == [str(i) for i in ids]
+    assert isinstance(lines[0]["document_id"], str)
+    query, projection, kwargs = model.calls[0]
+    assert projection == {"status": 1} and kwargs["sort"] == [("_id", 1)]
+    assert model.cursor.closed
+
+
+def test_stream_ndjson_closes_cursor_on_disconnect():
+    model = _Model([{"_id": ObjectId()} for _ in range(10)])
+
+    async def read_first():
+        stream = stream_ndjson(model, {}, [], batch_size=1)
+        await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(read_first())
+    assert model.cursor.closed
@@ -0,0 +1,75 @@
+import numpy as np
+
+from backend.app.infrastructure.summarization.extractive import (
+    ExtractiveSummarizer, _term_matrix, prefilter_for_model, select_salient, split_sentences, textrank_scores
+)
+
+TEXT = (
+    "Нейросетевая модель суммаризации сокращает длинные документы. "
+    "Модель суммаризации обучена на новостных документах. "
+    "Погода сегодня солнечная.\n"
+    "Длинные документы модель сокращает до нескольких предложений. "
+    "Кошка спит на диване."
+)
+
+
+def _dense_textrank(sentences, damping=0.85, iterations=200):
+    """Эталон: PageRank по явной матрице косинусной близости."""
+    x = _term_matrix(sentences).toarray()
+    similarity = x @ x.T
+    np.fill_diagonal(similarity, 0.0)
+    n = len(sentences)
+    weights = similarity.sum(axis=1)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        dangling = scores[weights <= 1e-12].sum() / n
+        spread = np.divide(scores, weights, out=np.zeros(n), where=weights > 1e-12)
+        scores = (1 - damping) / n + damping * (similarity.T @ spread + dangling)
+    return scores
+
+
+def test_split_sentences_keeps_paragraph_boundaries():
+    sentences = split_sentences("Первое. Второе предложение!\nАбзац без точки\n\n«Цитата» в конце.")
+    assert sentences == ["Первое.", "Второе предложение!", "Абзац без точки", "«Цитата» в конце."]
+
+
+def test_textrank_matches_dense_pagerank():
+    sentences = split_sentences(TEXT)
+    scores = textrank_scores(sentences)
+
+    # Разница - только из-за допуска сходимости
+    assert np.allclose(scores, _dense_textrank(sentences), atol=1e-4)
+    assert abs(scores.sum() - 1.0) < 1e-6
+    # Предложения про модель и документы связаны между собой, остальные - ни с чем
+    assert set(np.argsort(-scores)[:3]) == {0, 1, 3}
+    assert scores[2] == scores[4] < scores.min() + 1e-9
+
+
+def test_textrank_degenerate_inputs():
+    assert textrank_scores([]).shape == (0,)
+    assert textrank_scores(["Одно предложение."]).tolist() == [1.0]
+    # Без общих терминов все предложения равнозначны
+    scores = textrank_scores(["Кошка спит.", "Погода солнечная.", "Поезд ушёл."])
+    assert np.allclose(scores, 1 / 3)
+
+
+def test_select_salient_respects_budget_and_order():
+    count_words = lambda sentences: [len(s.split()) for s in sentences]
+    assert select_salient(TEXT, 1000, count_words) is None
+
+    selected = select_salient(TEXT, 14, count_words)
+    assert sum(count_words(split_sentences(selected))) <= 14
+    sentences = split_sentences(TEXT)
+    positions = [sentences.index(s) for s in split_sentences(selected)]
+    assert positions == sorted(positions)
+
+
+def test_prefilter_skips_short_text():
+    assert prefilter_for_model("Короткий текст.", tokenizer=None, max_input_tokens=1024) is None
+
+
+def test_extractive_summarizer_word_limits():
+    summary = ExtractiveSummarizer().summarize(TEXT, min_words=5, max_words=15)
+    assert 5 <= len(summary.split()) <= 15
+    assert "модель" in summary.lower()
+    assert ExtractiveSummarizer().summarize("", 5, 15) == ""
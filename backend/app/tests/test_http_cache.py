@@ -0,0 +1,128 @@
+import asyncio
+import gzip
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from bson import ObjectId
+from starlette.requests import Request
+
+from backend.app.api import http_cache
+from backend.app.api.http_cache import (
+    CACHE_IMMUTABLE, CACHE_REVALIDATE, BodyCache, _accepted_encoding, conditional_json, http_date, is_not_modified,
+    make_etag
+)
+from backend.app.api.routes.summaries import _summary_response
+from backend.app.config import settings
+
+ETAG = make_etag("doc", 1)
+MODIFIED = datetime(2026, 3, 1, 12, 0, 0, 500000)
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+@pytest.fixture(autouse=True)
+def _fresh_body_cache(monkeypatch):
+    monkeypatch.setattr(http_cache, "body_cache", BodyCache(1024 * 1024))
+
+
+def test_if_none_match_takes_precedence():
+    stale = http_date(datetime(2020, 1, 1))
+    fresh = http_date(MODIFIED)
+    assert is_not_modified(_request(if_none_match=ETAG, if_modified_since=stale), ETAG, MODIFIED)
+    # ETag не совпал - If-Modified-Since уже не смотрим
+    assert not is_not_modified(_request(if_none_match='"other"', if_modified_since=fresh), ETAG, MODIFIED)
+
+
+def test_if_none_match_weak_list_and_star():
+    assert is_not_modified(_request(if_none_match=f'"a", W/{ETAG}'), ETAG, None)
+    assert is_not_modified(_request(if_none_match="*"), ETAG, None)
+    assert not is_not_modified(_request(if_none_match='"a"'), ETAG, None)
+
+
+def test_if_modified_since_second_precision():
+    # В заголовке нет долей секунды: изменение в ту же секунду - не изменение
+    assert is_not_modified(_request(if_modified_since=http_date(MODIFIED)), ETAG, MODIFIED)
+    earlier = http_date(MODIFIED - timedelta(seconds=1))
+    assert not is_not_modified(_request(if_modified_since=earlier), ETAG, MODIFIED)
+    assert not is_not_modified(_request(if_modified_since="not a date"), ETAG, MODIFIED)
+    assert not is_not_modified(_request(if_modified_since=http_date(MODIFIED)), ETAG, None)
+
+
+def test_accepted_encoding(monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", SimpleNamespace(compress=lambda body, quality: body))
+    assert _accepted_encoding(_request(accept_encoding="gzip, br")) == "br"
+    assert _accepted_encoding(_request(accept_encoding="gzip, br;q=0")) == "gzip"
+    assert _accepted_encoding(_request(accept_encoding="gzip; q=0.0")) is None
+    assert _accepted_encoding(_request()) is None
+
+    # Без пакета brotli - gzip, даже если клиент предпочитает br
+    monkeypatch.setattr(http_cache, "brotli", None)
+    assert _accepted_encoding(_request(accept_encoding="br, gzip")) == "gzip"
+    assert _accepted_encoding(_request(accept_encoding="br")) is None
+
+
+def test_body_cache_evicts_by_bytes():
+    cache = BodyCache(max_bytes=10)
+    cache.put(("a", None), b"1234", None)
+    cache.put(("b", None), b"1234", None)
+    cache.get(("a", None))
+    cache.put(("c", None), b"1234", None)
+
+    assert cache.get(("b", None)) is None
+    assert cache.get(("a", None)) and cache.get(("c", None))
+    assert cache.size_bytes == 8
+    # Больше лимита целиком - не кэшируется
+    cache.put(("d", None), b"x" * 11, None)
+    assert cache.get(("d", None)) is None and cache.size_bytes == 8
+
+
+def _respond(request, content, immutable=False):
+    return asyncio.run(conditional_json(request, ETAG, lambda: content, MODIFIED, immutable=immutable))
+
+
+def test_not_modified_has_same_validators():
+    content = {"text": "x" * 10}
+    full = _respond(_request(), content, immutable=True)
+    not_modified = _respond(_request(if_none_match=ETAG), content, immutable=True)
+
+    assert (full.status_code, not_modified.status_code) == (200, 304)
+    assert not_modified.body == b""
+    for header in ("etag", "cache-control", "vary", "last-modified"):
+        assert not_modified.headers[header] == full.headers[header]
+    assert full.headers["cache-control"] == CACHE_IMMUTABLE
+    assert _respond(_request(), content).headers["cache-control"] == CACHE_REVALIDATE
+
+
+def test_compression_threshold(monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    small = _respond(_request(accept_encoding="gzip"), {"text": "x"})
+    assert "content-encoding" not in small.headers
+    assert orjson.loads(small.body) == {"text": "x"}
+
+    content = {"text": "y" * settings.HTTP_COMPRESSION_MIN_BYTES}
+    large = _respond(_request(accept_encoding="gzip"), content)
+    assert large.headers["content-encoding"] == "gzip"
+    assert orjson.loads(gzip.decompress(large.body)) == content
+
+
+def test_summary_etag_changes_with_status():
+    summary = SimpleNamespace(
+        id=ObjectId(), document_id="doc", method="m", params={}, summary_text=None,
+        created_at=datetime(2026, 1, 1), finished_at=None, status="queued", error_message=None, generation_info=None
+    )
+    etags = []
+    for status, finished_at in (("queued", None), ("running", None), ("done", datetime(2026, 1, 1, 0, 1))):
+        summary.status, summary.finished_at = status, finished_at
+        response = asyncio.run(_summary_response(_request(), summary))
+        etags.append(response.headers["etag"])
+        # Клиент с ETag прошлого статуса получает новое тело, а не 304
+        if len(etags) > 1:
+            stale = asyncio.run(_summary_response(_request(if_none_match=etags[-2]), summary))
+            assert stale.status_code == 200
+    assert len(set(etags)) == 3
+    assert response.headers["cache-control"] == CACHE_IMMUTABLE
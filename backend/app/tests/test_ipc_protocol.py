@@ -0,0 +1,119 @@
+import asyncio
+from multiprocessing import resource_tracker
+
+import pytest
+
+from backend.app.core.errors import SummarizationError
+from backend.app.domain.entities import SummarizationResult
+from backend.app.infrastructure.database.models import TokenIdsCache
+from backend.app.infrastructure.summarization import ipc_protocol as proto
+from backend.app.infrastructure.summarization.remote_gateway import RemoteSummarizationGateway
+
+
+def _request(text: str = "Текст документа") -> proto.SummarizeRequest:
+    return proto.SummarizeRequest(
+        text=text,
+        min_length=30,
+        max_length=150,
+        profile="balanced",
+        max_latency_ms=2000,
+        method="mbart",
+        token_ids=TokenIdsCache(key="tok:1024", dtype="uint16", data=b"\x01\x00\x02\x00"),
+        strategy="chunked",
+        reused_chunks={"hash": "Суммаризация чанка"},
+    )
+
+
+def test_request_round_trip():
+    request = _request()
+    flags, payload = proto.encode_request(request)
+    assert flags == 0
+    assert proto.decode_request(flags, payload) == request
+
+
+def test_request_defaults_round_trip():
+    request = proto.SummarizeRequest(text="", min_length=1, max_length=2)
+    assert proto.decode_request(*proto.encode_request(request)) == request
+
+
+def test_request_text_in_shared_memory():
+    request = _request("Длинный текст " * 1000)
+    shm, size = proto.write_shared_text(request.text)
+    try:
+        flags, payload = proto.encode_request(request, shm_name=shm.name, shm_size=size)
+        assert flags & proto.FLAG_TEXT_SHM
+        assert len(payload) < 1024
+        assert proto.decode_request(flags, payload) == request
+    finally:
+        # read_shared_text снимает сегмент с учёта, как в процессе сервера; здесь это процесс-владелец
+        resource_tracker.register(shm._name, "shared_memory")
+        shm.close()
+        shm.unlink()
+
+
+def test_result_and_error_round_trip():
+    result = SummarizationResult(
+        text="Итог", generation_info={"profile": "fast", "latency_ms": 12.5}, chunk_summaries={"h": "т"}
+    )
+    assert proto.decode_result(proto.encode_result(result)) == result
+    assert proto.decode_error(proto.encode_error("Ошибка модели")) == "Ошибка модели"
+
+
+def test_frame_round_trip_and_version_check():
+    async def scenario():
+        reader = asyncio.StreamReader()
+        header = proto.HEADER.pack(proto.PROTOCOL_VERSION, proto.MSG_RESULT, 0, 7, 3)
+        reader.feed_data(header + b"abc")
+        assert await proto.read_frame(reader) == (proto.MSG_RESULT, 0, 7, b"abc")
+
+        reader.feed_data(proto.HEADER.pack(proto.PROTOCOL_VERSION + 1, proto.MSG_RESULT, 0, 8, 0))
+        with pytest.raises(proto.ProtocolError):
+            await proto.read_frame(reader)
+
+    asyncio.run(scenario())
+
+
+async def _serve(path: str, drop_first: bool):
+    """Сервер модели-заглушка: отвечает текстом запроса в верхнем регистре; первое соединение рвёт."""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                _, flags, request_id, payload = await proto.read_frame(reader)
+                if drop_first and len(connections) == 1:
+                    writer.close()
+                    return
+                request = proto.decode_request(flags, payload)
+                result = SummarizationResult(text=request.text.upper())
+                proto.write_frame(writer, proto.MSG_RESULT, request_id, proto.encode_result(result))
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    return await asyncio.start_unix_server(handle, path)
+
+
+def test_reconnect_after_connection_drop(tmp_path):
+    path = str(tmp_path / "model.sock")
+
+    async def scenario():
+        server = await _serve(path, drop_first=True)
+        gateway = RemoteSummarizationGateway(path)
+        try:
+            with pytest.raises(SummarizationError):
+                await gateway.summarize("первый", 1, 10)
+            first = gateway._connection
+
+            # Новое соединение не закрывается задачей чтения старого
+            assert await gateway.summarize("второй", 1, 10) == SummarizationResult(text="ВТОРОЙ")
+            await asyncio.wait_for(first.reader_task, 1)
+            assert gateway._connection is not first
+            assert gateway._connection.is_open()
+            assert await gateway.summarize("третий", 1, 10) == SummarizationResult(text="ТРЕТИЙ")
+        finally:
+            await gateway.close()
+            server.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+import torch
+
+from backend.app.infrastructure.summarization import model_registry
+from backend.app.infrastructure.summarization.model_registry import (
+    KIND_EXTRACTIVE, ModelRegistry, ModelSpec, estimate_model_bytes
+)
+
+MB = 1024 * 1024
+
+
+class _FakeModel(torch.nn.Module):
+    def __init__(self, size_mb: int):
+        super().__init__()
+        self.weight = torch.nn.Parameter(torch.zeros(size_mb * MB // 4))
+
+
+def _registry(sizes_mb, **kwargs) -> ModelRegistry:
+    specs = {method: ModelSpec(method=method, model_name=method) for method in sizes_mb}
+    specs["textrank"] = ModelSpec(method="textrank", model_name="", kind=KIND_EXTRACTIVE)
+    registry = ModelRegistry(specs, device="cpu", **kwargs)
+    registry.loads = []
+    registry._tokenizer_for = lambda spec: object()
+
+    def load_seq2seq(model_name):
+        registry.loads.append(model_name)
+        return _FakeModel(sizes_mb[model_name])
+
+    registry._load_seq2seq = load_seq2seq
+    return registry
+
+
+# Оценки размеров по имени модели вместо обращения к HF
+_ESTIMATES = {}
+
+
+@pytest.fixture(autouse=True)
+def _estimates(monkeypatch):
+    _ESTIMATES.clear()
+    monkeypatch.setattr(model_registry, "estimate_model_bytes", lambda name: _ESTIMATES.get(name, 0))
+
+
+def test_lru_eviction_by_count():
+    registry = _registry({"a": 1, "b": 1, "c": 1}, max_resident=2)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+
+    assert registry.resident_methods() == ["a", "c"]
+    assert registry.loads == ["a", "b", "c"]
+
+
+def test_memory_budget_evicts_before_load():
+    _ESTIMATES.update({"big": 6 * MB, "small": 3 * MB, "other": 3 * MB})
+    registry = _registry({"big": 6, "small": 3, "other": 3}, max_resident=5, memory_budget_mb=8)
+    registry.get("small")
+    registry.get("other")
+
+    resident_during_load = []
+    load = registry._load_seq2seq
+
+    def load_seq2seq(model_name):
+        resident_during_load.append(registry.resident_methods())
+        return load(model_name)
+
+    registry._load_seq2seq = load_seq2seq
+    registry.get("big")
+
+    # Обе модели выгружены до загрузки: 3 + 3 + 6 > 8, 3 + 6 > 8
+    assert resident_during_load == [[]]
+    assert registry.resident_methods() == ["big"]
+
+
+def test_idle_models_are_unloaded():
+    registry = _registry({"a": 1, "b": 1}, max_resident=2, idle_ttl_s=60)
+    registry.get("a").last_used -= 120
+    registry.get("b")
+    assert registry.resident_methods() == ["b"]
+
+
+def test_idle_sweep_unloads_without_get():
+    registry = _registry({"a": 1}, idle_ttl_s=60)
+    registry.get("a").last_used -= 120
+    registry.start_idle_sweep(interval_s=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while registry.resident_methods() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        registry.stop_idle_sweep()
+    assert registry.resident_methods() == []
+
+
+def test_extractive_method_does_not_take_a_slot():
+    registry = _registry({"a": 1}, max_resident=1)
+    registry.get("a")
+    assert registry.get("textrank").model is not None
+    assert registry.resident_methods() == ["a"]
+
+
+def test_load_runs_outside_lock_and_is_shared():
+    registry = _registry({"a": 1, "b": 1}, max_resident=2)
+    registry.get("a")
+
+    started, release = threading.Event(), threading.Event()
+
+    def slow_on_load(loaded):
+        started.set()
+        release.wait(5)
+
+    registry.on_load = slow_on_load
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("b"))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+
+    # Загруженная модель выдаётся, пока другая загружается и прогревается
+    begin = time.monotonic()
+    registry.get("a")
+    assert time.monotonic() - begin < 1
+    assert "b" not in registry.resident_methods()
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert registry.loads == ["a", "b"]
+    assert len({id(entry) for entry in results}) == 1
+
+
+def test_failed_load_is_reported_and_retried():
+    registry = _registry({"a": 1}, max_resident=1)
+    calls = []
+
+    def failing_on_load(loaded):
+        calls.append(loaded)
+        if len(calls) == 1:
+            raise RuntimeError("warmup failed")
+
+    registry.on_load = failing_on_load
+    with pytest.raises(RuntimeError):
+        registry.get("a")
+    assert registry.resident_methods() == []
+    assert registry.get("a") is calls[-1]
+
+
+def test_estimate_from_local_checkpoint(tmp_path):
+    (tmp_path / "model.safetensors").write_bytes(b"x" * 100)
+    (tmp_path / "pytorch_model.bin").write_bytes(b"x" * 1000)
+    assert estimate_model_bytes(str(tmp_path)) == 100
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+
+from backend.app.infrastructure.database.models import DocumentModel, SummaryModel
+from backend.app.services import search as search_service
+from backend.app.services.search import make_snippet
+
+
+def _marked(snippet, highlights):
+    return [snippet[start:end] for start, end in highlights]
+
+
+def test_snippet_highlights_word_forms():
+    snippet, highlights = make_snippet("Модели суммаризации: модель сжимает текст.", "модель")
+    assert snippet == "Модели суммаризации: модель сжимает текст."
+    assert _marked(snippet, highlights) == ["Модели", "модель"]
+
+
+def test_snippet_window_around_first_match():
+    text = "вступление " * 60 + "ключевое слово здесь " + "заключение " * 60
+    snippet, highlights = make_snippet(text, "ключевое", width=120)
+
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert len(snippet) <= 122
+    # Смещения - внутри сниппета, с учётом префикса «…»
+    assert _marked(snippet, highlights) == ["ключевое"]
+    assert not snippet[1:].startswith(" ")
+
+
+def test_snippet_ignores_excluded_words_and_empty_query():
+    snippet, highlights = make_snippet("кошки и собаки", "кошки -собаки")
+    assert _marked(snippet, highlights) == ["кошки"]
+    assert make_snippet("текст", "-все") == ("текст", [])
+
+
+class _Cursor:
+    def __init__(self, records):
+        self.records = records
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, count):
+        return _Cursor(self.records[:count])
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for record in self.records:
+            yield record
+
+
+class _TextCollection:
+    """Коллекция с готовыми результатами $text, уже упорядоченными по textScore."""
+
+    def __init__(self, records):
+        self.records = records
+        self.counted = []
+
+    def find(self, query, projection):
+        if "$text" in query:
+            return _Cursor(self.records)
+        ids = query["_id"]["$in"]
+        return _Cursor([record for record in self.records if record["_id"] in ids])
+
+    async def count_documents(self, query, limit=0):
+        self.counted.append(limit)
+        return min(len(self.records), limit) if limit else len(self.records)
+
+
+def _documents(scores):
+    return [
+        {"_id": ObjectId(), "score": score, "title": f"Документ {i}", "uploaded_at": datetime(2026, 1, 1),
+         "parsed_text": "Текст про поиск документов"}
+        for i, score in enumerate(scores)
+    ]
+
+
+def _summaries(scores):
+    return [
+        {"_id": ObjectId(), "score": score, "document_id": "doc", "created_at": datetime(2026, 1, 2),
+         "summary_text": "Итог про поиск"}
+        for score in scores
+    ]
+
+
+def _patch(monkeypatch, documents, summaries):
+    monkeypatch.setattr(DocumentModel, "get_motor_collection", classmethod(lambda cls: documents))
+    monkeypatch.setattr(SummaryModel, "get_motor_collection", classmethod(lambda cls: summaries))
+
+
+def test_scores_are_normalized_per_collection(monkeypatch):
+    # У документов textScore выше из-за веса title, но это не делает их релевантнее
+    documents = _TextCollection(_documents([12.0, 6.0]))
+    summaries = _TextCollection(_summaries([1.5, 1.2]))
+    _patch(monkeypatch, documents, summaries)
+
+    total, exact, page = asyncio.run(search_service.search("поиск", "all", limit=4, offset=0))
+
+    assert (total, exact) == (4, True)
+    assert [(hit.kind, round(hit.score, 2)) for hit in page] == [
+        ("document", 1.0), ("summary", 1.0), ("summary", 0.8), ("document", 0.5)
+    ]
+    assert page[0].snippet and page[0].highlights
+    # Страница не заполнена - точное число известно без подсчёта
+    assert documents.counted == [] and summaries.counted == []
+
+
+def test_count_is_capped(monkeypatch):
+    monkeypatch.setattr(search_service, "COUNT_LIMIT", 5)
+    documents = _TextCollection(_documents([float(score) for score in range(20, 0, -1)]))
+    summaries = _TextCollection([])
+    _patch(monkeypatch, documents, summaries)
+
+    total, exact, page = asyncio.run(search_service.search("поиск", "documents", limit=2, offset=2))
+
+    assert (total, exact) == (5, False)
+    assert documents.counted == [5]
+    assert [round(hit.score, 2) for hit in page] == [0.9, 0.85]
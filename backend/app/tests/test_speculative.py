@@ -0,0 +1,95 @@
+from collections import defaultdict
+from types import SimpleNamespace
+
+import torch
+from transformers import MBartConfig, MBartForConditionalGeneration
+
+from backend.app.infrastructure.summarization.decoding import LatencyEstimator, get_profile
+from backend.app.infrastructure.summarization.mbart_gateway import SummarizationGateway
+from backend.app.infrastructure.summarization.model_registry import LoadedModel, ModelRegistry, ModelSpec
+from backend.app.infrastructure.summarization.speculative import SpeculativeStats, supports_speculative
+
+
+def _tiny_model(vocab_size: int = 64, seed: int = 0) -> MBartForConditionalGeneration:
+    torch.manual_seed(seed)
+    config = MBartConfig(
+        vocab_size=vocab_size, d_model=16, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32,
+        max_position_embeddings=64, pad_token_id=1, decoder_start_token_id=2,
+    )
+    return MBartForConditionalGeneration(config).eval()
+
+
+def test_supports_speculative_only_for_greedy():
+    assert supports_speculative(get_profile("fast"))
+    assert not supports_speculative(get_profile("quality"))
+    assert not supports_speculative(get_profile("no_repeat"))
+
+
+def test_stats_metrics():
+    stats = SpeculativeStats(_tiny_model(), _tiny_model(seed=1))
+    stats._calls.update(target=4, draft=10)
+
+    # 10 токенов за 4 прохода основной модели: 6 из 10 предложенных приняты
+    assert stats.metrics(generated_tokens=10) == {
+        "speculative": True,
+        "draft_tokens": 10,
+        "accepted_tokens": 6,
+        "target_forward_passes": 4,
+        "acceptance_rate": 0.6,
+        "tokens_per_target_pass": 2.5,
+    }
+    stats._calls.update(target=0, draft=0)
+    assert stats.metrics(generated_tokens=0)["acceptance_rate"] == 0.0
+
+
+def _gateway(loaded: LoadedModel) -> SummarizationGateway:
+    gateway = SummarizationGateway.__new__(SummarizationGateway)
+    gateway.device = "cpu"
+    gateway.encoder_cache = None
+    gateway.registry = SimpleNamespace(get=lambda method: loaded)
+    gateway._latency_estimators = defaultdict(LatencyEstimator)
+    input_ids = torch.tensor([[5, 9, 17, 33, 8, 41, 3]])
+    gateway._encode_input = lambda text, loaded, token_ids: (
+        input_ids, torch.ones_like(input_ids), {"token_ids_cached": False}
+    )
+    return gateway
+
+
+def test_draft_model_gives_greedy_output():
+    # "Текст" - id токенов, чтобы сравнивать выходы напрямую
+    tokenizer = SimpleNamespace(decode=lambda ids, **kwargs: ids.tolist())
+    draft = _tiny_model(seed=1)
+    draft.generation_config.num_assistant_tokens = 3
+    draft.generation_config.num_assistant_tokens_schedule = "constant"
+    loaded = LoadedModel(
+        spec=ModelSpec(method="tiny", model_name="tiny"), model=_tiny_model(), tokenizer=tokenizer,
+        memory_bytes=0, last_used=0.0, draft_model=draft
+    )
+    gateway = _gateway(loaded)
+
+    assisted = gateway._blocking_summarize("", 5, 20, profile="fast")
+    loaded.draft_model = None
+    greedy = gateway._blocking_summarize("", 5, 20, profile="fast")
+
+    assert assisted.text == greedy.text
+    assert assisted.generation_info["speculative"] is True
+    assert assisted.generation_info["target_forward_passes"] > 0
+    assert "speculative" not in greedy.generation_info
+
+
+def test_draft_with_other_vocabulary_is_dropped():
+    registry = ModelRegistry(
+        {"m": ModelSpec(method="m", model_name="target", draft_model_name="draft")}, device="cpu"
+    )
+    registry._tokenizer_for = lambda spec: object()
+    models = {"target": _tiny_model(vocab_size=64), "draft": _tiny_model(vocab_size=80)}
+    registry._load_seq2seq = models.__getitem__
+
+    loaded = registry.get("m")
+    assert loaded.draft_model is None
+    assert loaded.model is models["target"]
+
+    registry.evict("m")
+    models["draft"] = _tiny_model(vocab_size=64, seed=1)
+    assert registry.get("m").draft_model is models["draft"]
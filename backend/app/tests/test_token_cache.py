@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from backend.app.config import settings
+from backend.app.infrastructure.database.models import DocumentModel
+from backend.app.infrastructure.summarization.mbart_gateway import SummarizationGateway
+from backend.app.infrastructure.summarization.model_registry import LoadedModel, ModelSpec
+from backend.app.infrastructure.summarization.token_cache import (
+    cache_key, from_transport, pack_ids, to_transport, unpack_ids
+)
+from backend.app.services import document_processing
+
+SPEC = ModelSpec(method="m", model_name="model", max_input_tokens=16)
+
+
+@pytest.fixture(autouse=True)
+def _no_prefilter(monkeypatch):
+    # Ключ кэша зависит от режима пре-фильтра: фиксируем его до расчёта ключей
+    monkeypatch.setattr(settings, "EXTRACTIVE_PREFILTER", False)
+
+
+def test_pack_unpack_roundtrip_and_dtype():
+    ids = [0, 5, 65535]
+    small = pack_ids(ids, "k", vocab_size=65536)
+    assert small.dtype == "uint16" and len(small.data) == 2 * len(ids)
+    assert unpack_ids(small).tolist() == [ids]
+    assert unpack_ids(small).dtype == torch.int64
+
+    # На границе 65536 id уже не помещается в uint16
+    large = pack_ids(ids + [65536], "k", vocab_size=65537)
+    assert large.dtype == "int32"
+    assert unpack_ids(large).tolist() == [ids + [65536]]
+
+
+def test_transport_roundtrip():
+    cache = pack_ids([3, 70000, 2], "key", vocab_size=250027)
+    payload = to_transport(cache)
+    assert all(isinstance(value, str) for value in payload.values())
+    assert from_transport(payload) == cache
+    assert to_transport(None) is None and from_transport(None) is None
+
+
+class _Tokenizer:
+    pad_token_id = 1
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text, **kwargs):
+        self.calls.append(text)
+        ids = torch.tensor([[7, 8, 9]])
+        return {"input_ids": ids, "attention_mask": torch.ones_like(ids)}
+
+
+def _encode(token_ids):
+    gateway = SummarizationGateway.__new__(SummarizationGateway)
+    gateway.device = "cpu"
+    tokenizer = _Tokenizer()
+    loaded = LoadedModel(spec=SPEC, model=None, tokenizer=tokenizer, memory_bytes=0, last_used=0.0)
+    input_ids, attention_mask, info = gateway._encode_input("текст", loaded, token_ids)
+    return input_ids, attention_mask, info, tokenizer.calls
+
+
+def test_encode_input_uses_cache_with_matching_key():
+    cached = pack_ids([4, 5], cache_key(SPEC), vocab_size=100)
+    input_ids, attention_mask, info, calls = _encode(cached)
+
+    assert info == {"token_ids_cached": True} and calls == []
+    # Паддинг до корзины длины (вход модели - 16 токенов)
+    assert input_ids[0, :2].tolist() == [4, 5] and input_ids.shape[-1] == 16
+    assert attention_mask[0].sum().item() == 2
+
+
+def test_encode_input_retokenizes_on_key_mismatch():
+    stale = pack_ids([4, 5], "other-tokenizer|16|prefilter=0", vocab_size=100)
+    input_ids, _, info, calls = _encode(stale)
+    assert info["token_ids_cached"] is False and calls == ["текст"]
+    assert input_ids[0, :3].tolist() == [7, 8, 9]
+
+    *_, calls = _encode(None)
+    assert calls == ["текст"]
+
+
+class _Doc:
+    def __init__(self, text):
+        self.parsed_text = text
+        self.token_ids = None
+
+    async def set(self, values):
+        self.token_ids = values["token_ids"]
+
+
+class _Query:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def limit(self, count):
+        return _Query(self.docs[:count])
+
+    async def to_list(self):
+        return self.docs
+
+
+class _Encoder:
+    def __init__(self, fail_after):
+        self.registry = SimpleNamespace(get_spec=lambda method: SPEC)
+        self.method = "m"
+        self.batches = 0
+        self.fail_after = fail_after
+
+    def encode_batch(self, texts):
+        self.batches += 1
+        if self.batches > self.fail_after:
+            raise RuntimeError("tokenizer crashed")
+        return [pack_ids([1, 2], cache_key(SPEC), vocab_size=100) for _ in texts]
+
+
+def test_backfill_stops_on_tokenization_failure(monkeypatch):
+    docs = [_Doc(f"текст {i}") for i in range(5)]
+    key = cache_key(SPEC)
+    # Запрос - документы без кэша под текущий ключ
+    monkeypatch.setattr(DocumentModel, "find", lambda query: _Query(
+        [doc for doc in docs if doc.token_ids is None or doc.token_ids.key != key]
+    ), raising=False)
+    monkeypatch.setattr(DocumentModel, "token_ids", "token_ids", raising=False)
+
+    encoder = _Encoder(fail_after=1)
+    updated = asyncio.run(document_processing.backfill_token_ids(encoder, batch_size=2))
+
+    # Первая пачка сохранена, на второй - остановка, а не бесконечный повтор
+    assert updated == 2 and encoder.batches == 2
+    assert [doc.token_ids is not None for doc in docs] == [True, True, False, False, False]
+
+    encoder = _Encoder(fail_after=10)
+    assert asyncio.run(document_processing.backfill_token_ids(encoder, batch_size=2)) == 3
+    assert all(doc.token_ids.key == key for doc in docs)
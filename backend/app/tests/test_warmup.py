@@ -0,0 +1,73 @@
+import torch
+from transformers import MBartConfig, MBartForConditionalGeneration
+
+from backend.app.infrastructure.summarization import warmup
+from backend.app.infrastructure.summarization.model_registry import LoadedModel, ModelSpec
+
+
+def _tiny_loaded() -> LoadedModel:
+    config = MBartConfig(
+        vocab_size=64, d_model=16, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32,
+        max_position_embeddings=64, pad_token_id=1, decoder_start_token_id=2,
+    )
+    model = MBartForConditionalGeneration(config).eval()
+    return LoadedModel(
+        spec=ModelSpec(method="tiny", model_name="tiny"), model=model, tokenizer=None,
+        memory_bytes=0, last_used=0.0
+    )
+
+
+class _FailsOnCall(torch.nn.Module):
+    """Как torch.compile: обёртка создаётся, ошибка - при первом вызове."""
+
+    def __init__(self, module):
+        super().__init__()
+        self.module = module
+
+    def forward(self, *args, **kwargs):
+        raise RuntimeError("BackendCompilerFailed: simulated")
+
+
+def test_bucket_length_and_padding():
+    buckets = warmup.input_buckets(1024, [128, 256, 2048])
+    assert buckets == [128, 256, 1024]
+    assert warmup.bucket_length(5, buckets) == 128
+    assert warmup.bucket_length(300, buckets) == 1024
+
+    ids, mask = warmup.pad_to_bucket(torch.ones(1, 5, dtype=torch.long), torch.ones(1, 5, dtype=torch.long), [8], 1)
+    assert ids.shape == (1, 8)
+    assert mask[0].tolist() == [1] * 5 + [0] * 3
+
+
+def test_torch_compile_failure_falls_back_to_eager(monkeypatch, tmp_path):
+    loaded = _tiny_loaded()
+    decoder = loaded.model.get_decoder()
+    monkeypatch.setattr(torch, "compile", lambda module, **kwargs: _FailsOnCall(module))
+
+    warmup.compile_model(loaded, warmup.COMPILE_TORCH, [8, 16], str(tmp_path))
+
+    assert loaded.compiled_encoder is None
+    assert loaded.model.get_decoder() is decoder
+    # Модель рабочая в eager-режиме
+    output = loaded.model.generate(torch.ones(1, 8, dtype=torch.long), max_length=4)
+    assert output.shape[0] == 1
+
+
+def test_torchscript_compiles_each_bucket(tmp_path):
+    loaded = _tiny_loaded()
+    warmup.compile_model(loaded, warmup.COMPILE_TORCHSCRIPT, [8, 16], str(tmp_path))
+
+    assert loaded.compiled_encoder is not None
+    assert len(list(tmp_path.glob("encoder-*.pt"))) == 2
+    ids = torch.ones(1, 8, dtype=torch.long)
+    expected = loaded.model.get_encoder()(input_ids=ids, attention_mask=torch.ones_like(ids)).last_hidden_state
+    assert torch.allclose(loaded.compiled_encoder(ids, torch.ones_like(ids)), expected, atol=1e-5)
+    # Для формы без корзины - None (eager)
+    assert loaded.compiled_encoder(torch.ones(1, 9, dtype=torch.long), torch.ones(1, 9, dtype=torch.long)) is None
+
+
+def test_unknown_compile_mode_keeps_eager(tmp_path):
+    loaded = _tiny_loaded()
+    warmup.compile_model(loaded, "jit_magic", [8], str(tmp_path))
+    assert loaded.compiled_encoder is None
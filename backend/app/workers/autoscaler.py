@@ -0,0 +1,412 @@
+# backend/app/workers/autoscaler.py
+"""
+Супервизор воркеров суммаризации: следит за глубиной очереди и недавней
+латентностью задач и запускает/останавливает процессы воркеров в пределах
+min/max и бюджета памяти. Гистерезис (отдельные пороги и выдержка на рост
+и сокращение, пауза после каждого изменения) не даёт пулу «дребезжать».
+
+Запуск:
+    python -m backend.app.workers.autoscaler          # воркеры Celery, очередь в Redis
+    python -m backend.app.workers.autoscaler --demo   # локально: in-memory брокер и имитация задач
+"""
+import argparse
+import functools
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import random
+import signal
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Protocol
+
+from backend.app.config import settings
+
+log = logging.getLogger(__name__)
+
+QUEUE_NAME = "summarization"
+# Список последних латентностей задач (мс) в Redis, пишут воркеры
+LATENCY_KEY = "summarization:latency_ms"
+LATENCY_WINDOW = 50
+
+
+@dataclass
+class ScalingPolicy:
+    min_workers: int = 1
+    max_workers: int = 4
+    # Без латентности: сколько задач в очереди допустимо на одного воркера
+    queue_per_worker: float = 4.0
+    # С латентностью: целевое ожидание задачи в очереди
+    target_wait_ms: Optional[float] = None
+    # Сокращение, только если нужно меньше scale_down_ratio от текущего числа воркеров
+    scale_down_ratio: float = 0.5
+    # Сколько условие должно держаться, прежде чем пул изменится
+    scale_up_after_s: float = 10.0
+    scale_down_after_s: float = 60.0
+    # Пауза после любого изменения
+    cooldown_s: float = 30.0
+    # Оценка памяти воркера (пока нет измерений) и общий бюджет
+    worker_memory_mb: float = 1500.0
+    memory_budget_mb: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "ScalingPolicy":
+        return cls(
+            min_workers=settings.AUTOSCALER_MIN_WORKERS,
+            max_workers=settings.AUTOSCALER_MAX_WORKERS,
+            queue_per_worker=settings.AUTOSCALER_QUEUE_PER_WORKER,
+            target_wait_ms=settings.AUTOSCALER_TARGET_WAIT_MS,
+            scale_down_ratio=settings.AUTOSCALER_SCALE_DOWN_RATIO,
+            scale_up_after_s=settings.AUTOSCALER_SCALE_UP_AFTER_S,
+            scale_down_after_s=settings.AUTOSCALER_SCALE_DOWN_AFTER_S,
+            cooldown_s=settings.AUTOSCALER_COOLDOWN_S,
+            worker_memory_mb=settings.AUTOSCALER_WORKER_MEMORY_MB,
+            memory_budget_mb=settings.AUTOSCALER_MEMORY_BUDGET_MB,
+        )
+
+
+@dataclass
+class Metrics:
+    queue_depth: int
+    workers: int
+    latency_p50_ms: Optional[float] = None
+    # Максимальный RSS живых воркеров (если удалось измерить)
+    worker_memory_mb: Optional[float] = None
+
+
+class Autoscaler:
+    """Решает, сколько воркеров нужно, по метрикам очереди."""
+
+    def __init__(self, policy: ScalingPolicy, clock: Callable[[], float] = time.monotonic):
+        self.policy = policy
+        self._clock = clock
+        self._up_since: Optional[float] = None
+        self._down_since: Optional[float] = None
+        self._last_change: Optional[float] = None
+
+    def capacity(self, metrics: Metrics) -> int:
+        """max_workers, ограниченный бюджетом памяти."""
+        cap = self.policy.max_workers
+        if self.policy.memory_budget_mb:
+            per_worker = max(metrics.worker_memory_mb or 0, self.policy.worker_memory_mb)
+            cap = min(cap, int(self.policy.memory_budget_mb // per_worker))
+        return max(cap, self.policy.min_workers)
+
+    def needed_workers(self, metrics: Metrics) -> float:
+        """
+        Сколько воркеров нужно для текущей очереди: по целевому ожиданию
+        (очередь x латентность задачи), а без латентности - по задачам на воркера.
+        """
+        if self.policy.target_wait_ms and metrics.latency_p50_ms:
+            return metrics.queue_depth * metrics.latency_p50_ms / self.policy.target_wait_ms
+        return metrics.queue_depth / self.policy.queue_per_worker
+
+    def desired_workers(self, metrics: Metrics) -> int:
+        now = self._clock()
+        workers = metrics.workers
+        cap = self.capacity(metrics)
+
+        # Границы соблюдаются сразу, без выдержки
+        if workers < self.policy.min_workers or workers > cap:
+            return self._change(min(max(workers, self.policy.min_workers), cap), now)
+
+        needed = self.needed_workers(metrics)
+        want_up = needed > workers and workers < cap
+        want_down = needed < workers * self.policy.scale_down_ratio and workers > self.policy.min_workers
+
+        if not want_up:
+            self._up_since = None
+        elif self._up_since is None:
+            self._up_since = now
+        if not want_down:
+            self._down_since = None
+        elif self._down_since is None:
+            self._down_since = now
+
+        if self._last_change is not None and now - self._last_change < self.policy.cooldown_s:
+            return workers
+        if want_up and now - self._up_since >= self.policy.scale_up_after_s:
+            # Рост сразу до нужного числа, сокращение - по одному
+            return self._change(min(cap, max(workers + 1, math.ceil(needed))), now)
+        if want_down and now - self._down_since >= self.policy.scale_down_after_s:
+            return self._change(workers - 1, now)
+        return workers
+
+    def _change(self, desired: int, now: float) -> int:
+        self._last_change = now
+        self._up_since = None
+        self._down_since = None
+        return desired
+
+
+class QueueProbe(Protocol):
+    def queue_depth(self) -> int: ...
+
+    def recent_latencies_ms(self) -> List[float]: ...
+
+
+class RedisQueueProbe:
+    """Глубина очереди Celery (список в Redis) и латентности, которые пишут воркеры."""
+
+    def __init__(self, url: str, queue_name: str = QUEUE_NAME):
+        import redis  # зависимость celery[redis]
+
+        self._redis = redis.Redis.from_url(url)
+        self.queue_name = queue_name
+
+    def queue_depth(self) -> int:
+        return self._redis.llen(self.queue_name)
+
+    def recent_latencies_ms(self) -> List[float]:
+        return [float(value) for value in self._redis.lrange(LATENCY_KEY, 0, LATENCY_WINDOW - 1)]
+
+
+@functools.lru_cache(maxsize=None)
+def _redis_client(url: str):
+    """Один клиент (и пул соединений) на процесс; после fork пул redis-py пересоздаётся сам."""
+    import redis
+
+    return redis.Redis.from_url(url)
+
+
+def record_job_latency(redis_url: str, latency_ms: float) -> None:
+    """Вызывается воркером после задачи; ошибки не должны ронять задачу."""
+    try:
+        pipe = _redis_client(redis_url).pipeline()
+        pipe.lpush(LATENCY_KEY, latency_ms)
+        pipe.ltrim(LATENCY_KEY, 0, LATENCY_WINDOW - 1)
+        pipe.execute()
+    except Exception as e:
+        log.warning(f"Failed to record job latency: {e}")
+
+
+class InMemoryBroker:
+    """
+    Заменитель брокера для локальной проверки: очереди multiprocessing вместо Redis.
+    Глубина очереди - общий счётчик: Queue.qsize() не реализован на macOS.
+    """
+
+    def __init__(self, ctx=None):
+        ctx = ctx or multiprocessing.get_context()
+        self.jobs = ctx.Queue()
+        self.latencies = ctx.Queue()
+        # Увеличивает publish, уменьшает take
+        self.depth = ctx.Value("i", 0)
+        self._recent: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def publish(self, job_ms: float) -> None:
+        with self.depth.get_lock():
+            self.depth.value += 1
+        self.jobs.put(job_ms)
+
+    def take(self, timeout: float) -> float:
+        """Задача для воркера; queue.Empty, если очередь пуста дольше timeout."""
+        job_ms = self.jobs.get(timeout=timeout)
+        with self.depth.get_lock():
+            self.depth.value -= 1
+        return job_ms
+
+    def report_latency(self, latency_ms: float) -> None:
+        self.latencies.put(latency_ms)
+
+    def queue_depth(self) -> int:
+        return self.depth.value
+
+    def recent_latencies_ms(self) -> List[float]:
+        while True:
+            try:
+                self._recent.append(self.latencies.get_nowait())
+            except queue.Empty:
+                break
+        return list(self._recent)
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class LocalProcessPool:
+    """
+    Процессы воркеров на этой машине. Каждому выдаётся свободный номер слота
+    0..max_workers-1 (по нему воркер берёт свою долю ядер, см. InferencePolicy).
+    Останавливаются по SIGTERM: воркер доделывает текущую задачу.
+    """
+
+    def __init__(self, target: Callable[[int], None], ctx=None, stop_timeout_s: float = 120.0):
+        self.target = target
+        self.ctx = ctx or multiprocessing.get_context()
+        self.stop_timeout_s = stop_timeout_s
+        self._workers: Dict[int, multiprocessing.Process] = {}
+        self._retiring: List[multiprocessing.Process] = []
+
+    def _reap(self) -> None:
+        for index, process in list(self._workers.items()):
+            if not process.is_alive():
+                log.warning(f"Worker {index} (pid {process.pid}) exited with code {process.exitcode}")
+                del self._workers[index]
+        self._retiring = [process for process in self._retiring if process.is_alive()]
+
+    def size(self) -> int:
+        self._reap()
+        return len(self._workers)
+
+    def spawn(self) -> None:
+        index = next(i for i in range(len(self._workers) + 1) if i not in self._workers)
+        process = self.ctx.Process(target=self.target, args=(index,), name=f"summarization-worker-{index}")
+        process.start()
+        self._workers[index] = process
+        log.info(f"Worker {index} started (pid {process.pid})")
+
+    def retire(self) -> None:
+        index = max(self._workers)
+        process = self._workers.pop(index)
+        process.terminate()
+        self._retiring.append(process)
+        log.info(f"Worker {index} (pid {process.pid}) is finishing its current job and stopping")
+
+    def memory_mb(self) -> Optional[float]:
+        usage = [_rss_mb(process.pid) for process in self._workers.values()]
+        usage = [mb for mb in usage if mb is not None]
+        return max(usage) if usage else None
+
+    def shutdown(self) -> None:
+        while self._workers:
+            self.retire()
+        for process in self._retiring:
+            process.join(self.stop_timeout_s)
+            if process.is_alive():
+                process.kill()
+        self._retiring.clear()
+
+
+class Supervisor:
+    """Цикл: метрики -> решение автоскейлера -> изменение пула."""
+
+    def __init__(self, probe: QueueProbe, pool: LocalProcessPool, autoscaler: Autoscaler, interval_s: float = 5.0):
+        self.probe = probe
+        self.pool = pool
+        self.autoscaler = autoscaler
+        self.interval_s = interval_s
+
+    def collect_metrics(self) -> Metrics:
+        latencies = self.probe.recent_latencies_ms()
+        return Metrics(
+            queue_depth=self.probe.queue_depth(),
+            workers=self.pool.size(),
+            latency_p50_ms=statistics.median(latencies) if latencies else None,
+            worker_memory_mb=self.pool.memory_mb(),
+        )
+
+    def step(self) -> Metrics:
+        metrics = self.collect_metrics()
+        desired = self.autoscaler.desired_workers(metrics)
+        if desired != metrics.workers:
+            log.info(
+                f"Scaling {metrics.workers} -> {desired} workers "
+                f"(queue={metrics.queue_depth}, latency_p50_ms={metrics.latency_p50_ms})"
+            )
+        while self.pool.size() < desired:
+            self.pool.spawn()
+        while self.pool.size() > desired:
+            self.pool.retire()
+        return metrics
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                self.step()
+                stop.wait(self.interval_s)
+        finally:
+            self.pool.shutdown()
+
+
+def run_celery_worker(index: int, max_workers: int) -> None:
+    """
+    Процесс воркера Celery с одним слотом инференса (pool=solo: задача
+    выполняется в этом же процессе). Доля ядер - по номеру слота.
+    """
+    settings.INFERENCE_PROCESSES = max_workers
+    settings.INFERENCE_PROCESS_INDEX = index
+    from backend.app.workers.summarization_worker import celery_app
+
+    celery_app.worker_main([
+        "worker", "--loglevel=info", "--pool=solo",
+        "-Q", QUEUE_NAME, "-n", f"autoscaled-{index}@%h",
+    ])
+
+
+def _demo_worker(index: int, broker: InMemoryBroker) -> None:
+    """Имитация воркера: «задача» - пауза заданной длительности."""
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    while not stopping.is_set():
+        try:
+            job_ms = broker.take(timeout=0.2)
+        except queue.Empty:
+            continue
+        time.sleep(job_ms / 1000)
+        broker.report_latency(job_ms)
+
+
+def _demo(duration_s: float) -> None:
+    """Всплеск нагрузки, затем тишина: пул растёт и постепенно сокращается."""
+    broker = InMemoryBroker()
+    policy = ScalingPolicy(
+        min_workers=1, max_workers=4, target_wait_ms=2000,
+        scale_up_after_s=1, scale_down_after_s=3, cooldown_s=2,
+    )
+    pool = LocalProcessPool(functools.partial(_demo_worker, broker=broker))
+    supervisor = Supervisor(broker, pool, Autoscaler(policy), interval_s=0.5)
+
+    stop = threading.Event()
+    thread = threading.Thread(target=supervisor.run, args=(stop,))
+    thread.start()
+    started = time.monotonic()
+    try:
+        while time.monotonic() - started < duration_s:
+            if time.monotonic() - started < duration_s / 3:
+                for _ in range(3):
+                    broker.publish(random.uniform(200, 400))
+            log.info(f"queue={broker.queue_depth()} workers={pool.size()}")
+            time.sleep(0.25)
+    finally:
+        stop.set()
+        thread.join()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--demo", action="store_true", help="in-memory брокер и имитация задач")
+    parser.add_argument("--duration", type=float, default=30.0, help="длительность демо, с")
+    args = parser.parse_args()
+
+    if args.demo:
+        _demo(args.duration)
+    else:
+        policy = ScalingPolicy.from_settings(settings)
+        # spawn: не наследовать потоки супервизора через fork
+        pool = LocalProcessPool(
+            functools.partial(run_celery_worker, max_workers=policy.max_workers),
+            ctx=multiprocessing.get_context("spawn"),
+        )
+        probe = RedisQueueProbe(os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"))
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        try:
+            Supervisor(probe, pool, Autoscaler(policy), settings.AUTOSCALER_INTERVAL_S).run(stop)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,208 @@
+# backend/app/workers/model_server.py
+"""
+Локальный сервер модели: один процесс держит модели и слоты инференса,
+любое число воркеров uvicorn обращается к нему по Unix-сокету
+(протокол - см. ipc_protocol) и делит с остальными общую очередь.
+
+Очередь собирает запросы в пачки: запросы с одинаковыми методом, профилем и
+длинами идут одним generate. Пока все слоты инференса заняты, новые запросы
+копятся, поэтому под нагрузкой пачки растут сами.
+
+Запуск:
+    python -m backend.app.workers.model_server
+(API подключается, если задан MODEL_SERVER_SOCKET)
+"""
+import asyncio
+import logging
+import os
+import signal
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from backend.app.config import settings
+from backend.app.infrastructure.summarization import ipc_protocol as proto
+from backend.app.infrastructure.summarization.chunking import STRATEGY_CHUNKED
+from backend.app.infrastructure.summarization.mbart_gateway import SummarizationGateway
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pending:
+    request: proto.SummarizeRequest
+    future: asyncio.Future
+
+
+def _batch_key(request: proto.SummarizeRequest):
+    """
+    Запросы с одинаковым ключом можно считать одним generate; None -
+    запрос выполняется отдельно (бюджет латентности, map-reduce).
+    """
+    if request.max_latency_ms or request.strategy == STRATEGY_CHUNKED:
+        return None
+    return request.method, request.profile, request.min_length, request.max_length
+
+
+class BatchingQueue:
+    """Общая очередь запросов всех подключений; пачки исполняются в слотах gateway."""
+
+    def __init__(self, gateway: SummarizationGateway, max_batch: int, wait_ms: float):
+        self.gateway = gateway
+        self.max_batch = max_batch
+        self.wait_s = wait_ms / 1000
+        self._queue: "asyncio.Queue[_Pending]" = asyncio.Queue()
+        # Не больше пачек в работе, чем слотов инференса
+        self._slots = asyncio.Semaphore(gateway.executor.policy.slots)
+
+    def submit(self, request: proto.SummarizeRequest) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Pending(request, future))
+        return future
+
+    async def _collect(self) -> List[_Pending]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.wait_s
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0 and self._queue.empty():
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), max(timeout, 0)))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            items = await self._collect()
+
+            groups: Dict[Tuple, List[_Pending]] = defaultdict(list)
+            singles = []
+            for item in items:
+                key = _batch_key(item.request)
+                if key is None:
+                    singles.append(item)
+                else:
+                    groups[key].append(item)
+            # Слот освобождается, когда закончены все части пачки
+            jobs = [self._run_group(group) for group in groups.values()]
+            jobs += [self._run_single(item) for item in singles]
+            task = asyncio.ensure_future(asyncio.gather(*jobs))
+            task.add_done_callback(lambda _: self._slots.release())
+
+    async def _run_group(self, group: List[_Pending]) -> None:
+        first = group[0].request
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self.gateway.executor,
+                self.gateway._blocking_summarize_batch,
+                [item.request.text for item in group],
+                first.min_length,
+                first.max_length,
+                first.profile,
+                first.method,
+                [item.request.token_ids for item in group],
+            )
+        except Exception as e:
+            for item in group:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+        for item, result in zip(group, results):
+            if not item.future.done():
+                item.future.set_result(result)
+
+    async def _run_single(self, item: _Pending) -> None:
+        request = item.request
+        try:
+            result = await self.gateway.summarize(
+                text=request.text,
+                min_length=request.min_length,
+                max_length=request.max_length,
+                profile=request.profile,
+                max_latency_ms=request.max_latency_ms,
+                method=request.method,
+                token_ids=request.token_ids,
+                strategy=request.strategy,
+                reused_chunks=request.reused_chunks,
+            )
+        except Exception as e:
+            if not item.future.done():
+                item.future.set_exception(e)
+            return
+        if not item.future.done():
+            item.future.set_result(result)
+
+
+class ModelServer:
+    def __init__(self, socket_path: str, gateway: SummarizationGateway):
+        self.socket_path = socket_path
+        self.queue = BatchingQueue(gateway, settings.MODEL_SERVER_MAX_BATCH, settings.MODEL_SERVER_BATCH_WAIT_MS)
+
+    async def _respond(self, writer: asyncio.StreamWriter, lock: asyncio.Lock, request_id: int, future: asyncio.Future) -> None:
+        try:
+            result = await future
+            msg_type, payload = proto.MSG_RESULT, proto.encode_result(result)
+        except Exception as e:
+            msg_type, payload = proto.MSG_ERROR, proto.encode_error(str(e))
+        # Ответы на запросы одного подключения приходят в любом порядке
+        async with lock:
+            proto.write_frame(writer, msg_type, request_id, payload)
+            await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+        responses = set()
+        try:
+            while True:
+                msg_type, flags, request_id, payload = await proto.read_frame(reader)
+                if msg_type != proto.MSG_SUMMARIZE:
+                    raise proto.ProtocolError(f"Unexpected message type {msg_type}")
+                try:
+                    request = proto.decode_request(flags, payload)
+                except Exception as e:
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_exception(e)
+                else:
+                    future = self.queue.submit(request)
+                task = asyncio.create_task(self._respond(writer, lock, request_id, future))
+                responses.add(task)
+                task.add_done_callback(responses.discard)
+        except asyncio.IncompleteReadError:
+            pass  # клиент закрыл соединение
+        except (proto.ProtocolError, ConnectionError) as e:
+            log.warning(f"Closing client connection: {e}")
+        finally:
+            for task in responses:
+                task.cancel()
+            writer.close()
+
+    async def serve_forever(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        batcher = asyncio.create_task(self.queue.run())
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        log.info(f"Model server listening on {self.socket_path}")
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            batcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if not settings.MODEL_SERVER_SOCKET:
+        raise SystemExit("MODEL_SERVER_SOCKET is not set")
+    gateway = SummarizationGateway(model_name=settings.MODEL_NAME)
+    asyncio.run(ModelServer(settings.MODEL_SERVER_SOCKET, gateway).serve_forever())
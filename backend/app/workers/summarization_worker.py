@@ -1,10 +1,15 @@
 import os
 import logging
+from datetime import datetime
 from celery import Celery
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-import torch
-from backend.app.infrastructure.database.models import SummaryModel
-from backend.app.core.errors import SummarizationError
+from billiard.process import current_process
+from backend.app.infrastructure.database.models import SummaryModel, TokenIdsCache
+from backend.app.infrastructure.summarization.mbart_gateway import SummarizationGateway
+from backend.app.infrastructure.summarization.chunking import STRATEGY_CHUNKED
+from backend.app.infrastructure.summarization.execution import InferenceExecutor, InferencePolicy
+from backend.app.infrastructure.summarization.token_cache import from_transport
+from backend.app.workers.autoscaler import record_job_latency
+from backend.app.domain.entities import SummarizationResult
 from backend.app.config import settings
 
 # Настройка логирования
@@ -48,48 +53,44 @@ class Summarizer:
         if self._initialized:
             return
 
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"Loading summarization model on device: {self.device}")
-
-        try:
-            self.tokenizer = AutoTokenizer.from_pretrained(settings.MODEL_NAME)
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(settings.MODEL_NAME).to(self.device)
-            logger.info("Model loaded successfully")
-        except Exception as e:
-            logger.error(f"Failed to load model: {e}")
-            raise RuntimeError(f"Failed to load model: {e}")
+        logger.info(f"Loading summarization model '{settings.MODEL_NAME}'")
+        # Вся логика инференса (профили, бюджет латентности, реестр моделей)
+        # живёт в SummarizationGateway
+        # Процесс воркера - один слот инференса со своей долей ядер
+        # (INFERENCE_PROCESSES должен совпадать с --concurrency)
+        # Номер процесса: явно заданный (автоскейлер) или индекс в prefork-пуле
+        process_index = settings.INFERENCE_PROCESS_INDEX
+        if process_index is None:
+            process_index = getattr(current_process(), "index", None)
+        policy = InferencePolicy.detect(settings, slots=1, process_index=process_index)
+        self.gateway = SummarizationGateway(executor=InferenceExecutor(policy))
+        logger.info("Model loaded successfully")
 
         self._initialized = True
 
-    def summarize(self, text: str, min_length: int, max_length: int) -> str:
+    def summarize(
+            self,
+            text: str,
+            min_length: int,
+            max_length: int,
+            profile: str | None = None,
+            max_latency_ms: int | None = None,
+            method: str | None = None,
+            token_ids: TokenIdsCache | None = None,
+            strategy: str | None = None,
+            reused_chunks: dict | None = None
+    ) -> SummarizationResult:
         """Генерирует суммаризацию текста"""
-        try:
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                padding="max_length",
-                truncation=True,
-                max_length=1024
-            ).to(self.device)
-
-            summary_ids = self.model.generate(
-                inputs["input_ids"],
-                num_beams=4,
-                min_length=min_length,
-                max_length=max_length,
-                early_stopping=True,
-            )
-
-            summary = self.tokenizer.decode(
-                summary_ids[0],
-                skip_special_tokens=True,
-                clean_up_tokenization_spaces=False
-            )
-
-            return summary
-        except Exception as e:
-            logger.error(f"Error during summarization: {e}")
-            raise SummarizationError(f"Ошибка модели: {e}")
+        # Выполняется в потоке слота, чтобы действовала привязка к ядрам
+        if strategy == STRATEGY_CHUNKED:
+            return self.gateway.executor.submit(
+                self.gateway._blocking_summarize_chunked,
+                text, min_length, max_length, profile, max_latency_ms, method, reused_chunks
+            ).result()
+        return self.gateway.executor.submit(
+            self.gateway._blocking_summarize,
+            text, min_length, max_length, profile, max_latency_ms, method, token_ids
+        ).result()
 
 
 # Глобальный экземпляр суммаризатора
@@ -97,7 +98,19 @@ summarizer = None
 
 
 @celery_app.task(bind=True, name="summarization_task")
-def summarization_task(self, summary_id: str, text: str, min_length: int, max_length: int):
+def summarization_task(
+        self,
+        summary_id: str,
+        text: str,
+        min_length: int,
+        max_length: int,
+        profile: str | None = None,
+        max_latency_ms: int | None = None,
+        method: str | None = None,
+        token_ids: dict | None = None,
+        strategy: str | None = None,
+        reused_chunks: dict | None = None,
+):
     """Celery задача для асинхронной суммаризации"""
     global summarizer
 
@@ -119,13 +132,22 @@ def summarization_task(self, summary_id: str, text: str, min_length: int, max_le
         summary.save()
 
         # Генерация суммаризации
-        result = summarizer.summarize(text, min_length, max_length)
+        result = summarizer.summarize(
+            text, min_length, max_length, profile, max_latency_ms, method, from_transport(token_ids),
+            strategy, reused_chunks
+        )
 
         # Сохранение результата
-        summary.summary_text = result
+        summary.summary_text = result.text
+        summary.generation_info = result.generation_info
+        summary.chunk_summaries = result.chunk_summaries
         summary.status = "done"
+        summary.finished_at = datetime.utcnow()
         summary.save()
 
+        # Латентность для автоскейлера (см. workers/autoscaler.py)
+        record_job_latency(celery_app.conf.broker_url, result.generation_info.get("latency_ms", 0))
+
         logger.info(f"Summarization completed successfully for ID: {summary_id}")
         return {"status": "done", "summary_id": summary_id}
 
@@ -136,6 +158,7 @@ def summarization_task(self, summary_id: str, text: str, min_length: int, max_le
             if summary:
                 summary.status = "failed"
                 summary.error_message = str(e)
+                summary.finished_at = datetime.utcnow()
                 summary.save()
         except:
             pass
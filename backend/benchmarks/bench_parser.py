@@ -0,0 +1,106 @@
+# backend/benchmarks/bench_parser.py
+"""
+Микро-бенчмарк DocumentParser по форматам (.txt, .docx, .odt).
+
+Файлы генерируются в памяти из синтетического текста заданной длины,
+поэтому прогон не зависит от внешних данных.
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.bench_parser --output parser.json
+"""
+import argparse
+import asyncio
+import io
+import logging
+import time
+
+import docx
+from odf.opendocument import OpenDocumentText
+from odf.text import P
+
+from backend.app.infrastructure.files.document_parser import DocumentParser
+from backend.benchmarks.common import build_report, latency_stats, synthetic_text, write_report
+
+MIME_TYPES = {
+    "txt": "text/plain",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "odt": "application/vnd.oasis.opendocument.text",
+}
+
+
+def _make_txt(text: str) -> bytes:
+    return text.encode("utf-8")
+
+
+def _make_docx(text: str) -> bytes:
+    document = docx.Document()
+    for paragraph in text.split("\n"):
+        document.add_paragraph(paragraph)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+def _make_odt(text: str) -> bytes:
+    document = OpenDocumentText()
+    for paragraph in text.split("\n"):
+        document.text.addElement(P(text=paragraph))
+    buf = io.BytesIO()
+    document.write(buf)
+    return buf.getvalue()
+
+
+BUILDERS = {"txt": _make_txt, "docx": _make_docx, "odt": _make_odt}
+
+
+async def _time_parse(parser: DocumentParser, payload: bytes, mime_type: str, repeat: int, warmup: int) -> list[float]:
+    samples = []
+    for i in range(warmup + repeat):
+        stream = io.BytesIO(payload)
+        start = time.perf_counter()
+        await parser.parse(stream, mime_type)
+        if i >= warmup:
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def run(args: argparse.Namespace) -> dict:
+    parser = DocumentParser()
+    formats = [f for f in args.formats.split(",") if f]
+    results = []
+    for n_words in args.lengths:
+        text = synthetic_text(n_words, seed=args.seed)
+        for fmt in formats:
+            payload = BUILDERS[fmt](text)
+            samples = await _time_parse(parser, payload, MIME_TYPES[fmt], args.repeat, args.warmup)
+            results.append({
+                "format": fmt,
+                "input_words": n_words,
+                "file_bytes": len(payload),
+                **latency_stats(samples),
+            })
+            logging.info(f"format={fmt} words={n_words} p50={results[-1]['p50_ms']:.2f}ms")
+
+    return build_report(
+        "parser_micro",
+        config={"repeat": args.repeat, "warmup": args.warmup, "formats": formats},
+        results=results,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=lambda v: [int(x) for x in v.split(",") if x], default=[1_000, 20_000, 200_000])
+    parser.add_argument("--formats", default="txt,docx,odt")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Путь к JSON-отчёту (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    write_report(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
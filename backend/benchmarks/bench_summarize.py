@@ -0,0 +1,103 @@
+# backend/benchmarks/bench_summarize.py
+"""
+Микро-бенчмарк SummarizationGateway._blocking_summarize.
+
+Перебирает длины входа, профили декодирования (fast = 1 луч,
+quality = 4 луча, ...) и устройства (cpu/cuda).
+По умолчанию используется крошечная seq2seq-модель, чтобы прогон
+был быстрым и воспроизводимым; для замеров на боевой модели
+передайте --model IlyaGusev/mbart_ru_sum_gazeta.
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.bench_summarize --output summarize.json
+"""
+import argparse
+import logging
+
+import torch
+
+from backend.app.infrastructure.summarization.decoding import PROFILES
+from backend.app.infrastructure.summarization.mbart_gateway import SummarizationGateway
+from backend.benchmarks.common import (
+    build_report,
+    latency_stats,
+    synthetic_text,
+    time_call,
+    write_report,
+)
+
+DEFAULT_MODEL = "sshleifer/tiny-mbart"
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def run(args: argparse.Namespace) -> dict:
+    torch.manual_seed(args.seed)
+    devices = [d for d in args.devices.split(",") if d]
+    if "cuda" in devices and not torch.cuda.is_available():
+        logging.warning("CUDA недоступна, устройство cuda пропущено.")
+        devices.remove("cuda")
+
+    results = []
+    for device in devices:
+        gateway = SummarizationGateway(model_name=args.model, device=device)
+        for n_words in args.lengths:
+            text = synthetic_text(n_words, seed=args.seed)
+            for profile in args.profiles:
+                samples = time_call(
+                    lambda: gateway._blocking_summarize(
+                        text, args.min_length, args.max_length, profile=profile
+                    ),
+                    repeat=args.repeat,
+                    warmup=args.warmup,
+                )
+                results.append({
+                    "device": device,
+                    "input_words": n_words,
+                    "profile": profile,
+                    "num_beams": PROFILES[profile].generate_kwargs.get("num_beams", 1),
+                    **latency_stats(samples),
+                })
+                logging.info(
+                    f"device={device} words={n_words} profile={profile} "
+                    f"p50={results[-1]['p50_ms']:.1f}ms"
+                )
+        del gateway
+
+    return build_report(
+        "summarize_micro",
+        config={
+            "model": args.model,
+            "min_length": args.min_length,
+            "max_length": args.max_length,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "torch": torch.__version__,
+            "torch_threads": torch.get_num_threads(),
+        },
+        results=results,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--lengths", type=_int_list, default=[128, 512, 2048], help="Длины входа в словах")
+    parser.add_argument("--profiles", type=lambda v: [p for p in v.split(",") if p], default=list(PROFILES))
+    parser.add_argument("--devices", default="cpu", help="Список через запятую: cpu,cuda")
+    parser.add_argument("--min-length", type=int, default=8)
+    parser.add_argument("--max-length", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Путь к JSON-отчёту (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    write_report(run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
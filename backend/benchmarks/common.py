@@ -0,0 +1,118 @@
+# backend/benchmarks/common.py
+"""
+Общие утилиты бенчмарков: замеры времени, перцентили, пиковая RSS
+и запись машиночитаемого JSON-отчёта.
+"""
+import json
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Перцентиль с линейной интерполяцией (как numpy.percentile по умолчанию)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def latency_stats(samples_s: List[float]) -> Dict[str, float]:
+    """Сводка по латентностям (на входе секунды, на выходе миллисекунды)."""
+    ms = [s * 1000.0 for s in samples_s]
+    return {
+        "count": len(ms),
+        "mean_ms": statistics.fmean(ms) if ms else 0.0,
+        "min_ms": min(ms) if ms else 0.0,
+        "max_ms": max(ms) if ms else 0.0,
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Пиковая RSS текущего процесса в МБ (ru_maxrss: КБ на Linux, байты на macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return rss / 1024 / 1024
+    return rss / 1024
+
+
+def time_call(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> List[float]:
+    """Вызывает fn warmup + repeat раз и возвращает времена (сек) последних repeat вызовов."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def git_commit() -> Optional[str]:
+    """Хэш текущего коммита, чтобы отчёты можно было сравнивать между коммитами."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def build_report(benchmark: str, config: Dict[str, Any], results: Any) -> Dict[str, Any]:
+    """Собирает отчёт в едином формате для всех бенчмарков."""
+    return {
+        "benchmark": benchmark,
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def write_report(report: Dict[str, Any], output: Optional[str]) -> None:
+    """Пишет отчёт в файл (если указан) или в stdout."""
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+# Небольшой словарь для синтетических русскоязычных текстов
+_WORDS = (
+    "отчёт компания рынок рост выручка квартал правительство закон проект "
+    "развитие регион инвестиции эксперт данные исследование система город "
+    "модель результат снижение показатель бюджет программа решение вопрос"
+).split()
+
+
+def synthetic_text(n_words: int, seed: int = 0, paragraph_words: int = 80) -> str:
+    """Детерминированный псевдотекст из n_words слов, разбитый на абзацы."""
+    rng = random.Random(seed)
+    paragraphs, current = [], []
+    for i in range(n_words):
+        current.append(rng.choice(_WORDS))
+        if (i + 1) % 12 == 0:
+            current[-1] += "."
+        if len(current) >= paragraph_words:
+            paragraphs.append(" ".join(current).capitalize())
+            current = []
+    if current:
+        paragraphs.append(" ".join(current).capitalize())
+    return "\n".join(paragraphs)
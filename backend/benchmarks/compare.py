@@ -0,0 +1,79 @@
+# backend/benchmarks/compare.py
+"""
+Сравнение двух JSON-отчётов бенчмарков (например, base и head коммитов).
+
+Сопоставляет все числовые метрики с суффиксом _ms / _mb / _s и
+пропускную способность, печатает относительное изменение и завершает
+работу с кодом 1, если латентность выросла больше порога.
+
+    python -m backend.benchmarks.compare base.json head.json --threshold 10
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, Tuple
+
+# Метрики, для которых рост значения — это улучшение
+HIGHER_IS_BETTER = ("throughput",)
+
+
+def _flatten(node: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Разворачивает вложенный отчёт в пары (путь, число)."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _flatten(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(node, list):
+        for item in node:
+            if isinstance(item, dict):
+                # Элементы списка результатов подписываются их нечисловыми полями
+                label = ",".join(
+                    f"{k}={v}" for k, v in item.items() if isinstance(v, (str, int)) and not k.endswith(("_ms", "count"))
+                )
+                yield from _flatten(item, f"{prefix}[{label}]")
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        yield prefix, float(node)
+
+
+def _is_metric(path: str) -> bool:
+    leaf = path.rsplit(".", 1)[-1]
+    return leaf.endswith(("_ms", "_mb", "_s")) or leaf.startswith(HIGHER_IS_BETTER)
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any], threshold: float) -> int:
+    base_metrics = dict(_flatten({"results": base["results"], "peak_rss_mb": base["peak_rss_mb"]}))
+    head_metrics = dict(_flatten({"results": head["results"], "peak_rss_mb": head["peak_rss_mb"]}))
+
+    print(f"base: {base.get('commit')}  head: {head.get('commit')}")
+    regressions = 0
+    for path in sorted(base_metrics.keys() & head_metrics.keys()):
+        if not _is_metric(path):
+            continue
+        old, new = base_metrics[path], head_metrics[path]
+        if old == 0:
+            continue
+        change = (new - old) / old * 100
+        worse = -change if path.rsplit(".", 1)[-1].startswith(HIGHER_IS_BETTER) else change
+        mark = ""
+        if worse > threshold:
+            mark = "  <-- регрессия"
+            regressions += 1
+        print(f"{path}: {old:.3f} -> {new:.3f} ({change:+.1f}%){mark}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Допустимое ухудшение, %%")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.head, encoding="utf-8") as f:
+        head = json.load(f)
+    sys.exit(compare(base, head, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# backend/benchmarks/load_test.py
+"""
+Макро нагрузочный тест API: /documents/ и /summaries/.
+
+Приложение поднимается в процессе (httpx + ASGITransport) в режиме
+BackgroundTasks, MongoDB подменяется на mongomock-motor, а вместо
+mbart используется крошечная seq2seq-модель. Каждый «пользователь»
+в цикле загружает документ, создаёт суммаризацию и опрашивает её
+статус до done/failed.
+
+Замечание: ASGITransport дожидается завершения фоновых задач до
+возврата ответа, поэтому латентность POST /summaries/ включает
+инференс. Сквозная метрика job (upload -> done) от этого не зависит.
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.load_test --concurrency 8 --jobs 64 --output load.json
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+
+DEFAULT_MODEL = "sshleifer/tiny-mbart"
+
+
+def _configure_env(args: argparse.Namespace) -> None:
+    # Режим и модель читаются при импорте модулей приложения,
+    # поэтому окружение настраивается до импорта backend.app.*
+    os.environ["USE_CELERY"] = "false"
+    os.environ["MODEL_NAME"] = args.model
+
+
+async def _init_mock_database(db_url: str, db_name: str):
+    """Замена init_database: Beanie поверх in-memory mongomock-motor."""
+    from beanie import init_beanie
+    from mongomock_motor import AsyncMongoMockClient
+    from backend.app.infrastructure.database.connection import DOCUMENT_MODELS
+
+    from pymongo import IndexModel
+
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client[db_name], document_models=DOCUMENT_MODELS)
+    # mongomock.create_indexes теряет partialFilterExpression - пересоздаём такие индексы по одному
+    for model in DOCUMENT_MODELS:
+        for index in getattr(model.Settings, "indexes", []):
+            if isinstance(index, IndexModel) and "partialFilterExpression" in index.document:
+                options = dict(index.document)
+                collection = model.get_motor_collection()
+                await collection.drop_index(options["name"])
+                await collection.create_index(list(options.pop("key").items()), **options)
+
+
+async def _run_job(client, text: bytes, args: argparse.Namespace, samples: dict, errors: dict) -> None:
+    job_start = time.perf_counter()
+
+    start = time.perf_counter()
+    resp = await client.post("/documents/", files={"file": ("bench.txt", text, "text/plain")})
+    samples["upload"].append(time.perf_counter() - start)
+    if resp.status_code != 201:
+        errors[f"upload_{resp.status_code}"] += 1
+        return
+    document_id = resp.json()["id"]
+
+    start = time.perf_counter()
+    resp = await client.post("/summaries/", json={
+        "document_id": document_id,
+        "min_length": args.min_length,
+        "max_length": args.max_length,
+    })
+    samples["create_summary"].append(time.perf_counter() - start)
+    if resp.status_code != 201:
+        errors[f"create_summary_{resp.status_code}"] += 1
+        return
+    summary_id = resp.json()["id"]
+
+    while True:
+        start = time.perf_counter()
+        resp = await client.get(f"/summaries/{summary_id}")
+        samples["get_summary"].append(time.perf_counter() - start)
+        status = resp.json().get("status")
+        if status in ("done", "failed"):
+            break
+        await asyncio.sleep(args.poll_interval)
+
+    if status == "failed":
+        errors["summary_failed"] += 1
+        return
+    samples["job"].append(time.perf_counter() - job_start)
+
+
+async def _wait_ready(client, timeout_s: float) -> None:
+    """Ждёт /ready; прогрев с ошибкой или дольше timeout_s - прерывание замера."""
+    deadline = time.monotonic() + timeout_s
+    while True:
+        response = await client.get("/ready")
+        if response.status_code == 200:
+            return
+        readiness = response.json()
+        if readiness.get("status") == "failed":
+            raise RuntimeError(f"Model warmup failed: {readiness.get('detail')}")
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Model not ready after {timeout_s:.0f}s (status: {readiness.get('status')})")
+        await asyncio.sleep(0.1)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    _configure_env(args)
+
+    import httpx
+    from backend.app import main as app_main
+    from backend.benchmarks.common import build_report, latency_stats, synthetic_text
+
+    app_main.init_database = _init_mock_database
+    app = app_main.app
+
+    text = synthetic_text(args.words, seed=args.seed).encode("utf-8")
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(args.jobs):
+        queue.put_nowait(i)
+
+    async def user(client):
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await _run_job(client, text, args, samples, errors)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # Модель загружается и прогревается в фоне после старта
+            await _wait_ready(client, args.ready_timeout)
+            # Прогрев: один запрос вне замера
+            await _run_job(client, text, args, defaultdict(list), defaultdict(int))
+
+            wall_start = time.perf_counter()
+            await asyncio.gather(*(user(client) for _ in range(args.concurrency)))
+            wall = time.perf_counter() - wall_start
+
+    total_requests = sum(len(v) for k, v in samples.items() if k != "job")
+    return build_report(
+        "api_load",
+        config={
+            "model": args.model,
+            "concurrency": args.concurrency,
+            "jobs": args.jobs,
+            "words": args.words,
+            "min_length": args.min_length,
+            "max_length": args.max_length,
+        },
+        results={
+            "wall_s": wall,
+            "throughput_jobs_per_s": len(samples["job"]) / wall if wall else 0.0,
+            "throughput_requests_per_s": total_requests / wall if wall else 0.0,
+            "errors": dict(errors),
+            "latency": {name: latency_stats(values) for name, values in samples.items()},
+        },
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=32)
+    parser.add_argument("--words", type=int, default=600, help="Длина загружаемого документа в словах")
+    parser.add_argument("--min-length", type=int, default=8)
+    parser.add_argument("--max-length", type=int, default=64)
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ready-timeout", type=float, default=600, help="Ожидание загрузки и прогрева модели, с")
+    parser.add_argument("--output", help="Путь к JSON-отчёту (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    from backend.benchmarks.common import write_report
+    write_report(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@ import {
   DocumentCreateResponse,
   DocumentListResponse,
   DocumentDetailResponse,
+  DocumentTextFragment,
+  DocumentTextUnit,
+  SearchResponse,
   SummaryCreateRequest,
   SummaryResponse,
 } from '../types/apiTypes';
@@ -47,6 +50,30 @@ export const getDocumentDetails = async (id: string): Promise<DocumentDetailResp
   return response.data;
 };
 
+/**
+ * Фрагмент распарсенного текста документа (без загрузки всего текста).
+ * @param id - ID документа.
+ * @param offset - Смещение (в символах или абзацах).
+ * @param limit - Размер фрагмента.
+ * @param unit - 'chars' | 'paragraphs'.
+ */
+export const getDocumentText = async (
+  id: string,
+  offset: number = 0,
+  limit: number = 10000,
+  unit: DocumentTextUnit = 'chars'
+): Promise<DocumentTextFragment> => {
+  const response = await apiClient.get<string>(`/documents/${id}/text`, {
+    params: { offset, limit, unit },
+    responseType: 'text',
+  });
+  return {
+    text: response.data,
+    totalChars: Number(response.headers['x-total-chars']),
+    totalParagraphs: Number(response.headers['x-total-paragraphs']),
+  };
+};
+
 // --- Summary API ---
 /**
  * Запуск фоновой суммаризации документа.
@@ -86,4 +113,24 @@ export const getSummaryStatus = async (id: string): Promise<SummaryResponse> =>
 export const getSummaryByDocumentId = async (documentId: string): Promise<SummaryResponse> => {
   const response = await apiClient.get<SummaryResponse>(`/summaries/by-document/${documentId}`);
   return response.data;
-};
\ No newline at end of file
+};
+
+// --- Search API ---
+/**
+ * Полнотекстовый поиск по документам и суммаризациям.
+ * @param q - Поисковый запрос.
+ * @param scope - 'all' | 'documents' | 'summaries'.
+ * @param limit - Количество результатов на странице.
+ * @param offset - Смещение.
+ */
+export const searchText = async (
+  q: string,
+  scope: 'all' | 'documents' | 'summaries' = 'all',
+  limit: number = 10,
+  offset: number = 0
+): Promise<SearchResponse> => {
+  const response = await apiClient.get<SearchResponse>('/search', {
+    params: { q, scope, limit, offset },
+  });
+  return response.data;
+};
@@ -36,6 +36,7 @@ export interface DocumentListItem {
   size_bytes: number;
   uploaded_at: string; // ISO 8601 datetime string
   parsed: boolean;
+  version?: number;
 }
 
 export interface DocumentListResponse {
@@ -54,6 +55,45 @@ export interface DocumentDetailResponse {
   parsed: boolean;
   parsed_text?: string;
   storage_ref?: string;
+  version?: number;
+  /** id исходного документа цепочки версий */
+  root_id?: string | null;
+  parent_id?: string | null;
+  /** Изменения абзацев относительно parent_id */
+  diff_stats?: { [key: string]: number } | null;
+}
+
+export type DocumentTextUnit = 'chars' | 'paragraphs';
+
+/** Фрагмент текста из GET /documents/{id}/text */
+export interface DocumentTextFragment {
+  text: string;
+  totalChars: number;
+  totalParagraphs: number;
+}
+
+// --- Поиск (Search) ---
+export interface SearchHit {
+  type: 'document' | 'summary';
+  id: string;
+  /** Относительно лучшего результата того же типа, (0, 1] */
+  score: number;
+  document_id?: string | null;
+  title?: string | null;
+  created_at: string; // ISO 8601
+  snippet: string;
+  /** Совпадения в snippet: пары [start, end) */
+  highlights: [number, number][];
+}
+
+export interface SearchResponse {
+  query: string;
+  total: number;
+  /** false - совпадений не меньше total (показывать как «total+») */
+  total_exact: boolean;
+  limit: number;
+  offset: number;
+  items: SearchHit[];
 }
 
 // --- Суммаризация (Summaries) ---
@@ -63,6 +103,12 @@ export interface SummaryCreateRequest {
   min_length?: number;
   max_length?: number;
   method?: string; // или string, если методов будет больше
+  /** Профиль декодирования: 'fast' | 'quality' | 'no_repeat' */
+  profile?: string;
+  /** Бюджет латентности генерации, мс */
+  max_latency_ms?: number;
+  /** 'single' | 'chunked' (чанки неизменённых абзацев переиспользуются между версиями) */
+  strategy?: string;
 }
 
 export interface SummaryResponse {
@@ -75,6 +121,8 @@ export interface SummaryResponse {
   status: SummaryStatus;
   /** Поле, добавленное для failed статуса */
   error_message?: string;
+  /** Как была получена суммаризация: профиль, латентность и т.п. */
+  generation_info?: { [key: string]: any } | null;
 }
 
 // --- Загрузка ---
@@ -86,4 +134,8 @@ export interface DocumentCreateResponse {
   uploaded_at: string; // ISO 8601
   parsed: boolean;
   parsed_preview?: string;
+  version?: number;
+  root_id?: string | null;
+  parent_id?: string | null;
+  diff_stats?: { [key: string]: number } | null;
 }
\ No newline at end of file